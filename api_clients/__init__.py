@@ -13,6 +13,13 @@ from .water_transport import WaterTransportAPIClient
 from .passenger_transport import PassengerTransportAPIClient
 from .data_bus import DataBusAPIClient
 from .organizations import OrganizationsAPIClient
+from .transport import HTTPTransport, get_transport, configure_transport
+from .auth import TokenProvider, get_token_provider
+from .policy import RequestPolicy
+from .ratelimit import RateLimiter
+from .cache import ResponseCache
+from .disk_cache import DiskCache
+from .hooks import RequestEvent, LogSink, HistogramSink, JSONLSink, add_hook, remove_hook
 
 __all__ = [
     'IncidentsAPIClient',
@@ -25,5 +32,20 @@ __all__ = [
     'PassengerTransportAPIClient',
     'DataBusAPIClient',
     'OrganizationsAPIClient',
+    'HTTPTransport',
+    'get_transport',
+    'configure_transport',
+    'TokenProvider',
+    'get_token_provider',
+    'RequestPolicy',
+    'RateLimiter',
+    'ResponseCache',
+    'DiskCache',
+    'RequestEvent',
+    'LogSink',
+    'HistogramSink',
+    'JSONLSink',
+    'add_hook',
+    'remove_hook',
 ]
 
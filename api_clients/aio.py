@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Асинхронные (asyncio + httpx) версии всех API клиентов
+
+Асинхронный клиент наследует синхронный: методы и построение payload общие,
+отличается только транспорт, который возвращает корутину вместо ответа.
+
+    client = AsyncIncidentsAPIClient()
+    result = await client.get_incidents_list(page=1, limit=10)
+"""
+
+import asyncio
+import json
+import time
+import weakref
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+from .auth import refreshed_auth_headers
+from .codec import JSONCodec, encode_json_body, get_codec
+from .disk_cache import DiskCache
+from .hooks import Hooks, current_timer, get_hooks
+from .policy import DEFAULT_POLICY, RequestPolicy
+from .ratelimit import RateLimiter
+from .transport import PoolStats, get_transport
+from .incidents import IncidentsAPIClient
+from .dtp import DTPAPIClient
+from .metro import MetroAPIClient
+from .parking import ParkingAPIClient
+from .digital_twin import DigitalTwinAPIClient
+from .external_transport import ExternalTransportAPIClient
+from .water_transport import WaterTransportAPIClient
+from .passenger_transport import PassengerTransportAPIClient
+from .data_bus import DataBusAPIClient
+from .organizations import OrganizationsAPIClient
+
+
+DEFAULT_ASYNC_POOL_SIZE = 100
+
+
+class AsyncHTTPTransport:
+    """
+    Асинхронный транспорт поверх одного httpx.AsyncClient
+
+    Принимает те же аргументы, что и HTTPTransport (params, json, data, headers, timeout, verify),
+    поэтому методы синхронных клиентов работают без изменений.
+
+    Args:
+        pool_size: максимальное число одновременных соединений
+        auth_retry: при 401 обновить токен и повторить запрос один раз
+        policy: таймауты и повторы по умолчанию
+        rate_limiter: ограничение частоты запросов; можно передать тот же объект,
+            что и синхронному транспорту, чтобы лимит был общим
+        disk_cache: кэш ответов на диске с проверкой ETag/Last-Modified (None - без кэша)
+        codec: JSON кодек для json= и response.json() (None - самый быстрый из установленных)
+        hooks: обработчики событий запросов клиентов (None - общие для процесса, см. hooks.py);
+            DNS входит в фазу connect
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_ASYNC_POOL_SIZE, auth_retry: bool = True,
+                 policy: RequestPolicy = DEFAULT_POLICY, rate_limiter: Optional[RateLimiter] = None,
+                 disk_cache: Optional[DiskCache] = None, codec: Optional[JSONCodec] = None,
+                 hooks: Optional[Hooks] = None):
+        self.pool_size = pool_size
+        self.auth_retry = auth_retry
+        self.policy = policy
+        self.rate_limiter = rate_limiter
+        self.disk_cache = disk_cache
+        self.codec = codec or get_codec()
+        self.hooks = hooks if hooks is not None else get_hooks()
+        self._stats = {}
+        self.client = httpx.AsyncClient(
+            verify=False,
+            timeout=None,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    def _stats_for_host(self, url: str) -> PoolStats:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        host = f"{parts.hostname}:{port}"
+        stats = self._stats.get(host)
+        if stats is None:
+            stats = self._stats[host] = PoolStats()
+        return stats
+
+    async def request(self, method: str, url: str, auth_retry: Optional[bool] = None,
+                      policy: Optional[RequestPolicy] = None, **kwargs) -> httpx.Response:
+        """
+        Выполнить запрос (verify задается на уровне транспорта и игнорируется)
+
+        С stream=True тело не читается: его нужно прочитать через aiter_bytes и закрыть aclose.
+        """
+        policy = policy or self.policy
+        kwargs.pop("verify", None)
+        if "data" in kwargs and isinstance(kwargs["data"], (bytes, str)):
+            kwargs["content"] = kwargs.pop("data")
+        timeout = kwargs.get("timeout")
+        if timeout is None:
+            timeout = policy.timeout
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        kwargs["timeout"] = timeout
+        disk = self.disk_cache
+        if disk is None or kwargs.get("stream") or not disk.cacheable(method, url):
+            return await self._request(method, url, auth_retry, policy, kwargs)
+
+        key = disk.key(method, url, kwargs)
+        entry = disk.load(key)
+        if entry is not None:
+            kwargs["headers"] = disk.conditional_headers(entry, kwargs.get("headers"))
+        response = await self._request(method, url, auth_retry, policy, kwargs)
+        if response.status_code == 304 and entry is not None:
+            disk.record(hit=True)
+            headers = httpx.Headers(entry["headers"])
+            headers.update(response.headers)
+            headers.pop("content-length", None)
+            cached = httpx.Response(200, headers=headers, content=entry["body"], request=response.request)
+            cached.from_cache = True
+            return self._with_codec(cached)
+        disk.record(hit=False)
+        if response.status_code == 200:
+            disk.store(key, url, response.headers, response.content)
+        return response
+
+    async def _request(self, method, url, auth_retry, policy, kwargs) -> httpx.Response:
+        codec = self.codec
+        if codec.name != "json" and kwargs.get("json") is not None:
+            encode_json_body(kwargs, codec, body_key="content")
+        return self._with_codec(await self._request_with_retries(method, url, auth_retry, policy, kwargs))
+
+    def _with_codec(self, response: httpx.Response) -> httpx.Response:
+        """Декодировать response.json() кодеком транспорта"""
+        if self.codec.name != "json":
+            codec = self.codec
+
+            def decode(**kwargs):
+                try:
+                    return codec.loads(response.content)
+                except ValueError as e:
+                    raise json.JSONDecodeError(str(e), response.text, 0)
+            response.json = decode
+        return response
+
+    async def _request_with_retries(self, method, url, auth_retry, policy, kwargs) -> httpx.Response:
+        stats = self._stats_for_host(url)
+        stats.request_started()
+        try:
+            attempt = 0
+            while True:
+                try:
+                    response = await self._send(method, url, auth_retry, kwargs)
+                except httpx.TransportError as e:
+                    connect_failed = isinstance(e, httpx.ConnectTimeout)
+                    if not policy.should_retry_error(method, attempt, connect_failed):
+                        raise
+                    delay = policy.backoff(attempt)
+                else:
+                    delay = policy.retry_delay(method, response.status_code, response.headers, attempt)
+                    if delay is None:
+                        return response
+                    await response.aclose()
+                attempt += 1
+                timer = current_timer()
+                if timer is not None:
+                    timer.retry += delay
+                await asyncio.sleep(delay)
+        finally:
+            stats.request_finished()
+
+    async def _send(self, method, url, auth_retry, kwargs) -> httpx.Response:
+        response = await self._client_request(method, url, kwargs)
+        if response.status_code == 401 and (self.auth_retry if auth_retry is None else auth_retry):
+            # Вход по сети блокирующий - выполняется в пуле потоков
+            loop = asyncio.get_running_loop()
+            headers = await loop.run_in_executor(None, refreshed_auth_headers, kwargs.get("headers"))
+            if headers is not None:
+                kwargs["headers"] = headers
+                await response.aclose()
+                response = await self._client_request(method, url, kwargs)
+        return response
+
+    async def _client_request(self, method, url, kwargs) -> httpx.Response:
+        timer = current_timer()
+        started = time.perf_counter()
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(url)
+        kwargs = dict(kwargs)
+        stream = kwargs.pop("stream", False)
+        if timer is None:
+            request = self.client.build_request(method, url, **kwargs)
+            return await self.client.send(request, stream=bool(stream))
+
+        sending = time.perf_counter()
+        timer.queue += sending - started
+        timer.attempts += 1
+        marks = {}
+
+        async def trace(event, info):
+            marks[event] = time.perf_counter()
+
+        extensions = dict(kwargs.pop("extensions", None) or {}, trace=trace)
+        request = self.client.build_request(method, url, extensions=extensions, **kwargs)
+        response = await self.client.send(request, stream=bool(stream))
+        finished = time.perf_counter()
+        connect = _span(marks, "connection.connect_tcp")
+        tls = _span(marks, "connection.start_tls")
+        headers_at = next((marks[name] for name in marks if name.endswith("receive_response_headers.complete")),
+                          finished)
+        timer.connect += connect
+        timer.tls += tls
+        timer.server += max(headers_at - sending - connect - tls, 0.0)
+        timer.download += max(finished - headers_at, 0.0)
+        return response
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def pool_stats(self):
+        """Статистика запросов по хостам (requests, in_flight, max_in_flight)"""
+        return {host: stats.snapshot() for host, stats in self._stats.items()}
+
+    async def aclose(self):
+        """Закрыть все соединения"""
+        await self.client.aclose()
+
+
+def _span(marks, name: str) -> float:
+    """Длительность этапа httpcore по событиям trace (<name>.started/.complete)"""
+    started = marks.get(f"{name}.started")
+    complete = marks.get(f"{name}.complete")
+    return complete - started if started is not None and complete is not None else 0.0
+
+
+_transports = weakref.WeakKeyDictionary()
+
+
+def get_async_transport() -> AsyncHTTPTransport:
+    """Получить общий асинхронный транспорт текущего event loop"""
+    loop = asyncio.get_running_loop()
+    transport = _transports.get(loop)
+    if transport is None:
+        shared = get_transport()
+        transport = _transports[loop] = AsyncHTTPTransport(rate_limiter=shared.rate_limiter,
+                                                           disk_cache=shared.disk_cache, codec=shared.codec)
+    return transport
+
+
+class _RecordedResponse:
+    """Заглушка ответа для первого (холостого) прохода синхронного метода"""
+
+    status_code = 200
+    text = "{}"
+    content = b"{}"
+
+    def json(self):
+        return {}
+
+
+class _ReplayTransport:
+    """Транспорт, отдающий заранее полученный ответ (или ошибку) синхронному коду"""
+
+    def __init__(self, response=None, error=None):
+        self.response = response
+        self.error = error
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+
+# Помощники синхронного клиента, которые сами читают ответы (пагинация, массовые
+# операции, плитки, индексы и граф): в асинхронном клиенте они получили бы корутину
+SYNC_ONLY_PREFIXES = ("iter_", "fetch_all_", "bulk_")
+SYNC_ONLY_SUFFIXES = ("_index",)
+SYNC_ONLY_METHODS = ("load_compact_graph", "graph_tile_cache", "graph_sync")
+
+
+def _is_sync_only(name: str) -> bool:
+    return name.startswith(SYNC_ONLY_PREFIXES) or name.endswith(SYNC_ONLY_SUFFIXES) or name in SYNC_ONLY_METHODS
+
+
+def _sync_only(name: str, sync_class: str):
+    def method(self, *args, **kwargs):
+        raise TypeError(
+            f"{type(self).__name__}.{name} не поддерживается асинхронным клиентом: "
+            f"используйте {sync_class}.{name}"
+        )
+    method.__name__ = name
+    method.__doc__ = f"Только для синхронного клиента ({sync_class}.{name})"
+    return method
+
+
+class AsyncClientMixin:
+    """
+    Подмешивает асинхронный транспорт в синхронный клиент
+
+    Помощники, работающие только с синхронными ответами (SYNC_ONLY_*), в
+    асинхронном клиенте заменяются методами, которые вызывают TypeError.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        sync_classes = [base for base in cls.__mro__[1:] if base is not AsyncClientMixin and base is not object
+                        and not issubclass(base, AsyncClientMixin)]
+        if not sync_classes:
+            return
+        sync_class = sync_classes[0].__name__
+        for base in sync_classes:
+            for name, value in vars(base).items():
+                if callable(value) and _is_sync_only(name) and name not in vars(cls):
+                    setattr(cls, name, _sync_only(name, sync_class))
+
+    def __init__(self, transport: Optional[AsyncHTTPTransport] = None):
+        super().__init__(transport=transport or get_async_transport())
+
+    async def _await_single_request(self, func, *args, **kwargs):
+        """
+        Выполнить синхронный метод, который делает ровно один запрос и разбирает ответ
+
+        Метод вызывается дважды: сначала с записывающим транспортом, чтобы узнать запрос,
+        затем с уже полученным асинхронно ответом. Между проходами нет await, поэтому
+        подмена self.http не видна другим задачам.
+        """
+        http = self.http
+        recorder = _ReplayTransport(response=_RecordedResponse())
+        self.http = recorder
+        try:
+            func(*args, **kwargs)
+        finally:
+            self.http = http
+        if len(recorder.calls) != 1:
+            raise RuntimeError(f"{func.__name__}: ожидался ровно один запрос, выполнено {len(recorder.calls)}")
+
+        method, url, request_kwargs = recorder.calls[0]
+        try:
+            replay = _ReplayTransport(response=await http.request(method, url, **request_kwargs))
+        except httpx.HTTPError as e:
+            replay = _ReplayTransport(error=requests.exceptions.ConnectionError(str(e)))
+
+        self.http = replay
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.http = http
+
+    async def check_token(self):
+        """Проверить валидность токена (логика синхронного клиента)"""
+        return await self._await_single_request(super().check_token)
+
+
+class AsyncIncidentsAPIClient(AsyncClientMixin, IncidentsAPIClient):
+    """Асинхронный клиент раздела Инциденты"""
+
+
+class AsyncDTPAPIClient(AsyncClientMixin, DTPAPIClient):
+    """Асинхронный клиент раздела ДТП"""
+
+
+class AsyncMetroAPIClient(AsyncClientMixin, MetroAPIClient):
+    """Асинхронный клиент раздела Метрополитен"""
+
+
+class AsyncParkingAPIClient(AsyncClientMixin, ParkingAPIClient):
+    """Асинхронный клиент раздела Парковочное пространство"""
+
+
+class AsyncDigitalTwinAPIClient(AsyncClientMixin, DigitalTwinAPIClient):
+    """Асинхронный клиент Цифрового двойника"""
+
+
+class AsyncExternalTransportAPIClient(AsyncClientMixin, ExternalTransportAPIClient):
+    """Асинхронный клиент раздела Внешний транспорт"""
+
+
+class AsyncWaterTransportAPIClient(AsyncClientMixin, WaterTransportAPIClient):
+    """Асинхронный клиент раздела Водный транспорт"""
+
+
+class AsyncPassengerTransportAPIClient(AsyncClientMixin, PassengerTransportAPIClient):
+    """Асинхронный клиент раздела Пассажирский транспорт"""
+
+
+class AsyncDataBusAPIClient(AsyncClientMixin, DataBusAPIClient):
+    """Асинхронный клиент Data Bus (Общая шина)"""
+
+
+class AsyncOrganizationsAPIClient(AsyncClientMixin, OrganizationsAPIClient):
+    """Асинхронный клиент Organizations (Организации)"""
+
+
+__all__ = [
+    'AsyncHTTPTransport',
+    'get_async_transport',
+    'AsyncIncidentsAPIClient',
+    'AsyncDTPAPIClient',
+    'AsyncMetroAPIClient',
+    'AsyncParkingAPIClient',
+    'AsyncDigitalTwinAPIClient',
+    'AsyncExternalTransportAPIClient',
+    'AsyncWaterTransportAPIClient',
+    'AsyncPassengerTransportAPIClient',
+    'AsyncDataBusAPIClient',
+    'AsyncOrganizationsAPIClient',
+]
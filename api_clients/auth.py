@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Общий для процесса источник токена
+Токен читается один раз, срок действия берется из JWT (exp), обновление
+выполняется заранее через passport/api/login (refresh_token.get_new_token)
+и рассылается всем живым клиентам.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Callable, Optional
+
+
+TOKEN_VARS = ("EPUTS_TOKEN", "API_TOKEN")
+
+# За сколько секунд до истечения обновлять токен
+DEFAULT_REFRESH_MARGIN = 300
+
+# Пауза между неудачными попытками входа при обращении к истекающему токену
+RETRY_LOGIN_AFTER = 60
+
+
+def decode_jwt_expiry(token: str) -> Optional[float]:
+    """
+    Получить срок действия JWT (без проверки подписи)
+
+    Returns:
+        float: unix-время из поля exp или None, если токен не JWT
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+
+def _read_env_file(path: str) -> Optional[str]:
+    """Найти токен в .env файле"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        for line in f:
+            for name in TOKEN_VARS:
+                if line.startswith(f"{name}="):
+                    value = line.split("=", 1)[1].strip()
+                    if value:
+                        return value
+    return None
+
+
+def _default_login() -> Optional[str]:
+    """Получить новый токен через refresh_token.get_new_token и сохранить его в .env"""
+    try:
+        from refresh_token import get_new_token, save_token
+    except ImportError:
+        return None
+    token = get_new_token()
+    if token:
+        save_token(token)
+    return token
+
+
+class TokenProvider:
+    """
+    Источник токена для всех клиентов процесса
+
+    Args:
+        env_paths: .env файлы для поиска токена (по умолчанию рабочая директория и корень проекта)
+        refresh_margin: за сколько секунд до истечения обновлять токен
+        login: функция без аргументов, возвращающая новый токен или None
+    """
+
+    def __init__(self, env_paths=None, refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+                 login: Callable[[], Optional[str]] = _default_login):
+        if env_paths is None:
+            env_paths = [".env", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")]
+        self.env_paths = list(env_paths)
+        self.refresh_margin = refresh_margin
+        self.login = login
+        self.refresh_count = 0
+        self._failed_at = None
+        self._token = None
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._timer = None
+        self._clients = weakref.WeakSet()
+
+    def _load(self) -> Optional[str]:
+        for path in self.env_paths:
+            token = _read_env_file(path)
+            if token:
+                return token
+        for name in TOKEN_VARS:
+            token = os.getenv(name)
+            if token:
+                return token
+        return None
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """Срок действия текущего токена (unix-время) или None"""
+        return decode_jwt_expiry(self._token) if self._token else None
+
+    def _expiring(self) -> bool:
+        expires_at = self.expires_at
+        return expires_at is not None and expires_at - time.time() <= self.refresh_margin
+
+    def get_token(self) -> Optional[str]:
+        """Текущий токен; при первом обращении читается из .env/окружения"""
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                self._set_token(self._load())
+            token = self._token
+        if token and self._expiring() and not self._recently_failed():
+            return self.refresh(stale_token=token) or token
+        return token
+
+    def _recently_failed(self) -> bool:
+        return self._failed_at is not None and time.time() - self._failed_at < RETRY_LOGIN_AFTER
+
+    def refresh(self, stale_token: Optional[str] = None) -> Optional[str]:
+        """
+        Получить новый токен через login
+
+        Если передан stale_token, а токен уже обновлен другим потоком, повторный
+        вход не выполняется. Одновременные вызовы схлопываются в один вход; после
+        неудачного входа вызовы со stale_token в течение RETRY_LOGIN_AFTER секунд
+        сразу возвращают None, не повторяя вход.
+
+        Returns:
+            str: актуальный токен или None, если обновить не удалось
+        """
+        with self._lock:
+            if stale_token is not None and self._token and self._token != stale_token:
+                return self._token
+            if stale_token is not None and self._recently_failed():
+                return None
+            token = self.login() if self.login else None
+            if not token:
+                self._failed_at = time.time()
+                return None
+            self._failed_at = None
+            self.refresh_count += 1
+            self._set_token(token)
+            return token
+
+    def set_token(self, token: str):
+        """Установить токен вручную и разослать его клиентам"""
+        with self._lock:
+            self._loaded = True
+            self._set_token(token)
+
+    def _set_token(self, token: Optional[str]):
+        self._token = token
+        self._schedule_refresh()
+        if token:
+            for client in list(self._clients):
+                client.token = token
+                client.headers = client._get_headers()
+
+    def _schedule_refresh(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        expires_at = self.expires_at
+        if expires_at is None or self.login is None:
+            return
+        delay = max(expires_at - self.refresh_margin - time.time(), 0)
+        if delay == 0:
+            return
+        self._timer = threading.Timer(delay, self._proactive_refresh, args=(self._token,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _proactive_refresh(self, token):
+        self.refresh(stale_token=token)
+
+    def subscribe(self, client):
+        """Подписать клиента на обновления токена (client.token и client.headers)"""
+        self._clients.add(client)
+
+    def close(self):
+        """Остановить таймер обновления"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+
+_provider: Optional[TokenProvider] = None
+_provider_lock = threading.Lock()
+
+
+def refreshed_auth_headers(headers) -> Optional[dict]:
+    """
+    Заголовки для повтора запроса, получившего 401
+
+    Токен из Authorization считается устаревшим: если общий источник уже знает
+    более новый токен, используется он, иначе выполняется один вход на все потоки.
+
+    Returns:
+        dict: копия headers с новым токеном или None, если повторять запрос бессмысленно
+    """
+    auth = (headers or {}).get("Authorization", "")
+    if not auth.startswith("Bearer "):
+        return None
+    stale = auth[len("Bearer "):]
+    token = get_token_provider().refresh(stale_token=stale)
+    if not token or token == stale:
+        return None
+    return {**headers, "Authorization": f"Bearer {token}"}
+
+
+def get_token_provider() -> TokenProvider:
+    """Получить общий для процесса источник токена"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = TokenProvider()
+    return _provider
+
+
+def set_token_provider(provider: Optional[TokenProvider]):
+    """Заменить общий источник токена (None - создать заново при следующем обращении)"""
+    global _provider
+    with _provider_lock:
+        if _provider is not None:
+            _provider.close()
+        _provider = provider
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Массовое создание, изменение и удаление записей
+
+Вызовы одного метода клиента выполняются пулом потоков с ограничением числа
+одновременных запросов; результат содержит исход каждого элемента и итоговые
+тайминги. Для workers больше размера пула соединений стоит заранее вызвать
+configure_transport(pool_size=workers).
+
+    result = client.bulk_create_parking(payloads, workers=16)
+    print(result.summary())
+    created_ids = result.ids
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .ratelimit import TokenBucket
+
+
+DEFAULT_BULK_WORKERS = 8
+
+
+class ItemResult:
+    """Исход операции над одним элементом"""
+
+    __slots__ = ("index", "item", "status_code", "data", "error", "elapsed")
+
+    def __init__(self, index: int, item: Any, status_code: Optional[int] = None, data: Any = None,
+                 error: Optional[str] = None, elapsed: float = 0.0):
+        self.index = index
+        self.item = item
+        self.status_code = status_code
+        self.data = data
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        """Запрос выполнен и сервер ответил 2xx"""
+        return self.error is None and self.status_code is not None and 200 <= self.status_code < 300
+
+    def __repr__(self):
+        outcome = self.status_code if self.error is None else self.error
+        return f"ItemResult(index={self.index}, ok={self.ok}, {outcome})"
+
+
+class BulkResult:
+    """Исходы всех элементов в порядке входа и тайминги операции"""
+
+    def __init__(self, results: List[ItemResult], elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self) -> List[ItemResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[ItemResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def ids(self) -> List[Any]:
+        """ID созданных записей (data.id успешных ответов)"""
+        return [result.data.get("id") for result in self.succeeded
+                if isinstance(result.data, dict) and result.data.get("id") is not None]
+
+    @property
+    def items_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    def latency(self, percentile: float) -> float:
+        """Перцентиль времени запроса, с"""
+        timings = sorted(result.elapsed for result in self.results)
+        if not timings:
+            return 0.0
+        index = min(int(round(percentile / 100 * (len(timings) - 1))), len(timings) - 1)
+        return timings[index]
+
+    def summary(self) -> str:
+        """Строка с итогами операции"""
+        return (
+            f"Обработано {len(self.results)} элементов за {self.elapsed:.2f} с "
+            f"({self.items_per_second:.1f} эл/с): успешно {len(self.succeeded)}, ошибок {len(self.failed)}; "
+            f"время запроса p50={self.latency(50) * 1000:.0f} мс, p95={self.latency(95) * 1000:.0f} мс, "
+            f"max={self.latency(100) * 1000:.0f} мс"
+        )
+
+
+def _response_data(response) -> Any:
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    return body.get("data", body) if isinstance(body, dict) else body
+
+
+def run_bulk(call: Callable[[Any], Any], items: Iterable[Any], workers: int = DEFAULT_BULK_WORKERS,
+             rate: Optional[float] = None) -> BulkResult:
+    """
+    Выполнить call(item) для каждого элемента с ограниченной параллельностью
+
+    Одновременно выполняется не больше workers вызовов, и элементы читаются из items
+    по мере освобождения потоков, поэтому генератор на 10 000 элементов не
+    материализуется целиком. Ошибка отдельного элемента не прерывает операцию.
+
+    Args:
+        call: функция item -> Response
+        items: элементы (payload, ID и т.п.)
+        workers: количество одновременных запросов
+        rate: ограничение запросов в секунду (None - без ограничения)
+    """
+    cap = TokenBucket(rate, burst=1) if rate else None
+
+    def execute(index, item):
+        if cap is not None:
+            delay = cap.reserve()
+            if delay > 0:
+                time.sleep(delay)
+        started = time.perf_counter()
+        try:
+            response = call(item)
+        except Exception as e:
+            return ItemResult(index, item, error=f"{type(e).__name__}: {e}", elapsed=time.perf_counter() - started)
+        elapsed = time.perf_counter() - started
+        return ItemResult(index, item, response.status_code, _response_data(response), elapsed=elapsed)
+
+    started = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for index, item in enumerate(items):
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in done)
+            pending.add(executor.submit(execute, index, item))
+        results.extend(future.result() for future in pending)
+
+    results.sort(key=lambda result: result.index)
+    return BulkResult(results, time.perf_counter() - started)
+
+
+def bulk_create(create: Callable[..., Any], payloads: Iterable[Dict[str, Any]],
+                workers: int = DEFAULT_BULK_WORKERS, rate: Optional[float] = None) -> BulkResult:
+    """Создать записи: create(**payload) для каждого payload"""
+    return run_bulk(lambda payload: create(**payload), payloads, workers=workers, rate=rate)
+
+
+def bulk_update(update: Callable[..., Any],
+                changes: Union[Mapping[Any, Dict[str, Any]], Iterable[Tuple[Any, Dict[str, Any]]]],
+                workers: int = DEFAULT_BULK_WORKERS, rate: Optional[float] = None) -> BulkResult:
+    """Изменить записи: update(id, **fields) для каждой пары (id, fields) или элемента {id: fields}"""
+    if isinstance(changes, Mapping):
+        changes = changes.items()
+    return run_bulk(lambda change: update(change[0], **change[1]), changes, workers=workers, rate=rate)
+
+
+def bulk_delete(delete: Callable[[Any], Any], ids: Iterable[Any],
+                workers: int = DEFAULT_BULK_WORKERS, rate: Optional[float] = None) -> BulkResult:
+    """Удалить записи: delete(id) для каждого ID"""
+    return run_bulk(delete, ids, workers=workers, rate=rate)
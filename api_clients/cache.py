@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Кэш ответов справочных эндпоинтов в памяти (TTL + LRU)
+Включается отдельно для каждого клиента:
+
+    client = DTPAPIClient()
+    client.http.enable_cache(ttl=600, endpoints=["/dtp/types"])
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+
+# Последний сегмент пути, похожий на идентификатор записи
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{32,36})$")
+
+
+def resource_path(url: str) -> str:
+    """Путь ресурса, которого касается запись: /category/5 -> /category"""
+    path = urlsplit(url).path.rstrip("/")
+    head, _, last = path.rpartition("/")
+    if head and _ID_SEGMENT.match(last):
+        return head
+    return path
+
+
+class ResponseCache:
+    """
+    Кэш GET ответов с ограничением по времени жизни и количеству записей
+
+    Args:
+        ttl: время жизни записи, с
+        max_entries: максимальное число записей (самые давно использованные вытесняются)
+        endpoints: фрагменты пути URL, ответы которых кэшируются (None - все GET запросы)
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 256, endpoints: Optional[Iterable[str]] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.endpoints = list(endpoints) if endpoints is not None else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(url: str, params=None, headers=None) -> tuple:
+        """Ключ записи: URL, параметры запроса и заголовок project"""
+        if isinstance(params, dict):
+            params = tuple(sorted((str(k), str(v)) for k, v in params.items()))
+        elif params is not None:
+            params = tuple(params) if not isinstance(params, (str, bytes)) else params
+        project = (headers or {}).get("project")
+        return url, params or None, project
+
+    def cacheable(self, url: str) -> bool:
+        """Кэшируется ли ответ для url"""
+        if self.endpoints is None:
+            return True
+        path = urlsplit(url).path
+        return any(endpoint in path for endpoint in self.endpoints)
+
+    def get(self, key: tuple):
+        """Ответ из кэша или None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key: tuple, response):
+        """Сохранить ответ"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, url: str) -> int:
+        """
+        Удалить записи ресурса, измененного запросом к url
+
+        Запись в /category/5 сбрасывает /category, /category/5 и вложенные пути.
+
+        Returns:
+            int: количество удаленных записей
+        """
+        resource = resource_path(url)
+        parts = urlsplit(url)
+        with self._lock:
+            stale = []
+            for key in self._entries:
+                cached = urlsplit(key[0])
+                if cached.netloc != parts.netloc:
+                    continue
+                path = cached.path.rstrip("/")
+                if path == resource or path.startswith(resource + "/"):
+                    stale.append(key)
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self):
+        """Очистить кэш"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Счетчики попаданий, промахов и вытеснений"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
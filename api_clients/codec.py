@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Подключаемый JSON кодек для тел запросов и ответов
+По умолчанию выбирается самый быстрый из установленных: orjson, ujson, стандартный json
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional, Union
+
+
+class JSONCodec:
+    """
+    Пара функций кодирования и декодирования
+
+    Args:
+        name: имя кодека
+        dumps: объект -> bytes
+        loads: bytes/str -> объект (ошибка разбора - ValueError)
+    """
+
+    def __init__(self, name: str, dumps: Callable[[Any], bytes], loads: Callable[[Union[bytes, str]], Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self):
+        return f"JSONCodec({self.name!r})"
+
+
+def _stdlib_codec() -> JSONCodec:
+    # Те же параметры, что использует requests для json=
+    return JSONCodec(
+        "json",
+        lambda obj: json.dumps(obj, allow_nan=False).encode("utf-8"),
+        json.loads
+    )
+
+
+def _orjson_codec() -> Optional[JSONCodec]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return JSONCodec("orjson", orjson.dumps, orjson.loads)
+
+
+def _ujson_codec() -> Optional[JSONCodec]:
+    try:
+        import ujson
+    except ImportError:
+        return None
+    return JSONCodec(
+        "ujson",
+        lambda obj: ujson.dumps(obj, ensure_ascii=False).encode("utf-8"),
+        ujson.loads
+    )
+
+
+_FACTORIES = {
+    "orjson": _orjson_codec,
+    "ujson": _ujson_codec,
+    "json": _stdlib_codec,
+}
+
+
+def available_codecs() -> Dict[str, JSONCodec]:
+    """Установленные кодеки в порядке предпочтения"""
+    codecs = {}
+    for name, factory in _FACTORIES.items():
+        codec = factory()
+        if codec is not None:
+            codecs[name] = codec
+    return codecs
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Получить кодек по имени или самый быстрый из установленных
+
+    Raises:
+        ValueError: неизвестное имя или библиотека не установлена
+    """
+    if name is None:
+        return next(iter(available_codecs().values()))
+    factory = _FACTORIES.get(name)
+    codec = factory() if factory else None
+    if codec is None:
+        raise ValueError(f"JSON кодек {name!r} недоступен")
+    return codec
+
+
+def encode_json_body(kwargs: dict, codec: JSONCodec, body_key: str = "data"):
+    """Заменить json= в аргументах запроса на тело, закодированное codec"""
+    payload = kwargs.pop("json")
+    kwargs[body_key] = codec.dumps(payload)
+    headers = dict(kwargs.get("headers") or {})
+    if not any(name.lower() == "content-type" for name in headers):
+        headers["Content-Type"] = "application/json"
+    kwargs["headers"] = headers
+
+
+STDLIB_CODEC = _stdlib_codec()
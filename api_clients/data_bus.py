@@ -5,35 +5,29 @@ API клиент для Data Bus (Общая шина)
 
 import requests
 from typing import Dict, Any, Optional, List
-import os
 import urllib3
 
+from .auth import get_token_provider
+from .transport import bind_transport
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
 class DataBusAPIClient:
     """API клиент для работы с Data Bus"""
     
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = bind_transport(self, transport)
         self.base_url = "http://91.227.17.139/services/data-bus"
         self.token = self._get_token()
         self.headers = self._get_headers()
+        get_token_provider().subscribe(self)
     
     def _get_token(self) -> str:
-        """Получает токен из .env файла"""
-        token = None
-        env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
-        
-        if os.path.exists(env_path):
-            with open(env_path, 'r') as f:
-                for line in f:
-                    if line.startswith('EPUTS_TOKEN=') or line.startswith('API_TOKEN='):
-                        token = line.split('=', 1)[1].strip()
-                        break
-        
+        """Получает токен из общего источника токена"""
+        token = get_token_provider().get_token()
         if not token:
             raise ValueError("Токен не найден! Запустите refresh_token.py")
-        
         return token
     
     def _get_headers(self) -> Dict[str, str]:
@@ -48,7 +42,8 @@ class DataBusAPIClient:
     def check_token(self) -> bool:
         """Проверяет валидность токена"""
         try:
-            response = self.collection_service_list()
+            response = self.http.post(f"{self.base_url}/api/collection-service/list", json={},
+                                      headers=self.headers, verify=False, auth_retry=False)
             return response.status_code == 200
         except Exception:
             return False
@@ -58,7 +53,7 @@ class DataBusAPIClient:
     def collection_service_list(self) -> requests.Response:
         """Получение списка сервисов сбора данных"""
         url = f"{self.base_url}/api/collection-service/list"
-        return requests.post(url, json={}, headers=self.headers, verify=False)
+        return self.http.post(url, json={}, headers=self.headers, verify=False)
     
     def collection_service_create(self, name: str, template: Dict[str, Any], 
                                    service_id: int, template_id: int) -> requests.Response:
@@ -70,7 +65,7 @@ class DataBusAPIClient:
             "service_id": service_id,
             "template_id": template_id
         }
-        return requests.post(url, json=payload, headers=self.headers, verify=False)
+        return self.http.post(url, json=payload, headers=self.headers, verify=False)
     
     def collection_service_update(self, service_id: int, name: str, 
                                    template: Dict[str, Any], 
@@ -83,26 +78,26 @@ class DataBusAPIClient:
             "service_id": service_type_id,
             "template_id": template_id
         }
-        return requests.put(url, json=payload, headers=self.headers, verify=False)
+        return self.http.put(url, json=payload, headers=self.headers, verify=False)
     
     def collection_service_delete(self, service_id: int) -> requests.Response:
         """Удаление сервиса сбора данных"""
         url = f"{self.base_url}/api/collection-service/{service_id}"
-        return requests.delete(url, headers=self.headers, verify=False)
+        return self.http.delete(url, headers=self.headers, verify=False)
     
     # ===== Jobs =====
     
     def job_list(self) -> requests.Response:
         """Получение списка задач"""
         url = f"{self.base_url}/api/job/list"
-        return requests.post(url, json={}, headers=self.headers, verify=False)
+        return self.http.post(url, json={}, headers=self.headers, verify=False)
     
     # ===== Relay Services =====
     
     def relay_service_list(self) -> requests.Response:
         """Получение списка сервисов ретрансляции"""
         url = f"{self.base_url}/api/relay-service/list"
-        return requests.post(url, json={}, headers=self.headers, verify=False)
+        return self.http.post(url, json={}, headers=self.headers, verify=False)
     
     # EGTS Clone
     
@@ -124,7 +119,7 @@ class DataBusAPIClient:
             "port": port,
             "collection_service_id_list": collection_service_id_list
         }
-        return requests.post(url, json=payload, headers=self.headers, verify=False)
+        return self.http.post(url, json=payload, headers=self.headers, verify=False)
     
     def relay_egts_clone_update(self, relay_id: int, name: str, ip: str, port: int,
                                  collection_service_id_list: List[int],
@@ -144,12 +139,12 @@ class DataBusAPIClient:
             "port": port,
             "collection_service_id_list": collection_service_id_list
         }
-        return requests.put(url, json=payload, headers=self.headers, verify=False)
+        return self.http.put(url, json=payload, headers=self.headers, verify=False)
     
     def relay_egts_clone_delete(self, relay_id: int) -> requests.Response:
         """Удаление сервиса ретрансляции EGTS клон"""
         url = f"{self.base_url}/api/relay-service/egts-clone/{relay_id}"
-        return requests.delete(url, headers=self.headers, verify=False)
+        return self.http.delete(url, headers=self.headers, verify=False)
     
     # EGTS Telemetry
     
@@ -176,7 +171,7 @@ class DataBusAPIClient:
             "organization_id_list": organization_id_list,
             "id_field": id_field
         }
-        return requests.post(url, json=payload, headers=self.headers, verify=False)
+        return self.http.post(url, json=payload, headers=self.headers, verify=False)
     
     def relay_egts_telemetry_update(self, relay_id: int, name: str, ip: str, port: int,
                                      type_id_list: List[int], organization_id_list: List[int],
@@ -201,10 +196,10 @@ class DataBusAPIClient:
             "organization_id_list": organization_id_list,
             "id_field": id_field
         }
-        return requests.put(url, json=payload, headers=self.headers, verify=False)
+        return self.http.put(url, json=payload, headers=self.headers, verify=False)
     
     def relay_egts_telemetry_delete(self, relay_id: int) -> requests.Response:
         """Удаление сервиса ретрансляции EGTS телеметрия"""
         url = f"{self.base_url}/api/relay-service/egts-telemetry/{relay_id}"
-        return requests.delete(url, headers=self.headers, verify=False)
+        return self.http.delete(url, headers=self.headers, verify=False)
 
@@ -5,28 +5,30 @@ API клиент для раздела Цифровой двойник
 """
 
 import requests
-import os
+
+from .auth import get_token_provider
+from .geo import DEFAULT_CELL_SIZE, DEFAULT_TILES, DEFAULT_TILE_WORKERS, SpatialCache, iter_tiled
+from .graph import load_graph
+from .graph_sync import GraphSync
+from .graph_tiles import DEFAULT_MAX_BYTES, GraphTileCache
+from .streaming import stream_items
+from .transport import bind_transport
 
 
 class DigitalTwinAPIClient:
     """API клиент для Цифрового двойника"""
     
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = bind_transport(self, transport)
         self.road_network_url = "http://91.227.17.139/services/road-network/api"
         self.cifdv_graph_url = "http://91.227.17.139/services/cifdv-graph/api"
         self.token = self._get_token()
         self.headers = self._get_headers()
+        get_token_provider().subscribe(self)
     
     def _get_token(self):
         """Получить токен"""
-        try:
-            with open('.env', 'r') as f:
-                for line in f:
-                    if line.startswith('EPUTS_TOKEN='):
-                        return line.split('=', 1)[1].strip()
-        except:
-            pass
-        return None
+        return get_token_provider().get_token()
     
     def _get_headers(self):
         """Получить заголовки"""
@@ -43,12 +45,13 @@ class DigitalTwinAPIClient:
     def check_token(self):
         """Проверить валидность токена"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.road_network_url}/infrastructure",
                 params={"page": 1, "limit": 1},
                 headers=self.headers,
                 verify=False,
-                timeout=10
+                timeout=10,
+                auth_retry=False
             )
             
             if response.status_code == 401:
@@ -67,11 +70,11 @@ class DigitalTwinAPIClient:
     def get_infrastructure_list(self, page=1, limit=25):
         """Получить список объектов инфраструктуры"""
         params = {"page": page, "limit": limit}
-        return requests.get(f"{self.road_network_url}/infrastructure", params=params, headers=self.headers, verify=False, timeout=30)
+        return self.http.get(f"{self.road_network_url}/infrastructure", params=params, headers=self.headers, verify=False, timeout=30)
     
     def get_infrastructure_by_polygon(self, polygon_data):
         """Получить объекты инфраструктуры по полигону"""
-        return requests.post(f"{self.road_network_url}/infrastructure/polygon", json=polygon_data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.road_network_url}/infrastructure/polygon", json=polygon_data, headers=self.headers, verify=False)
     
     def create_infrastructure(self, name, description, lat, lon, type_id, organization_id, address, address_text, geometry):
         """Создать объект инфраструктуры"""
@@ -86,47 +89,76 @@ class DigitalTwinAPIClient:
             "address_text": address_text,
             "geometry": geometry
         }
-        return requests.post(f"{self.road_network_url}/infrastructure", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.road_network_url}/infrastructure", json=data, headers=self.headers, verify=False)
     
     def update_infrastructure(self, infrastructure_id, **fields):
         """Обновить объект инфраструктуры"""
-        return requests.put(f"{self.road_network_url}/infrastructure/{infrastructure_id}", json=fields, headers=self.headers, verify=False)
+        return self.http.put(f"{self.road_network_url}/infrastructure/{infrastructure_id}", json=fields, headers=self.headers, verify=False)
     
     def delete_infrastructure(self, infrastructure_id):
         """Удалить объект инфраструктуры"""
-        return requests.delete(f"{self.road_network_url}/infrastructure/{infrastructure_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.road_network_url}/infrastructure/{infrastructure_id}", headers=self.headers, verify=False)
+    
+    def iter_infrastructure_tiled(self, polygon_data, rows=DEFAULT_TILES, cols=DEFAULT_TILES, workers=DEFAULT_TILE_WORKERS):
+        """
+        Объекты инфраструктуры большого полигона: плитки rows x cols запрашиваются параллельно,
+        объекты отдаются по мере ответов без повторов по id (см. geo.iter_tiled)
+        """
+        return iter_tiled(self.get_infrastructure_by_polygon, polygon_data, rows=rows, cols=cols, workers=workers)
+    
+    def infrastructure_index(self, cell_size=DEFAULT_CELL_SIZE, ttl=None):
+        """
+        Локальный пространственный индекс объектов инфраструктуры
+
+        Запросы по полигону, прямоугольнику и ближайшим объектам выполняются в памяти;
+        сервер запрашивается только для еще не загруженных ячеек (см. geo.SpatialCache)
+        """
+        return SpatialCache(self.get_infrastructure_by_polygon, cell_size=cell_size, ttl=ttl)
     
     # === Типы инфраструктуры ===
     
     def get_infrastructure_types_list(self, page=1, limit=25):
         """Получить список типов объектов инфраструктуры"""
         params = {"page": page, "limit": limit}
-        return requests.get(f"{self.road_network_url}/infrastructure_type", params=params, headers=self.headers, verify=False, timeout=30)
+        return self.http.get(f"{self.road_network_url}/infrastructure_type", params=params, headers=self.headers, verify=False, timeout=30)
     
     def create_infrastructure_type(self, name):
         """Создать тип объекта инфраструктуры"""
         data = {"name": name}
-        return requests.post(f"{self.road_network_url}/infrastructure_type/", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.road_network_url}/infrastructure_type/", json=data, headers=self.headers, verify=False)
     
     def update_infrastructure_type(self, type_id, name):
         """Обновить тип объекта инфраструктуры"""
         data = {"name": name}
-        return requests.put(f"{self.road_network_url}/infrastructure_type/{type_id}", json=data, headers=self.headers, verify=False)
+        return self.http.put(f"{self.road_network_url}/infrastructure_type/{type_id}", json=data, headers=self.headers, verify=False)
     
     def delete_infrastructure_type(self, type_id):
         """Удалить тип объекта инфраструктуры"""
-        return requests.delete(f"{self.road_network_url}/infrastructure_type/{type_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.road_network_url}/infrastructure_type/{type_id}", headers=self.headers, verify=False)
     
     # === Элементы дорожной сети ===
     
     def get_road_sections_list(self, page=1, limit=25):
         """Получить список элементов дорожной сети"""
         params = {"page": page, "limit": limit}
-        return requests.get(f"{self.road_network_url}/road-section", params=params, headers=self.headers, verify=False)
+        return self.http.get(f"{self.road_network_url}/road-section", params=params, headers=self.headers, verify=False)
     
     def get_road_sections_by_polygon(self, polygon_data):
         """Получить элементы дорожной сети по полигону"""
-        return requests.post(f"{self.road_network_url}/road-section/polygon", json=polygon_data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.road_network_url}/road-section/polygon", json=polygon_data, headers=self.headers, verify=False)
+    
+    def stream_road_sections_by_polygon(self, polygon_data):
+        """Потоково получить элементы дорожной сети по полигону (записи data по мере чтения ответа)"""
+        response = self.http.post(f"{self.road_network_url}/road-section/polygon", json=polygon_data, headers=self.headers, verify=False, stream=True)
+        return stream_items(response, codec=self.http.codec)
+    
+    def iter_road_sections_tiled(self, polygon_data, rows=DEFAULT_TILES, cols=DEFAULT_TILES, workers=DEFAULT_TILE_WORKERS):
+        """Элементы дорожной сети большого полигона по плиткам (см. iter_infrastructure_tiled)"""
+        return iter_tiled(self.get_road_sections_by_polygon, polygon_data, rows=rows, cols=cols, workers=workers)
+    
+    def road_sections_index(self, cell_size=DEFAULT_CELL_SIZE, ttl=None):
+        """Локальный пространственный индекс элементов дорожной сети (см. infrastructure_index)"""
+        return SpatialCache(self.get_road_sections_by_polygon, cell_size=cell_size, ttl=ttl)
     
     def create_road_section(self, name, description, address_text, fixated_at, category, type_val, status, length, lat, lon, organization_id, cadastre, address, geometry, data):
         """Создать элемент дорожной сети"""
@@ -148,41 +180,62 @@ class DigitalTwinAPIClient:
             "data": data,
             "created_at": None
         }
-        return requests.post(f"{self.road_network_url}/road-section", json=payload, headers=self.headers, verify=False)
+        return self.http.post(f"{self.road_network_url}/road-section", json=payload, headers=self.headers, verify=False)
     
     def update_road_section(self, section_id, **fields):
         """Обновить элемент дорожной сети"""
-        return requests.put(f"{self.road_network_url}/road-section/{section_id}", json=fields, headers=self.headers, verify=False)
+        return self.http.put(f"{self.road_network_url}/road-section/{section_id}", json=fields, headers=self.headers, verify=False)
     
     def delete_road_section(self, section_id):
         """Удалить элемент дорожной сети"""
-        return requests.delete(f"{self.road_network_url}/road-section/{section_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.road_network_url}/road-section/{section_id}", headers=self.headers, verify=False)
     
     def get_road_section_report(self, report_format="XLS"):
         """Получить отчет по элементам дорожной сети"""
         params = {"report": 1, "formats[]": report_format}
-        return requests.get(f"{self.road_network_url}/road-section", params=params, headers=self.headers, verify=False)
+        return self.http.get(f"{self.road_network_url}/road-section", params=params, headers=self.headers, verify=False)
     
     # === Граф УДС ===
     
     def get_graph(self, geometry, zoom=9):
         """Получить граф УДС по полигону"""
         data = {"geometry": geometry, "zoom": zoom}
-        return requests.post(f"{self.cifdv_graph_url}/v2/get-graph", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.cifdv_graph_url}/v2/get-graph", json=data, headers=self.headers, verify=False)
+    
+    def stream_graph(self, geometry, zoom=9):
+        """Потоково получить граф УДС по полигону: пары ("nodes" | "edges", элемент) по мере чтения ответа"""
+        data = {"geometry": geometry, "zoom": zoom}
+        response = self.http.post(f"{self.cifdv_graph_url}/v2/get-graph", json=data, headers=self.headers, verify=False, stream=True)
+        return stream_items(response, keys=("nodes", "edges"), codec=self.http.codec, with_keys=True)
+    
+    def load_compact_graph(self, geometry, zoom=9, directed=False):
+        """
+        Граф УДС по полигону в компактных массивах (CSR) для поиска соседей, компонент и путей
+
+        Ответ читается потоково и не хранится целиком (см. graph.CompactGraph)
+        """
+        return load_graph(self.stream_graph(geometry, zoom), directed=directed)
+    
+    def graph_tile_cache(self, max_bytes=DEFAULT_MAX_BYTES, revision=None):
+        """
+        Кэш плиток графа УДС по (x, y, zoom, ревизия): окно карты собирается из плиток кэша,
+        с сервера запрашиваются только недостающие (см. graph_tiles.GraphTileCache)
+        """
+        return GraphTileCache(self, max_bytes=max_bytes, revision=revision)
     
     # === Ревизии ===
     
     def get_revisions_list(self, page=1, per_page=25, sorting="created_at"):
         """Получить список ревизий"""
         params = {"page": page, "per_page": per_page, "sorting": sorting}
-        return requests.get(f"{self.cifdv_graph_url}/v2/revisions", params=params, headers=self.headers, verify=False)
+        return self.http.get(f"{self.cifdv_graph_url}/v2/revisions", params=params, headers=self.headers, verify=False)
     
     # === Узлы ===
     
-    def get_nodes_list(self, page=1, per_page=25):
-        """Получить список узлов"""
-        params = {"page": page, "per_page": per_page}
-        return requests.get(f"{self.cifdv_graph_url}/nodes", params=params, headers=self.headers, verify=False)
+    def get_nodes_list(self, page=1, per_page=25, **filters):
+        """Получить список узлов (filters - дополнительные параметры запроса, например revision_id)"""
+        params = {"page": page, "per_page": per_page, **filters}
+        return self.http.get(f"{self.cifdv_graph_url}/nodes", params=params, headers=self.headers, verify=False)
     
     def create_node(self, lat, lon, geometry, node_type="Point"):
         """Создать узел"""
@@ -192,18 +245,28 @@ class DigitalTwinAPIClient:
             "geometry": geometry,
             "type": node_type
         }
-        return requests.post(f"{self.cifdv_graph_url}/nodes", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.cifdv_graph_url}/nodes", json=data, headers=self.headers, verify=False)
     
     def delete_node(self, node_id):
         """Удалить узел"""
-        return requests.delete(f"{self.cifdv_graph_url}/nodes/{node_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.cifdv_graph_url}/nodes/{node_id}", headers=self.headers, verify=False)
     
     # === Атрибуты ===
     
-    def get_attributes_list(self, page=1, per_page=25):
-        """Получить список атрибутов"""
-        params = {"page": page, "per_page": per_page}
-        return requests.get(f"{self.cifdv_graph_url}/v2/attributes", params=params, headers=self.headers, verify=False)
+    def get_attributes_list(self, page=1, per_page=25, **filters):
+        """Получить список атрибутов (filters - дополнительные параметры запроса, например revision_id)"""
+        params = {"page": page, "per_page": per_page, **filters}
+        return self.http.get(f"{self.cifdv_graph_url}/v2/attributes", params=params, headers=self.headers, verify=False)
+    
+    # === Синхронизация графа ===
+    
+    def graph_sync(self, path=None):
+        """
+        Инкрементальная синхронизация узлов и атрибутов по ревизиям (см. graph_sync.GraphSync)
+
+        path - JSON файл, в котором хранится локальная копия и последняя примененная ревизия
+        """
+        return GraphSync(self, path=path)
     
     # === Вспомогательные методы ===
     
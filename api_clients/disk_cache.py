@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Кэш ответов на диске с условной проверкой актуальности (ETag / Last-Modified)
+
+Тело ответа хранится между запусками процесса; повторный запрос уходит с
+If-None-Match / If-Modified-Since, и при 304 тело берется с диска. Запись -
+один файл <ключ>.entry: строка JSON с валидаторами и длиной тела, затем тело;
+файл заменяется целиком, поэтому валидаторы не окажутся рядом с чужим телом.
+
+    get_transport().disk_cache = DiskCache(".http_cache", endpoints=["/vestibule", "/road-section"],
+                                           methods=("GET", "POST"))
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+
+ENTRY_SUFFIX = ".entry"
+
+class DiskCache:
+    """
+    Каталог с телами ответов и их валидаторами (файл на запись)
+
+    Args:
+        directory: каталог кэша (создается при необходимости)
+        endpoints: фрагменты пути URL, ответы которых кэшируются (None - все)
+        methods: кэшируемые методы; списочные POST эндпоинты кэшируются по хэшу тела запроса
+    """
+
+    def __init__(self, directory: str, endpoints: Optional[Iterable[str]] = None,
+                 methods: Iterable[str] = ("GET",)):
+        self.directory = directory
+        self.endpoints = list(endpoints) if endpoints is not None else None
+        self.methods = frozenset(m.upper() for m in methods)
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def cacheable(self, method: str, url: str) -> bool:
+        """Кэшируется ли запрос"""
+        if method.upper() not in self.methods:
+            return False
+        if self.endpoints is None:
+            return True
+        path = urlsplit(url).path
+        return any(endpoint in path for endpoint in self.endpoints)
+
+    @staticmethod
+    def key(method: str, url: str, kwargs: dict) -> str:
+        """Ключ: метод, URL, параметры, тело запроса и заголовок project"""
+        params = kwargs.get("params")
+        if isinstance(params, dict):
+            params = sorted((str(k), str(v)) for k, v in params.items())
+        body = kwargs.get("json")
+        if body is None:
+            body = kwargs.get("data") or kwargs.get("content")
+            if isinstance(body, bytes):
+                body = body.decode("utf-8", "replace")
+        project = (kwargs.get("headers") or {}).get("project")
+        raw = json.dumps([method.upper(), url, params, body, project], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def load(self, key: str) -> Optional[Dict]:
+        """
+        Запись кэша или None
+
+        Returns:
+            dict: {"url", "etag", "last_modified", "headers", "body"}
+        """
+        try:
+            with open(self._path(key), "rb") as f:
+                header = f.readline()
+                body = f.read()
+            entry = json.loads(header)
+        except (OSError, ValueError):
+            return None
+        # Обрезанный или поврежденный файл - промах
+        if not isinstance(entry, dict) or entry.pop("size", None) != len(body):
+            return None
+        entry["body"] = body
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: Dict, headers: Optional[dict]) -> dict:
+        """Копия заголовков запроса с If-None-Match / If-Modified-Since"""
+        headers = dict(headers or {})
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key: str, url: str, headers, body: bytes) -> bool:
+        """
+        Сохранить тело ответа 200, если у него есть валидатор
+
+        Returns:
+            bool: True, если ответ сохранен
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return False
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {"Content-Type": headers.get("Content-Type", "application/json")},
+            "size": len(body),
+        }
+        # Заголовок и тело в одном файле, запись через временный файл: другой процесс
+        # не увидит частично записанный ответ или валидаторы от другого ответа
+        self._write(self._path(key), json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n" + body)
+        with self._lock:
+            self.stores += 1
+        return True
+
+    def _write(self, path: str, data: bytes):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def record(self, hit: bool):
+        """Учесть результат проверки (304 - попадание)"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        """Удалить все записи"""
+        for name in os.listdir(self.directory):
+            if name.endswith((ENTRY_SUFFIX, ".json", ".body")):
+                os.remove(os.path.join(self.directory, name))
+
+    def stats(self) -> Dict[str, int]:
+        """Счетчики: ответы с диска (304), полные ответы, сохраненные тела"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "stores": self.stores}
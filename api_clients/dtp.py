@@ -4,26 +4,27 @@ API клиент для раздела ДТП
 """
 
 import requests
-import os
+
+from .auth import get_token_provider
+from .bulk import DEFAULT_BULK_WORKERS, bulk_create, bulk_delete, bulk_update
+from .models import Dtp, parse_list, typed
+from .pagination import fetch_all_pages, iter_records
+from .transport import bind_transport
 
 
 class DTPAPIClient:
     """API клиент для ДТП"""
     
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = bind_transport(self, transport)
         self.base_url = "http://91.227.17.139/services"
         self.token = self._get_token()
         self.headers = self._get_headers()
+        get_token_provider().subscribe(self)
     
     def _get_token(self):
         """Получить токен"""
-        token_file = ".env"
-        if os.path.exists(token_file):
-            with open(token_file, 'r') as f:
-                for line in f:
-                    if line.startswith('EPUTS_TOKEN='):
-                        return line.split('=', 1)[1].strip()
-        return os.getenv("EPUTS_TOKEN", "NOT_SET")
+        return get_token_provider().get_token() or "NOT_SET"
     
     def _get_headers(self):
         """Получить заголовки"""
@@ -46,12 +47,13 @@ class DTPAPIClient:
             dict: {"valid": bool, "status_code": int, "message": str}
         """
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/dtp/api/dtp/types",
                 params={"page": 1, "limit": 1},
                 headers=self.headers,
                 verify=False,
-                timeout=10
+                timeout=10,
+                auth_retry=False
             )
             
             if response.status_code == 401:
@@ -90,27 +92,39 @@ class DTPAPIClient:
     def get_dtp_types(self, page=1, limit=25):
         """Получить список типов ДТП"""
         params = {"page": page, "limit": limit}
-        return requests.get(f"{self.base_url}/dtp/api/dtp/types", params=params, headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/dtp/api/dtp/types", params=params, headers=self.headers, verify=False)
     
     # === POPULATION ===
     def get_population_list(self, page=1, limit=25):
         """Получить список населения"""
         params = {"page": page, "limit": limit}
-        return requests.get(f"{self.base_url}/dtp/api/population", params=params, headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/dtp/api/population", params=params, headers=self.headers, verify=False)
     
     def create_population(self, year, count):
         """Создать запись населения"""
         data = {"year": year, "count": count}
-        return requests.post(f"{self.base_url}/dtp/api/population", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/dtp/api/population", json=data, headers=self.headers, verify=False)
     
     def update_population(self, population_id, year, count):
         """Обновить запись населения"""
         data = {"year": year, "count": count}
-        return requests.put(f"{self.base_url}/dtp/api/population/{population_id}", json=data, headers=self.headers, verify=False)
+        return self.http.put(f"{self.base_url}/dtp/api/population/{population_id}", json=data, headers=self.headers, verify=False)
     
     def delete_population(self, population_id):
         """Удалить запись населения"""
-        return requests.delete(f"{self.base_url}/dtp/api/population/{population_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.base_url}/dtp/api/population/{population_id}", headers=self.headers, verify=False)
+    
+    def bulk_create_population(self, payloads, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Создать записи населения параллельно (payloads - {"year", "count"}), BulkResult"""
+        return bulk_create(self.create_population, payloads, workers=workers, rate=rate)
+    
+    def bulk_update_population(self, changes, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Обновить записи населения параллельно ({population_id: {"year", "count"}} или пары), BulkResult"""
+        return bulk_update(self.update_population, changes, workers=workers, rate=rate)
+    
+    def bulk_delete_population(self, population_ids, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Удалить записи населения параллельно, BulkResult"""
+        return bulk_delete(self.delete_population, population_ids, workers=workers, rate=rate)
     
     # === DTP CONCENTRATION AREA (МКДТП) ===
     def get_dtp_concentration_areas(self, page=1, limit=25, start_date=None, end_date=None, with_dtp_list=1):
@@ -120,7 +134,7 @@ class DTPAPIClient:
             params["start_date"] = start_date
         if end_date:
             params["end_date"] = end_date
-        return requests.get(f"{self.base_url}/dtp/api/dtp-concentration-area", params=params, headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/dtp/api/dtp-concentration-area", params=params, headers=self.headers, verify=False)
     
     def create_dtp_concentration_area(self, name, dtp_type, status, address, lat, lon, description, dtp_ids):
         """Создать МКДТП"""
@@ -142,15 +156,15 @@ class DTPAPIClient:
             "dtp_list": [],
             "polygon": None
         }
-        return requests.post(f"{self.base_url}/dtp/api/dtp-concentration-area", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/dtp/api/dtp-concentration-area", json=data, headers=self.headers, verify=False)
     
     def update_dtp_concentration_area(self, mkdtp_id, **fields):
         """Обновить МКДТП"""
-        return requests.put(f"{self.base_url}/dtp/api/dtp-concentration-area/{mkdtp_id}", json=fields, headers=self.headers, verify=False)
+        return self.http.put(f"{self.base_url}/dtp/api/dtp-concentration-area/{mkdtp_id}", json=fields, headers=self.headers, verify=False)
     
     def delete_dtp_concentration_area(self, mkdtp_id):
         """Удалить МКДТП"""
-        return requests.delete(f"{self.base_url}/dtp/api/dtp-concentration-area/{mkdtp_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.base_url}/dtp/api/dtp-concentration-area/{mkdtp_id}", headers=self.headers, verify=False)
     
     # === DTP (ДТП) ===
     def get_dtp_list(self, page=1, limit=25, start_date=None, end_date=None):
@@ -160,7 +174,37 @@ class DTPAPIClient:
             data["start_date"] = start_date
         if end_date:
             data["end_date"] = end_date
-        return requests.post(f"{self.base_url}/dtp/api/v2/dtp/list", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/dtp/api/v2/dtp/list", json=data, headers=self.headers, verify=False)
+    
+    def get_dtp_list_typed(self, page=1, limit=25, start_date=None, end_date=None):
+        """Получить список ДТП как ModelList[Dtp]"""
+        return typed(self.get_dtp_list(page=page, limit=limit, start_date=start_date, end_date=end_date), parse_list, Dtp)
+    
+    def iter_dtp_list(self, limit=25, start_date=None, end_date=None, prefetch=False):
+        """Обойти все ДТП постранично (prefetch - загружать следующую страницу в фоне)"""
+        return iter_records(
+            lambda page: self.get_dtp_list(page=page, limit=limit, start_date=start_date, end_date=end_date),
+            limit,
+            prefetch=prefetch
+        )
+    
+    def fetch_all_dtp(self, limit=100, start_date=None, end_date=None, workers=4, rate=None):
+        """
+        Выгрузить весь реестр ДТП параллельными запросами страниц
+        
+        Args:
+            limit: int - размер страницы
+            workers: int - количество одновременных запросов
+            rate: float - ограничение запросов в секунду (None - без ограничения)
+        Returns:
+            BulkFetchResult - записи в порядке страниц, summary() с пропускной способностью
+        """
+        return fetch_all_pages(
+            lambda page: self.get_dtp_list(page=page, limit=limit, start_date=start_date, end_date=end_date),
+            limit,
+            workers=workers,
+            rate=rate
+        )
     
     def create_dtp(self, status, dtp_type, dtp_at, address, lat, lon, description, geometry):
         """Создать ДТП"""
@@ -182,15 +226,15 @@ class DTPAPIClient:
             "geometry": geometry,
             "address_text": f"{address.get('city_name', '')}, {address.get('street', '')}, {address.get('house', '')}"
         }
-        return requests.post(f"{self.base_url}/dtp/api/dtp", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/dtp/api/dtp", json=data, headers=self.headers, verify=False)
     
     def update_dtp(self, dtp_id, **fields):
         """Обновить ДТП"""
-        return requests.put(f"{self.base_url}/dtp/api/dtp/{dtp_id}", json=fields, headers=self.headers, verify=False)
+        return self.http.put(f"{self.base_url}/dtp/api/dtp/{dtp_id}", json=fields, headers=self.headers, verify=False)
     
     def delete_dtp(self, dtp_id):
         """Удалить ДТП"""
-        return requests.delete(f"{self.base_url}/dtp/api/dtp/{dtp_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.base_url}/dtp/api/dtp/{dtp_id}", headers=self.headers, verify=False)
     
     # === DTP REPORTS ===
     def get_dtp_report_by_percent(self, start_date, end_date, with_wounded=0, with_dead=0, report=None):
@@ -203,7 +247,7 @@ class DTPAPIClient:
         }
         if report:
             params["report"] = report
-        return requests.get(f"{self.base_url}/dtp/api/report/by-percent", params=params, headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/dtp/api/report/by-percent", params=params, headers=self.headers, verify=False)
     
     def get_dtp_heatmap(self, polygon, type_load, start_date, end_date, with_wounded, with_dead, dtp_type):
         """Получить тепловую карту ДТП"""
@@ -216,7 +260,7 @@ class DTPAPIClient:
             "with_dead": with_dead,
             "dtp_type": dtp_type
         }
-        return requests.post(f"{self.base_url}/dtp/api/dtp/polygon", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/dtp/api/dtp/polygon", json=data, headers=self.headers, verify=False)
     
     def get_dtp_by_time(self, start_date, end_date, start_time, end_time):
         """Получить отчет ДТП по времени"""
@@ -226,7 +270,7 @@ class DTPAPIClient:
             "start_time": start_time,
             "end_time": end_time
         }
-        return requests.post(f"{self.base_url}/dtp/api/dtp/by-time", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/dtp/api/dtp/by-time", json=data, headers=self.headers, verify=False)
     
     def get_dtp_count_by_periods(self, dates, selected_types=None, types=None):
         """Получить отчет по сравнению периодов"""
@@ -235,4 +279,4 @@ class DTPAPIClient:
             "selectedTypes": selected_types or [],
             "types": types or []
         }
-        return requests.post(f"{self.base_url}/dtp/api/v2/dtp/count-by-periods", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/dtp/api/v2/dtp/count-by-periods", json=data, headers=self.headers, verify=False)
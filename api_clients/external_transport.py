@@ -4,28 +4,25 @@ API клиент для раздела Внешний транспорт
 """
 
 import requests
-import os
+
+from .auth import get_token_provider
+from .transport import bind_transport
 
 
 class ExternalTransportAPIClient:
     """API клиент для работы с внешним транспортом"""
     
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = bind_transport(self, transport)
         self.base_url = "http://91.227.17.139/services/transport-external/api"
         self.report_url = "http://91.227.17.139/services/report/api"
         self.token = self._get_token()
         self.headers = self._get_headers()
+        get_token_provider().subscribe(self)
     
     def _get_token(self):
         """Получить токен"""
-        try:
-            with open('.env', 'r') as f:
-                for line in f:
-                    if line.startswith('EPUTS_TOKEN='):
-                        return line.split('=', 1)[1].strip()
-        except:
-            pass
-        return None
+        return get_token_provider().get_token()
     
     def _get_headers(self):
         """Получить заголовки"""
@@ -42,12 +39,13 @@ class ExternalTransportAPIClient:
     def check_token(self):
         """Проверить валидность токена"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/station",
                 params={"page": 1, "limit": 1},
                 headers=self.headers,
                 verify=False,
-                timeout=10
+                timeout=10,
+                auth_retry=False
             )
             
             if response.status_code == 401:
@@ -66,19 +64,19 @@ class ExternalTransportAPIClient:
     def get_stations_list(self, page=1, limit=25):
         """Получить список станций"""
         params = {"page": page, "limit": limit}
-        return requests.get(f"{self.base_url}/station", params=params, headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/station", params=params, headers=self.headers, verify=False)
     
     def get_transport_types(self):
         """Получить список видов транспорта"""
-        return requests.get(f"{self.base_url}/station/transport_types", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/station/transport_types", headers=self.headers, verify=False)
     
     def get_statuses(self):
         """Получить список статусов"""
-        return requests.get(f"{self.base_url}/station/statuses", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/station/statuses", headers=self.headers, verify=False)
     
     def get_relocation_states(self):
         """Получить список состояний перемещений бортов"""
-        return requests.get(f"{self.base_url}/v2/station/relocation-state", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/v2/station/relocation-state", headers=self.headers, verify=False)
     
     # === Отчеты ===
     
@@ -100,7 +98,7 @@ class ExternalTransportAPIClient:
             "end_date": end_date,
             "id_list": id_list
         }
-        return requests.post(f"{self.base_url}/v2/station/schedules", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/v2/station/schedules", json=data, headers=self.headers, verify=False)
     
     def generate_flight_report(self, start_date, end_date, id_list, formats, report_id=38):
         """
@@ -119,7 +117,7 @@ class ExternalTransportAPIClient:
             "id_list": id_list,
             "formats": formats
         }
-        return requests.post(f"{self.report_url}/v2/report/request/{report_id}", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.report_url}/v2/report/request/{report_id}", json=data, headers=self.headers, verify=False)
     
     def get_passenger_count_report(self, date, page=1, limit=25):
         """
@@ -135,5 +133,5 @@ class ExternalTransportAPIClient:
             "limit": limit,
             "date": date
         }
-        return requests.post(f"{self.base_url}/report/passenger-count", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/report/passenger-count", json=data, headers=self.headers, verify=False)
 
@@ -0,0 +1,635 @@
+#!/usr/bin/env python3
+"""
+Локальный пространственный индекс объектов Цифрового двойника
+
+Объекты инфраструктуры и элементы дорожной сети раскладываются по ячейкам
+равномерной сетки (cell_size градусов). Запросы по прямоугольнику, полигону и
+k ближайших объектов выполняются в памяти процесса. SpatialCache запрашивает у
+сервера только ячейки, которые еще не загружены: соседние незагруженные ячейки
+одной строки объединяются в один прямоугольный запрос по полигону.
+
+Большой полигон можно запросить по частям: iter_tiled делит его на сетку
+плиток, запрашивает плитки параллельно и отдает объекты по мере ответов,
+пропуская повторы с границ плиток.
+
+    for section in client.iter_road_sections_tiled(polygon_data, rows=4, cols=4, workers=8):
+        ...
+
+    index = client.infrastructure_index(cell_size=0.02)
+    items = index.query_polygon(polygon_data)      # первый раз - запросы к серверу
+    items = index.query_polygon(polygon_data)      # повторно - из памяти
+    nearest = index.nearest(30.315, 59.939, k=5)   # [(метры, объект), ...]
+
+Координаты - (lon, lat) в градусах, прямоугольник - (min_lon, min_lat, max_lon, max_lat).
+"""
+
+import heapq
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .models import _items_of
+
+
+DEFAULT_CELL_SIZE = 0.02
+
+# Не больше стольких ячеек в одном запросе к серверу
+MAX_CELLS_PER_REQUEST = 16
+
+DEFAULT_TILES = 4
+
+DEFAULT_TILE_WORKERS = 8
+
+EARTH_RADIUS_M = 6371008.8
+
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+Point = Tuple[float, float]
+BBox = Tuple[float, float, float, float]
+Cell = Tuple[int, int]
+
+
+# === Геометрия ===
+
+def polygon_ring(polygon) -> List[Point]:
+    """
+    Внешний контур полигона
+
+    Принимает тело запроса {"polygon": Feature} (как generate_test_polygon),
+    Feature, геометрию Polygon/MultiPolygon (первый полигон) или список координат.
+    """
+    if isinstance(polygon, dict):
+        if "polygon" in polygon:
+            return polygon_ring(polygon["polygon"])
+        if polygon.get("type") == "Feature":
+            return polygon_ring(polygon.get("geometry"))
+        if polygon.get("type") == "Polygon":
+            return polygon_ring(polygon["coordinates"][0])
+        if polygon.get("type") == "MultiPolygon":
+            return polygon_ring(polygon["coordinates"][0][0])
+    elif isinstance(polygon, (list, tuple)) and len(polygon) >= 3:
+        return [(float(point[0]), float(point[1])) for point in polygon]
+    raise ValueError(f"Не удалось получить контур полигона из {type(polygon).__name__}")
+
+
+def polygon_payload(ring: Iterable[Point]) -> Dict[str, Any]:
+    """Тело запроса по полигону (формат generate_test_polygon)"""
+    coordinates = [[lon, lat] for lon, lat in ring]
+    if coordinates[0] != coordinates[-1]:
+        coordinates.append(list(coordinates[0]))
+    return {"polygon": {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [coordinates]}}}
+
+
+def bbox_ring(bbox: BBox) -> List[Point]:
+    """Прямоугольник как замкнутый контур"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return [(min_lon, max_lat), (max_lon, max_lat), (max_lon, min_lat), (min_lon, min_lat), (min_lon, max_lat)]
+
+
+def points_bbox(points: Iterable[Point]) -> BBox:
+    lons, lats = zip(*points)
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def _flatten(coordinates, points: List[Point]):
+    if not coordinates:
+        return
+    if isinstance(coordinates[0], (int, float)):
+        points.append((float(coordinates[0]), float(coordinates[1])))
+        return
+    for part in coordinates:
+        _flatten(part, points)
+
+
+def feature_points(feature: Dict[str, Any]) -> List[Point]:
+    """Точки объекта: координаты geometry (GeoJSON), иначе поля lon/lat"""
+    geometry = feature.get("geometry")
+    if isinstance(geometry, dict) and geometry.get("type") == "Feature":
+        geometry = geometry.get("geometry")
+    points: List[Point] = []
+    if isinstance(geometry, dict):
+        if geometry.get("type") == "GeometryCollection":
+            for part in geometry.get("geometries") or []:
+                _flatten(part.get("coordinates"), points)
+        else:
+            _flatten(geometry.get("coordinates"), points)
+    if not points and feature.get("lon") is not None and feature.get("lat") is not None:
+        try:
+            points.append((float(feature["lon"]), float(feature["lat"])))
+        except (TypeError, ValueError):
+            pass
+    return points
+
+
+def point_in_ring(lon: float, lat: float, ring: List[Point]) -> bool:
+    """Точка внутри контура (метод луча)"""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _orientation(a: Point, b: Point, c: Point) -> float:
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _segments_cross(a: Point, b: Point, c: Point, d: Point) -> bool:
+    d1, d2 = _orientation(c, d, a), _orientation(c, d, b)
+    d3, d4 = _orientation(a, b, c), _orientation(a, b, d)
+    return (d1 > 0) != (d2 > 0) and (d3 > 0) != (d4 > 0)
+
+
+def intersects_ring(points: List[Point], ring: List[Point]) -> bool:
+    """Объект (точка или линия по points) пересекает полигон"""
+    if any(point_in_ring(lon, lat, ring) for lon, lat in points):
+        return True
+    if len(points) < 2:
+        return False
+    edges = list(zip(ring, ring[1:] + ring[:1]))
+    return any(_segments_cross(a, b, c, d) for a, b in zip(points, points[1:]) for c, d in edges)
+
+
+def _bbox_overlaps(a: BBox, b: BBox) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _bbox_inside(inner: BBox, outer: BBox) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+
+def _segment_distance(lon: float, lat: float, a: Point, b: Point, scale: float) -> float:
+    """Расстояние от точки до отрезка, м (равнопромежуточная проекция около точки)"""
+    ax, ay = (a[0] - lon) * scale, a[1] - lat
+    bx, by = (b[0] - lon) * scale, b[1] - lat
+    dx, dy = bx - ax, by - ay
+    length = dx * dx + dy * dy
+    t = 0.0 if length == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / length))
+    return math.hypot(ax + t * dx, ay + t * dy) * METERS_PER_DEGREE
+
+
+def distance_m(lon: float, lat: float, points: List[Point]) -> float:
+    """Расстояние от точки до объекта (ближайшая вершина или отрезок линии), м"""
+    scale = math.cos(math.radians(lat))
+    if len(points) == 1:
+        return _segment_distance(lon, lat, points[0], points[0], scale)
+    return min(_segment_distance(lon, lat, a, b, scale) for a, b in zip(points, points[1:]))
+
+
+def clip_ring(ring: List[Point], bbox: BBox) -> List[Point]:
+    """Часть контура внутри прямоугольника (Сазерленд - Ходжман), без замыкающей точки"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    edges = (
+        (lambda p: p[0] >= min_lon, lambda a, b: _cut_x(a, b, min_lon)),
+        (lambda p: p[0] <= max_lon, lambda a, b: _cut_x(a, b, max_lon)),
+        (lambda p: p[1] >= min_lat, lambda a, b: _cut_y(a, b, min_lat)),
+        (lambda p: p[1] <= max_lat, lambda a, b: _cut_y(a, b, max_lat)),
+    )
+    points = ring[:-1] if len(ring) > 1 and ring[0] == ring[-1] else list(ring)
+    for inside, cut in edges:
+        if not points:
+            break
+        clipped = []
+        previous = points[-1]
+        for point in points:
+            if inside(point):
+                if not inside(previous):
+                    clipped.append(cut(previous, point))
+                clipped.append(point)
+            elif inside(previous):
+                clipped.append(cut(previous, point))
+            previous = point
+        points = clipped
+    return points
+
+
+def ring_area(ring: List[Point]) -> float:
+    """Площадь контура в квадратных градусах (формула Гаусса)"""
+    return abs(sum(a[0] * b[1] - b[0] * a[1] for a, b in zip(ring, ring[1:] + ring[:1]))) / 2
+
+
+def _cut_x(a: Point, b: Point, x: float) -> Point:
+    return x, a[1] + (b[1] - a[1]) * (x - a[0]) / (b[0] - a[0])
+
+
+def _cut_y(a: Point, b: Point, y: float) -> Point:
+    return a[0] + (b[0] - a[0]) * (y - a[1]) / (b[1] - a[1]), y
+
+
+def split_polygon(polygon, rows: int = DEFAULT_TILES, cols: int = DEFAULT_TILES) -> List[List[Point]]:
+    """
+    Разбить полигон сеткой rows x cols по его габаритному прямоугольнику
+
+    Returns:
+        контуры непустых плиток (часть полигона внутри каждой плитки)
+    """
+    if rows < 1 or cols < 1:
+        raise ValueError("rows и cols должны быть не меньше 1")
+    ring = polygon_ring(polygon)
+    min_lon, min_lat, max_lon, max_lat = points_bbox(ring)
+    width, height = (max_lon - min_lon) / cols, (max_lat - min_lat) / rows
+    # Плитки, касающиеся полигона только стороной или углом, отбрасываются
+    min_area = width * height * 1e-9
+    tiles = []
+    for row in range(rows):
+        for col in range(cols):
+            tile = (min_lon + col * width, min_lat + row * height,
+                    max_lon if col == cols - 1 else min_lon + (col + 1) * width,
+                    max_lat if row == rows - 1 else min_lat + (row + 1) * height)
+            clipped = clip_ring(ring, tile)
+            if len(clipped) >= 3 and ring_area(clipped) > min_area:
+                tiles.append(clipped)
+    return tiles
+
+
+# === Индекс ===
+
+class _Entry:
+    __slots__ = ("feature", "points", "bbox", "cells")
+
+    def __init__(self, feature, points, bbox, cells):
+        self.feature = feature
+        self.points = points
+        self.bbox = bbox
+        self.cells = cells
+
+
+class GridIndex:
+    """
+    Равномерная сетка объектов по id
+
+    Объект попадает во все ячейки, которые покрывает его габаритный
+    прямоугольник; объекты без координат не индексируются.
+
+    Args:
+        cell_size: размер ячейки, градусы
+        key: поле идентификатора объекта
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE, key: str = "id"):
+        if cell_size <= 0:
+            raise ValueError("cell_size должен быть больше 0")
+        self.cell_size = cell_size
+        self.key = key
+        self._cells: Dict[Cell, Set[Any]] = {}
+        self._entries: Dict[Any, _Entry] = {}
+
+    def cell_of(self, lon: float, lat: float) -> Cell:
+        return math.floor(lon / self.cell_size), math.floor(lat / self.cell_size)
+
+    def cells_in(self, bbox: BBox) -> Iterator[Cell]:
+        """Ячейки, пересекающие прямоугольник (построчно, с юга на север)"""
+        min_x, min_y = self.cell_of(bbox[0], bbox[1])
+        max_x, max_y = self.cell_of(bbox[2], bbox[3])
+        for y in range(min_y, max_y + 1):
+            for x in range(min_x, max_x + 1):
+                yield x, y
+
+    def cell_bbox(self, cell: Cell) -> BBox:
+        size = self.cell_size
+        return cell[0] * size, cell[1] * size, (cell[0] + 1) * size, (cell[1] + 1) * size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item_id):
+        return item_id in self._entries
+
+    def get(self, item_id, default=None):
+        entry = self._entries.get(item_id)
+        return entry.feature if entry is not None else default
+
+    def cells_of(self, item_id) -> Tuple[Cell, ...]:
+        entry = self._entries.get(item_id)
+        return entry.cells if entry is not None else ()
+
+    def insert(self, feature: Dict[str, Any]) -> bool:
+        """Добавить или заменить объект; False - у объекта нет id или координат"""
+        item_id = feature.get(self.key)
+        points = feature_points(feature)
+        if item_id is None or not points:
+            return False
+        self.remove(item_id)
+        bbox = points_bbox(points)
+        cells = tuple(self.cells_in(bbox))
+        self._entries[item_id] = _Entry(feature, points, bbox, cells)
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(item_id)
+        return True
+
+    def remove(self, item_id) -> bool:
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return False
+        for cell in entry.cells:
+            ids = self._cells.get(cell)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self._cells[cell]
+        return True
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+
+    def ids_in_cells(self, cells: Iterable[Cell]) -> Set[Any]:
+        found: Set[Any] = set()
+        for cell in cells:
+            ids = self._cells.get(cell)
+            if ids:
+                found |= ids
+        return found
+
+    def query_bbox(self, bbox: BBox) -> List[Dict[str, Any]]:
+        """Объекты, пересекающие прямоугольник"""
+        ring = None
+        result = []
+        for item_id in self.ids_in_cells(self.cells_in(bbox)):
+            entry = self._entries[item_id]
+            if not _bbox_overlaps(entry.bbox, bbox):
+                continue
+            if not _bbox_inside(entry.bbox, bbox):
+                ring = ring or bbox_ring(bbox)
+                if not intersects_ring(entry.points, ring):
+                    continue
+            result.append(entry.feature)
+        return result
+
+    def query_polygon(self, polygon) -> List[Dict[str, Any]]:
+        """Объекты, пересекающие полигон (форматы - см. polygon_ring)"""
+        ring = polygon_ring(polygon)
+        bbox = points_bbox(ring)
+        result = []
+        for item_id in self.ids_in_cells(self.cells_in(bbox)):
+            entry = self._entries[item_id]
+            if _bbox_overlaps(entry.bbox, bbox) and intersects_ring(entry.points, ring):
+                result.append(entry.feature)
+        return result
+
+    def nearest(self, lon: float, lat: float, k: int = 1,
+                max_distance: Optional[float] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        k ближайших объектов к точке
+
+        Ячейки просматриваются кольцами вокруг точки, пока k-й найденный объект
+        не окажется ближе любой непросмотренной ячейки.
+
+        Returns:
+            [(расстояние в метрах, объект), ...] по возрастанию расстояния
+        """
+        if k <= 0 or not self._cells:
+            return []
+        center_x, center_y = self.cell_of(lon, lat)
+        xs = [cell[0] for cell in self._cells]
+        ys = [cell[1] for cell in self._cells]
+        max_radius = max(abs(center_x - min(xs)), abs(max(xs) - center_x),
+                         abs(center_y - min(ys)), abs(max(ys) - center_y))
+        # Нижняя граница расстояния до ячеек за кольцом radius (по долготе градус короче)
+        cell_m = self.cell_size * METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6)
+
+        seen: Set[Any] = set()
+        best: List[Tuple[float, int, Any]] = []   # max-куча из k ближайших: (-расстояние, порядок, id)
+        order = 0
+        for radius in range(max_radius + 1):
+            if radius == 0:
+                ring_cells = [(center_x, center_y)]
+            else:
+                ring_cells = [(x, y) for x in range(center_x - radius, center_x + radius + 1)
+                              for y in (center_y - radius, center_y + radius)]
+                ring_cells += [(x, y) for y in range(center_y - radius + 1, center_y + radius)
+                               for x in (center_x - radius, center_x + radius)]
+            for item_id in self.ids_in_cells(ring_cells) - seen:
+                seen.add(item_id)
+                distance = distance_m(lon, lat, self._entries[item_id].points)
+                if max_distance is not None and distance > max_distance:
+                    continue
+                order += 1
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, order, item_id))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, order, item_id))
+            bound = radius * cell_m
+            if max_distance is not None and bound > max_distance:
+                break
+            if len(best) == k and -best[0][0] <= bound:
+                break
+        return [(-distance, self._entries[item_id].feature) for distance, _, item_id in sorted(best, reverse=True)]
+
+
+# === Загрузка с сервера ===
+
+def response_features(response) -> List[Dict[str, Any]]:
+    """Объекты из ответа запроса по полигону (ошибка HTTP - requests.HTTPError)"""
+    response.raise_for_status()
+    body = response.json()
+    if isinstance(body, list):
+        return body
+    items, _ = _items_of(body)
+    return items
+
+
+def iter_tiled(fetch: Callable[[Dict[str, Any]], Any], polygon, rows: int = DEFAULT_TILES,
+               cols: int = DEFAULT_TILES, workers: int = DEFAULT_TILE_WORKERS,
+               key: str = "id") -> Iterator[Dict[str, Any]]:
+    """
+    Запросить полигон по плиткам параллельно
+
+    Плитки запрашиваются пулом из workers потоков; объекты отдаются по мере
+    ответов плиток, объект с уже отданным id пропускается (объекты без id
+    отдаются все). Ошибка плитки прерывает перебор, оставшиеся плитки
+    отменяются. Для workers больше размера пула соединений стоит заранее
+    вызвать configure_transport(pool_size=workers).
+
+    Args:
+        fetch: функция polygon_data -> Response (get_road_sections_by_polygon и т.п.)
+        polygon: полигон (форматы - см. polygon_ring)
+        rows, cols: сетка плиток
+        workers: количество одновременных запросов
+        key: поле идентификатора объекта
+    """
+    tiles = split_polygon(polygon, rows, cols)
+    if not tiles:
+        return
+    seen: Set[Any] = set()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(tiles))))
+    futures = [executor.submit(lambda tile: response_features(fetch(polygon_payload(tile))), tile)
+               for tile in tiles]
+    try:
+        for future in as_completed(futures):
+            for feature in future.result():
+                item_id = feature.get(key)
+                if item_id is not None:
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                yield feature
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+class SpatialCache:
+    """
+    Индекс, догружающий с сервера незагруженные ячейки
+
+    Ячейка считается загруженной после успешного ответа сервера по
+    покрывающему ее прямоугольнику; по истечении ttl она загружается заново.
+    Блокировка берется только для проверки и вставки, не на время запроса.
+    Только для синхронного клиента: fetch должен возвращать Response.
+
+    Args:
+        fetch: функция polygon_data -> Response (get_infrastructure_by_polygon и т.п.)
+        cell_size: размер ячейки, градусы
+        ttl: время жизни загруженной ячейки, с (None - без ограничения)
+        max_cells_per_request: сколько соседних ячеек объединять в один запрос
+    """
+
+    def __init__(self, fetch: Callable[[Dict[str, Any]], Any], cell_size: float = DEFAULT_CELL_SIZE,
+                 ttl: Optional[float] = None, max_cells_per_request: int = MAX_CELLS_PER_REQUEST):
+        self.fetch = fetch
+        self.index = GridIndex(cell_size)
+        self.ttl = ttl
+        self.max_cells_per_request = max(1, max_cells_per_request)
+        self._loaded: Dict[Cell, float] = {}
+        self._loading: Dict[Cell, threading.Event] = {}
+        self._lock = threading.RLock()
+        self.requests = 0
+        self.cell_hits = 0
+        self.cell_misses = 0
+
+    def _is_loaded(self, cell: Cell, now: float) -> bool:
+        loaded_at = self._loaded.get(cell)
+        return loaded_at is not None and (self.ttl is None or now - loaded_at < self.ttl)
+
+    def missing_cells(self, bbox: BBox) -> List[Cell]:
+        now = time.monotonic()
+        return [cell for cell in self.index.cells_in(bbox) if not self._is_loaded(cell, now)]
+
+    def _runs(self, cells: List[Cell]) -> List[List[Cell]]:
+        """Соседние ячейки одной строки, не длиннее max_cells_per_request"""
+        runs: List[List[Cell]] = []
+        for cell in sorted(cells, key=lambda c: (c[1], c[0])):
+            last = runs[-1] if runs else None
+            if (last and last[-1][1] == cell[1] and last[-1][0] + 1 == cell[0]
+                    and len(last) < self.max_cells_per_request):
+                last.append(cell)
+            else:
+                runs.append([cell])
+        return runs
+
+    def ensure(self, bbox: BBox) -> int:
+        """
+        Загрузить незагруженные ячейки прямоугольника
+
+        Запросы к серверу выполняются без блокировки; ячейки, которые уже загружает
+        другой поток, не запрашиваются повторно - их загрузка ожидается.
+
+        Returns:
+            количество запросов к серверу
+        """
+        requests = 0
+        counted = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                cells = list(self.index.cells_in(bbox))
+                missing = [cell for cell in cells if not self._is_loaded(cell, now)]
+                if not counted:
+                    self.cell_hits += len(cells) - len(missing)
+                    self.cell_misses += len(missing)
+                    counted = True
+                waiting = {self._loading[cell] for cell in missing if cell in self._loading}
+                own = [cell for cell in missing if cell not in self._loading]
+                done = threading.Event()
+                for cell in own:
+                    self._loading[cell] = done
+            try:
+                for run in self._runs(own):
+                    first, last = self.index.cell_bbox(run[0]), self.index.cell_bbox(run[-1])
+                    response = self.fetch(polygon_payload(bbox_ring((first[0], first[1], last[2], last[3]))))
+                    features = response_features(response)
+                    requests += 1
+                    with self._lock:
+                        self.requests += 1
+                        for feature in features:
+                            self.index.insert(feature)
+                        loaded_at = time.monotonic()
+                        for cell in run:
+                            self._loaded[cell] = loaded_at
+            finally:
+                with self._lock:
+                    for cell in own:
+                        del self._loading[cell]
+                done.set()
+            if not waiting:
+                return requests
+            # Ячейки другого потока: после его загрузки проверить еще раз (при ошибке - загрузить самим)
+            for event in waiting:
+                event.wait()
+
+    def query_bbox(self, bbox: BBox) -> List[Dict[str, Any]]:
+        self.ensure(bbox)
+        with self._lock:
+            return self.index.query_bbox(bbox)
+
+    def query_polygon(self, polygon) -> List[Dict[str, Any]]:
+        """Объекты, пересекающие полигон; сервер запрашивается только для незагруженных ячеек"""
+        ring = polygon_ring(polygon)
+        self.ensure(points_bbox(ring))
+        with self._lock:
+            return self.index.query_polygon(ring)
+
+    def nearest(self, lon: float, lat: float, k: int = 1,
+                radius_m: Optional[float] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        k ближайших объектов
+
+        Перед поиском загружается окрестность точки: квадрат radius_m метров или,
+        если radius_m не задан, ячейка точки с соседними. Поиск идет по всему
+        загруженному; с radius_m дальние объекты отбрасываются.
+        """
+        if radius_m is None:
+            size = self.index.cell_size
+            bbox = (lon - size, lat - size, lon + size, lat + size)
+        else:
+            dlat = radius_m / METERS_PER_DEGREE
+            dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+            bbox = (lon - dlon, lat - dlat, lon + dlon, lat + dlat)
+        self.ensure(bbox)
+        with self._lock:
+            return self.index.nearest(lon, lat, k, max_distance=radius_m)
+
+    def invalidate(self, bbox: Optional[BBox] = None):
+        """
+        Забыть загруженные ячейки (все или прямоугольника)
+
+        Объекты, не попадающие больше ни в одну загруженную ячейку, удаляются из индекса.
+        """
+        with self._lock:
+            if bbox is None:
+                self._loaded.clear()
+                self.index.clear()
+                return
+            cells = set(self.index.cells_in(bbox))
+            for cell in cells:
+                self._loaded.pop(cell, None)
+            for item_id in self.index.ids_in_cells(cells):
+                if not any(cell in self._loaded for cell in self.index.cells_of(item_id)):
+                    self.index.remove(item_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "items": len(self.index),
+            "cells_loaded": len(self._loaded),
+            "requests": self.requests,
+            "cell_hits": self.cell_hits,
+            "cell_misses": self.cell_misses,
+        }
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Компактный граф УДС в массивах
+
+Ответ get_graph ({"nodes": [...], "edges": [...]}) переводится в массивы
+array: координаты узлов - lon/lat (float64), ребра - в формате CSR (offsets
+на узел и targets/weights/edge_index на ребро). Узел занимает 24 байта плюс id,
+ребро - 16 байт на направление плюс id, вместо словарей JSON на каждый элемент.
+
+    graph = client.load_compact_graph(geometry, zoom=12)   # ответ читается потоково
+    graph.neighbors(node_id)                               # [(сосед, вес), ...]
+    distance, path = graph.astar(source_id, target_id)     # путь - список id узлов
+
+Имена полей ребер различаются по версиям API: концы ищутся в source/target,
+from/to, start_node/end_node и т.п. (SOURCE_FIELDS, TARGET_FIELDS), вес - в
+weight/length/distance/cost. Ребро без веса получает длину своей геометрии или
+расстояние между узлами в метрах.
+"""
+
+import heapq
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .geo import EARTH_RADIUS_M, feature_points
+
+
+SOURCE_FIELDS = ("source", "from", "source_id", "from_id", "start", "start_node", "start_node_id",
+                 "node_from", "from_node", "u")
+TARGET_FIELDS = ("target", "to", "target_id", "to_id", "end", "end_node", "end_node_id",
+                 "node_to", "to_node", "v")
+WEIGHT_FIELDS = ("weight", "length", "distance", "cost")
+ONEWAY_FIELDS = ("oneway", "one_way", "is_oneway")
+
+NAN = float("nan")
+
+
+def haversine_m(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Расстояние по большому кругу, м"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _field(item: Dict[str, Any], names: Iterable[str]):
+    for name in names:
+        value = item.get(name)
+        if value is not None:
+            # Конец ребра может быть вложенным узлом
+            return value.get("id") if isinstance(value, dict) else value
+    return None
+
+
+def _number(value) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+class GraphBuilder:
+    """
+    Пошаговая сборка CompactGraph из узлов и ребер в любом порядке
+
+    Узлу присваивается номер при первом упоминании (в узлах или в концах ребер),
+    поэтому ребра можно добавлять до узлов, и словари ответа не нужно хранить.
+
+    Args:
+        directed: ребра направленные; иначе каждое ребро добавляется в обе
+            стороны, кроме помеченных oneway
+    """
+
+    def __init__(self, directed: bool = False):
+        self.directed = directed
+        self.ids: List[Any] = []
+        self._index: Dict[Any, int] = {}
+        self.lon = array("d")
+        self.lat = array("d")
+        self._sources = array("i")
+        self._targets = array("i")
+        self._weights = array("d")
+        self._both = array("b")
+        self.edge_ids: List[Any] = []
+        self.skipped_edges = 0
+
+    def _node_index(self, node_id) -> int:
+        index = self._index.get(node_id)
+        if index is None:
+            index = self._index[node_id] = len(self.ids)
+            self.ids.append(node_id)
+            self.lon.append(NAN)
+            self.lat.append(NAN)
+        return index
+
+    def add_node(self, node: Dict[str, Any]):
+        node_id = node.get("id")
+        if node_id is None:
+            return
+        index = self._node_index(node_id)
+        points = feature_points(node)
+        if points:
+            self.lon[index], self.lat[index] = points[0]
+
+    def add_edge(self, edge: Dict[str, Any]):
+        source, target = _field(edge, SOURCE_FIELDS), _field(edge, TARGET_FIELDS)
+        if source is None or target is None:
+            self.skipped_edges += 1
+            return
+        weight = _number(_field(edge, WEIGHT_FIELDS))
+        if weight is None:
+            points = feature_points(edge)
+            if len(points) > 1:
+                weight = sum(haversine_m(*a, *b) for a, b in zip(points, points[1:]))
+        self._sources.append(self._node_index(source))
+        self._targets.append(self._node_index(target))
+        self._weights.append(NAN if weight is None else weight)
+        self._both.append(0 if self.directed or any(edge.get(name) for name in ONEWAY_FIELDS) else 1)
+        self.edge_ids.append(edge.get("id"))
+
+    def add(self, key: str, item: Dict[str, Any]):
+        """Добавить элемент пары (ключ, элемент) из stream_graph"""
+        if key == "nodes":
+            self.add_node(item)
+        elif key == "edges":
+            self.add_edge(item)
+
+    def build(self) -> "CompactGraph":
+        """Разложить ребра по узлам (CSR); ребра без веса получают расстояние между узлами"""
+        n = len(self.ids)
+        lon, lat = self.lon, self.lat
+        weights = self._weights
+        for i, weight in enumerate(weights):
+            if weight != weight:
+                s, t = self._sources[i], self._targets[i]
+                distance = haversine_m(lon[s], lat[s], lon[t], lat[t])
+                weights[i] = distance if distance == distance else 0.0
+
+        counts = array("q", bytes(8 * (n + 1)))
+        for i, source in enumerate(self._sources):
+            counts[source + 1] += 1
+            if self._both[i]:
+                counts[self._targets[i] + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        offsets = array("q", counts)
+
+        size = offsets[n]
+        targets = array("i", bytes(4 * size))
+        out_weights = array("d", bytes(8 * size))
+        edge_index = array("i", bytes(4 * size))
+        position = counts
+        for i, (source, target) in enumerate(zip(self._sources, self._targets)):
+            slot = position[source]
+            targets[slot], out_weights[slot], edge_index[slot] = target, weights[i], i
+            position[source] = slot + 1
+            if self._both[i]:
+                slot = position[target]
+                targets[slot], out_weights[slot], edge_index[slot] = source, weights[i], i
+                position[target] = slot + 1
+
+        return CompactGraph(self.ids, lon, lat, offsets, targets, out_weights, edge_index, self.edge_ids,
+                            index=self._index)
+
+
+class CompactGraph:
+    """
+    Граф в формате CSR
+
+    Соседи узла i - targets[offsets[i]:offsets[i + 1]] с весами из weights;
+    edge_index связывает позицию в targets с номером исходного ребра в edge_ids.
+    """
+
+    def __init__(self, ids: List[Any], lon: array, lat: array, offsets: array, targets: array,
+                 weights: array, edge_index: array, edge_ids: List[Any], index: Optional[Dict[Any, int]] = None):
+        self.ids = ids
+        self.lon = lon
+        self.lat = lat
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.edge_index = edge_index
+        self.edge_ids = edge_ids
+        self._index = index if index is not None else {node_id: i for i, node_id in enumerate(ids)}
+
+    @property
+    def node_count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        """Исходные ребра (ненаправленное ребро в targets занимает две позиции)"""
+        return len(self.edge_ids)
+
+    def index_of(self, node_id) -> int:
+        try:
+            return self._index[node_id]
+        except KeyError:
+            raise KeyError(f"Узел {node_id!r} не найден в графе") from None
+
+    def __contains__(self, node_id):
+        return node_id in self._index
+
+    def coordinates(self, node_id) -> Tuple[float, float]:
+        """(lon, lat) узла; nan для узлов без координат"""
+        index = self.index_of(node_id)
+        return self.lon[index], self.lat[index]
+
+    def neighbors(self, node_id) -> List[Tuple[Any, float]]:
+        """Исходящие соседи и веса ребер"""
+        index = self.index_of(node_id)
+        ids, targets, weights = self.ids, self.targets, self.weights
+        return [(ids[targets[k]], weights[k]) for k in range(self.offsets[index], self.offsets[index + 1])]
+
+    def degree(self, node_id) -> int:
+        index = self.index_of(node_id)
+        return self.offsets[index + 1] - self.offsets[index]
+
+    def nearest_node(self, lon: float, lat: float):
+        """Ближайший к точке узел (перебор массивов координат)"""
+        scale = math.cos(math.radians(lat))
+        best, best_index = math.inf, None
+        for i, (node_lon, node_lat) in enumerate(zip(self.lon, self.lat)):
+            d = ((node_lon - lon) * scale) ** 2 + (node_lat - lat) ** 2
+            if d < best:
+                best, best_index = d, i
+        return None if best_index is None else self.ids[best_index]
+
+    def component_labels(self) -> array:
+        """Номер компоненты связности каждого узла (без учета направления ребер)"""
+        n = self.node_count
+        parent = array("i", range(n))
+
+        def find(i):
+            root = i
+            while parent[root] != root:
+                root = parent[root]
+            while parent[i] != root:
+                parent[i], i = root, parent[i]
+            return root
+
+        offsets, targets = self.offsets, self.targets
+        for i in range(n):
+            for k in range(offsets[i], offsets[i + 1]):
+                a, b = find(i), find(targets[k])
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+        labels = array("i", bytes(4 * n))
+        numbers: Dict[int, int] = {}
+        for i in range(n):
+            labels[i] = numbers.setdefault(find(i), len(numbers))
+        return labels
+
+    def components(self) -> List[List[Any]]:
+        """Компоненты связности (id узлов), по убыванию размера"""
+        groups: Dict[int, List[Any]] = {}
+        for node_id, label in zip(self.ids, self.component_labels()):
+            groups.setdefault(label, []).append(node_id)
+        return sorted(groups.values(), key=len, reverse=True)
+
+    def _search(self, source, target, heuristic: bool) -> Tuple[float, List[Any]]:
+        start, goal = self.index_of(source), self.index_of(target)
+        n = self.node_count
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        lon, lat = self.lon, self.lat
+        goal_lon, goal_lat = lon[goal], lat[goal]
+        heuristic = heuristic and goal_lon == goal_lon
+
+        def estimate(i):
+            if not heuristic or lon[i] != lon[i]:
+                return 0.0
+            return haversine_m(lon[i], lat[i], goal_lon, goal_lat)
+
+        distance = array("d", [math.inf]) * n
+        previous = array("i", [-1]) * n
+        distance[start] = 0.0
+        queue = [(estimate(start), start)]
+        while queue:
+            priority, i = heapq.heappop(queue)
+            if i == goal:
+                break
+            base = distance[i]
+            if priority > base + estimate(i):
+                continue    # устаревшая запись очереди
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                candidate = base + weights[k]
+                if candidate < distance[j]:
+                    distance[j] = candidate
+                    previous[j] = i
+                    heapq.heappush(queue, (candidate + estimate(j), j))
+
+        if distance[goal] == math.inf:
+            return math.inf, []
+        path = [goal]
+        while path[-1] != start:
+            path.append(previous[path[-1]])
+        return distance[goal], [self.ids[i] for i in reversed(path)]
+
+    def shortest_path(self, source, target) -> Tuple[float, List[Any]]:
+        """
+        Кратчайший путь (Дейкстра)
+
+        Returns:
+            (длина, [id узлов от source до target]); (inf, []) если пути нет
+        """
+        return self._search(source, target, heuristic=False)
+
+    def astar(self, source, target) -> Tuple[float, List[Any]]:
+        """
+        Кратчайший путь A* с оценкой по расстоянию до цели
+
+        Оценка допустима, если веса ребер - длины в метрах (поле length или
+        вычисленные по координатам); иначе используйте shortest_path.
+        """
+        return self._search(source, target, heuristic=True)
+
+    def path_edges(self, path: List[Any]) -> List[Any]:
+        """id исходных ребер пути (самое легкое ребро между соседними узлами)"""
+        edges = []
+        for a, b in zip(path, path[1:]):
+            i, j = self.index_of(a), self.index_of(b)
+            best = min((k for k in range(self.offsets[i], self.offsets[i + 1]) if self.targets[k] == j),
+                       key=lambda k: self.weights[k])
+            edges.append(self.edge_ids[self.edge_index[best]])
+        return edges
+
+    def memory_bytes(self) -> int:
+        """Размер массивов графа (без id узлов и ребер)"""
+        arrays = (self.lon, self.lat, self.offsets, self.targets, self.weights, self.edge_index)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+def load_graph(source, directed: bool = False) -> CompactGraph:
+    """
+    Собрать CompactGraph
+
+    Args:
+        source: Response get_graph, разобранное тело {"nodes": [...], "edges": [...]}
+            или пары (ключ, элемент) из stream_graph
+        directed: см. GraphBuilder
+    """
+    builder = GraphBuilder(directed=directed)
+    if hasattr(source, "raise_for_status"):
+        source.raise_for_status()
+        source = source.json()
+    if isinstance(source, dict):
+        for node in source.get("nodes") or []:
+            builder.add_node(node)
+        for edge in source.get("edges") or []:
+            builder.add_edge(edge)
+    else:
+        for key, item in source:
+            builder.add(key, item)
+    return builder.build()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Инкрементальная синхронизация графа cifdv-graph по ревизиям
+
+Локальная копия (GraphStore) хранит узлы, атрибуты и последнюю примененную
+ревизию. GraphSync.sync() читает список ревизий (get_revisions_list, по
+created_at), и для каждой новой ревизии запрашивает только узлы и атрибуты
+этой ревизии (параметр revision_id), применяя их на месте: запись
+добавляется или заменяется по id, помеченная удаленной - удаляется.
+
+Полная загрузка всех узлов и атрибутов выполняется, если цепочка ревизий
+прервана (копия пуста, последней примененной ревизии нет в списке или у
+следующей ревизии другой родитель - поле parent_id и т.п., если есть) или
+сервер не применил фильтр по ревизии (см. ниже).
+
+    sync = client.graph_sync(path="graph-state.json")   # состояние переживает перезапуск
+    result = sync.sync()
+    print(result.summary())
+    node = sync.store.nodes[node_id]
+
+Фильтр revision_id проверяется по ответу: каждая запись должна содержать
+поле revision_id, равное запрошенной ревизии. Если сервер фильтр не применил
+(в записях нет этого поля или есть записи других ревизий), инкрементальное
+применение невозможно - удаленные записи в таком ответе не видны, - и
+выполняется полная загрузка с соответствующей причиной.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .pagination import fetch_all_pages, iter_pages, iter_records
+
+
+DEFAULT_PER_PAGE = 100
+
+DEFAULT_SYNC_WORKERS = 4
+
+PARENT_FIELDS = ("parent_id", "parent_revision_id", "previous_id", "previous_revision_id", "base_revision_id")
+
+DELETED_FIELDS = ("deleted", "is_deleted", "deleted_at")
+
+
+class UnfilteredResponse(Exception):
+    """Сервер вернул записи без фильтра по ревизии"""
+
+
+def _parent_of(revision: Dict[str, Any]):
+    for name in PARENT_FIELDS:
+        if name in revision:
+            value = revision[name]
+            return True, value.get("id") if isinstance(value, dict) else value
+    return False, None
+
+
+def _is_deleted(item: Dict[str, Any]) -> bool:
+    return any(item.get(name) for name in DELETED_FIELDS)
+
+
+class GraphStore:
+    """
+    Локальная копия узлов и атрибутов графа
+
+    Args:
+        path: JSON файл состояния (None - только в памяти); при наличии читается сразу
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.nodes: Dict[Any, Dict[str, Any]] = {}
+        self.attributes: Dict[Any, Dict[str, Any]] = {}
+        self.revision: Any = None
+        if path and os.path.exists(path):
+            self.load()
+
+    def apply(self, collection: Dict[Any, Dict[str, Any]], items: Iterable[Dict[str, Any]]) -> int:
+        """Добавить, заменить или удалить записи по id; возвращает количество измененных"""
+        changed = 0
+        for item in items:
+            item_id = item.get("id")
+            if item_id is None:
+                continue
+            if _is_deleted(item):
+                changed += collection.pop(item_id, None) is not None
+            else:
+                collection[item_id] = item
+                changed += 1
+        return changed
+
+    def replace(self, nodes: Iterable[Dict[str, Any]], attributes: Iterable[Dict[str, Any]], revision: Any):
+        """Заменить копию целиком (полная загрузка)"""
+        self.nodes, self.attributes = {}, {}
+        self.apply(self.nodes, nodes)
+        self.apply(self.attributes, attributes)
+        self.revision = revision
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        self.revision = state.get("revision")
+        self.nodes = {item["id"]: item for item in state.get("nodes") or []}
+        self.attributes = {item["id"]: item for item in state.get("attributes") or []}
+
+    def save(self):
+        """Записать состояние в path (атомарная замена файла)"""
+        if not self.path:
+            return
+        state = {"revision": self.revision, "nodes": list(self.nodes.values()),
+                 "attributes": list(self.attributes.values())}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".graph-state-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class SyncResult:
+    """Итог синхронизации"""
+
+    def __init__(self, mode: str, revisions: List[Any], nodes_changed: int, attributes_changed: int,
+                 elapsed: float, reason: Optional[str] = None):
+        self.mode = mode            # "noop", "incremental" или "full"
+        self.revisions = revisions
+        self.nodes_changed = nodes_changed
+        self.attributes_changed = attributes_changed
+        self.elapsed = elapsed
+        self.reason = reason
+
+    def summary(self) -> str:
+        text = {"noop": "Изменений нет", "incremental": "Инкрементальная синхронизация",
+                "full": "Полная загрузка"}[self.mode]
+        if self.reason:
+            text += f" ({self.reason})"
+        return (f"{text}: ревизий {len(self.revisions)}, узлов {self.nodes_changed}, "
+                f"атрибутов {self.attributes_changed} за {self.elapsed:.2f} с")
+
+    def __repr__(self):
+        return f"SyncResult({self.mode}, revisions={len(self.revisions)})"
+
+
+class GraphSync:
+    """
+    Синхронизация GraphStore с сервером по ревизиям
+
+    Args:
+        client: DigitalTwinAPIClient (синхронный)
+        store: локальная копия (None - новая GraphStore(path))
+        path: файл состояния для новой GraphStore
+        per_page: размер страницы списков
+        workers: параллельные запросы страниц при полной загрузке
+        revision_param: параметр запроса узлов и атрибутов одной ревизии
+    """
+
+    def __init__(self, client, store: Optional[GraphStore] = None, path: Optional[str] = None,
+                 per_page: int = DEFAULT_PER_PAGE, workers: int = DEFAULT_SYNC_WORKERS,
+                 revision_param: str = "revision_id"):
+        self.client = client
+        self.store = store if store is not None else GraphStore(path)
+        self.per_page = per_page
+        self.workers = workers
+        self.revision_param = revision_param
+
+    def revisions(self) -> List[Dict[str, Any]]:
+        """Все ревизии по возрастанию created_at"""
+        return list(iter_records(
+            lambda page: self.client.get_revisions_list(page=page, per_page=self.per_page, sorting="created_at"),
+            self.per_page, items_key="items"
+        ))
+
+    def plan(self, revisions: List[Dict[str, Any]]) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        Ревизии, которые нужно применить после последней примененной
+
+        Returns:
+            (список ревизий, None) или (None, причина полной загрузки)
+        """
+        applied = self.store.revision
+        if applied is None:
+            return None, "локальная копия пуста"
+        ids = [revision.get("id") for revision in revisions]
+        if applied not in ids:
+            return None, f"ревизии {applied} нет в списке"
+        pending = revisions[ids.index(applied) + 1:]
+        previous = applied
+        for revision in pending:
+            has_parent, parent = _parent_of(revision)
+            if has_parent and parent != previous:
+                return None, f"родитель ревизии {revision.get('id')} - {parent}, ожидалась {previous}"
+            previous = revision.get("id")
+        return pending, None
+
+    def _changes(self, fetch_page, revision_id) -> List[Dict[str, Any]]:
+        """Записи одной ревизии (UnfilteredResponse - сервер не применил фильтр)"""
+        param = self.revision_param
+        pages = iter_pages(
+            lambda page: fetch_page(page=page, per_page=self.per_page, **{param: revision_id}),
+            self.per_page, items_key="items"
+        )
+        items = []
+        try:
+            for page in pages:
+                for item in page:
+                    if item.get(param) != revision_id:
+                        raise UnfilteredResponse(
+                            f"сервер не применил фильтр {param}={revision_id}: "
+                            f"запись {item.get('id')} с {param}={item.get(param)}"
+                        )
+                items.extend(page)
+        finally:
+            pages.close()
+        return items
+
+    def full_load(self, revision: Any, reason: Optional[str] = None) -> SyncResult:
+        """Загрузить все узлы и атрибуты и отметить ревизию примененной"""
+        started = time.perf_counter()
+        nodes = fetch_all_pages(lambda page: self.client.get_nodes_list(page=page, per_page=self.per_page),
+                                self.per_page, workers=self.workers, items_key="items").records
+        attributes = fetch_all_pages(lambda page: self.client.get_attributes_list(page=page, per_page=self.per_page),
+                                     self.per_page, workers=self.workers, items_key="items").records
+        self.store.replace(nodes, attributes, revision)
+        self.store.save()
+        return SyncResult("full", [revision] if revision is not None else [], len(self.store.nodes),
+                          len(self.store.attributes), time.perf_counter() - started, reason)
+
+    def sync(self, full: bool = False) -> SyncResult:
+        """
+        Применить новые ревизии (или выполнить полную загрузку, если цепочка прервана)
+
+        Состояние сохраняется после каждой примененной ревизии, поэтому прерванная
+        синхронизация продолжается с места остановки.
+        """
+        started = time.perf_counter()
+        revisions = self.revisions()
+        latest = revisions[-1].get("id") if revisions else None
+        if full:
+            return self.full_load(latest, "запрошена полная загрузка")
+        pending, reason = self.plan(revisions)
+        if pending is None:
+            return self.full_load(latest, reason)
+        if not pending:
+            return SyncResult("noop", [], 0, 0, time.perf_counter() - started)
+
+        nodes_changed = attributes_changed = 0
+        applied = []
+        for revision in pending:
+            revision_id = revision.get("id")
+            try:
+                nodes = self._changes(self.client.get_nodes_list, revision_id)
+                attributes = self._changes(self.client.get_attributes_list, revision_id)
+            except UnfilteredResponse as e:
+                return self.full_load(latest, str(e))
+            nodes_changed += self.store.apply(self.store.nodes, nodes)
+            attributes_changed += self.store.apply(self.store.attributes, attributes)
+            self.store.revision = revision_id
+            self.store.save()
+            applied.append(revision_id)
+        return SyncResult("incremental", applied, nodes_changed, attributes_changed, time.perf_counter() - started)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Кэш плиток графа УДС
+
+Окно карты раскладывается на плитки Web Mercator (x, y, z); граф каждой
+плитки запрашивается через get_graph отдельно и хранится в кэше по ключу
+(x, y, z, zoom, ревизия). Запрос окна собирается из плиток кэша, с сервера
+параллельно догружаются только недостающие. Тела ответов хранятся как bytes,
+вытеснение - LRU по суммарному размеру.
+
+    tiles = client.graph_tile_cache(max_bytes=256 * 1024 * 1024)
+    graph = tiles.get_viewport((30.2, 59.9, 30.4, 60.0), zoom=12)   # {"nodes": [...], "edges": [...]}
+    tiles.set_revision(revision_id)                                  # новые ключи, старые вытесняются LRU
+
+Узлы и ребра, попавшие в несколько плиток, в результате не повторяются (по id).
+Результат покрывает плитки окна целиком, то есть может быть шире окна.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .geo import BBox, bbox_ring, points_bbox, polygon_payload, polygon_ring
+
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+DEFAULT_TILE_WORKERS = 8
+
+# Окно, покрываемое большим числом плиток, раскладывается на более крупные плитки
+DEFAULT_MAX_TILES = 64
+
+MAX_LAT = 85.05112878
+
+Tile = Tuple[int, int, int]
+
+
+def lonlat_to_tile(lon: float, lat: float, z: int) -> Tuple[int, int]:
+    """Плитка Web Mercator, содержащая точку"""
+    lat = max(-MAX_LAT, min(MAX_LAT, lat))
+    n = 1 << z
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bbox(x: int, y: int, z: int) -> BBox:
+    """Прямоугольник плитки (min_lon, min_lat, max_lon, max_lat)"""
+    n = 1 << z
+
+    def lat_of(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360.0 - 180.0, lat_of(y + 1), (x + 1) / n * 360.0 - 180.0, lat_of(y)
+
+
+def tiles_for_bbox(bbox: BBox, z: int) -> List[Tile]:
+    min_x, max_y = lonlat_to_tile(bbox[0], bbox[1], z)
+    max_x, min_y = lonlat_to_tile(bbox[2], bbox[3], z)
+    return [(x, y, z) for y in range(min_y, max_y + 1) for x in range(min_x, max_x + 1)]
+
+
+def viewport_bbox(viewport) -> BBox:
+    """Прямоугольник окна: кортеж из четырех чисел или полигон (форматы - см. geo.polygon_ring)"""
+    if isinstance(viewport, (list, tuple)) and len(viewport) == 4 and isinstance(viewport[0], (int, float)):
+        return tuple(float(value) for value in viewport)
+    return points_bbox(polygon_ring(viewport))
+
+
+def tile_geometry(tile: Tile) -> Dict[str, Any]:
+    """Полигон плитки в формате geometry для get_graph"""
+    return polygon_payload(bbox_ring(tile_bbox(*tile)))["polygon"]
+
+
+class GraphTileCache:
+    """
+    LRU кэш плиток get_graph с ограничением по байтам
+
+    Args:
+        client: DigitalTwinAPIClient (синхронный)
+        max_bytes: предельный суммарный размер тел ответов в кэше
+        workers: количество одновременных запросов недостающих плиток
+        revision: текущая ревизия графа (часть ключа)
+        tile_zoom: уровень плиток (None - равен zoom запроса)
+        max_tiles: если окно покрывает больше плиток, уровень плиток уменьшается
+    """
+
+    def __init__(self, client, max_bytes: int = DEFAULT_MAX_BYTES, workers: int = DEFAULT_TILE_WORKERS,
+                 revision: Any = None, tile_zoom: Optional[int] = None, max_tiles: int = DEFAULT_MAX_TILES):
+        self.client = client
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.revision = revision
+        self.tile_zoom = tile_zoom
+        self.max_tiles = max(1, max_tiles)
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def set_revision(self, revision: Any):
+        """Перейти на ревизию: плитки запрашиваются заново, старые вытесняются по LRU"""
+        self.revision = revision
+
+    def tiles_for(self, viewport, zoom: int) -> List[Tile]:
+        """Плитки окна: прямоугольник (min_lon, min_lat, max_lon, max_lat) или полигон"""
+        bbox = viewport_bbox(viewport)
+        z = self.tile_zoom if self.tile_zoom is not None else zoom
+        tiles = tiles_for_bbox(bbox, z)
+        while len(tiles) > self.max_tiles and z > 0:
+            z -= 1
+            tiles = tiles_for_bbox(bbox, z)
+        return tiles
+
+    def _get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def _put(self, key: tuple, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def _fetch(self, tile: Tile, zoom: int) -> bytes:
+        response = self.client.get_graph(tile_geometry(tile), zoom=zoom)
+        response.raise_for_status()
+        return response.content
+
+    def fetch_tiles(self, tiles: List[Tile], zoom: int) -> Dict[Tile, bytes]:
+        """Тела ответов плиток: из кэша, недостающие - параллельными запросами"""
+        revision = self.revision
+        bodies: Dict[Tile, bytes] = {}
+        missing = []
+        for tile in tiles:
+            body = self._get((*tile, zoom, revision))
+            if body is None:
+                missing.append(tile)
+            else:
+                bodies[tile] = body
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(missing)))) as executor:
+                for tile, body in zip(missing, executor.map(lambda t: self._fetch(t, zoom), missing)):
+                    self._put((*tile, zoom, revision), body)
+                    bodies[tile] = body
+        return bodies
+
+    def get_viewport(self, viewport, zoom: int = 9) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Граф окна, собранный из плиток
+
+        Returns:
+            {"nodes": [...], "edges": [...]} без повторов по id (можно передать в graph.load_graph)
+        """
+        tiles = self.tiles_for(viewport, zoom)
+        bodies = self.fetch_tiles(tiles, zoom)
+        loads = self.client.http.codec.loads
+        merged: Dict[str, List[Dict[str, Any]]] = {"nodes": [], "edges": []}
+        seen: Dict[str, set] = {"nodes": set(), "edges": set()}
+        for tile in tiles:
+            body = loads(bodies[tile]) or {}
+            for key in ("nodes", "edges"):
+                items, ids = merged[key], seen[key]
+                for item in body.get(key) or []:
+                    item_id = item.get("id")
+                    if item_id is not None:
+                        if item_id in ids:
+                            continue
+                        ids.add(item_id)
+                    items.append(item)
+        return merged
+
+    def invalidate(self, predicate: Optional[Callable[[tuple], bool]] = None) -> int:
+        """Удалить плитки (все или с ключом (x, y, z, zoom, ревизия), для которого predicate истинен)"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate is None or predicate(key)]
+            for key in keys:
+                self._size -= len(self._entries.pop(key))
+            return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "tiles": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Наблюдение за запросами клиентов
+
+Каждый вызов метода клиента порождает RequestEvent: клиент, метод, шаблон
+эндпоинта, статус, объем тела и время по фазам (ожидание лимита частоты, DNS,
+соединение, TLS, ответ сервера, загрузка тела, паузы между повторами).
+События получают зарегистрированные обработчики - любые функции event -> None:
+
+    sink = HistogramSink()
+    add_hook(sink)
+    ...
+    print(sink.format())
+
+Без изменения кода обработчики подключаются переменной окружения API_HOOKS
+(через запятую: log, log:DEBUG, histogram, jsonl:<файл>, prometheus:<порт>, textfile:<файл>):
+
+    API_HOOKS=histogram,jsonl:requests.jsonl pytest tests/tests_metro
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .cache import _ID_SEGMENT
+
+
+HOOKS_ENV = "API_HOOKS"
+
+PHASES = ("queue", "dns", "connect", "tls", "server", "download", "retry", "total")
+
+# Верхние границы интервалов гистограммы времени ответа, мс
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+logger = logging.getLogger(__name__)
+
+
+def endpoint_template(url: str) -> str:
+    """Путь URL с идентификаторами вместо {id}: /parking/15 -> /parking/{id}"""
+    segments = urlsplit(url).path.rstrip("/").split("/")
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in segments) or "/"
+
+
+class PhaseTimer:
+    """Время фаз одного вызова; заполняется транспортом и соединениями пула"""
+
+    __slots__ = PHASES + ("attempts",)
+
+    def __init__(self):
+        for phase in PHASES:
+            setattr(self, phase, 0.0)
+        self.attempts = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {phase: getattr(self, phase) for phase in PHASES}
+
+
+_current_timer: contextvars.ContextVar = contextvars.ContextVar("api_clients_phase_timer", default=None)
+
+
+def current_timer() -> Optional[PhaseTimer]:
+    """Таймер вызова, выполняемого в текущем потоке или задаче (None - наблюдение выключено)"""
+    return _current_timer.get()
+
+
+class RequestEvent:
+    """
+    Событие вызова метода клиента
+
+    Attributes:
+        client: имя класса клиента
+        method: метод клиента, выполнивший запрос
+        http_method, url: запрос
+        endpoint: шаблон пути (идентификаторы заменены на {id})
+        status: HTTP статус (None - запрос завершился исключением)
+        error: исключение в виде "Тип: сообщение"
+        bytes_sent, bytes_received: размер тела запроса и ответа (None - неизвестен)
+        attempts: количество отправок (с повторами и повтором после 401)
+        from_cache: ответ получен из кэша в памяти или подтвержден 304
+        started_at: время начала (unix time)
+        timings: время фаз, с (PHASES)
+    """
+
+    __slots__ = ("client", "method", "http_method", "url", "endpoint", "status", "error", "bytes_sent",
+                 "bytes_received", "attempts", "from_cache", "started_at", "timings")
+
+    def __init__(self, client: str, method: str, http_method: str, url: str, status: Optional[int] = None,
+                 error: Optional[str] = None, bytes_sent: Optional[int] = None, bytes_received: Optional[int] = None,
+                 attempts: int = 0, from_cache: bool = False, started_at: float = 0.0,
+                 timings: Optional[Dict[str, float]] = None):
+        self.client = client
+        self.method = method
+        self.http_method = http_method
+        self.url = url
+        self.endpoint = endpoint_template(url)
+        self.status = status
+        self.error = error
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.attempts = attempts
+        self.from_cache = from_cache
+        self.started_at = started_at
+        self.timings = timings or {}
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 400
+
+    @property
+    def duration(self) -> float:
+        return self.timings.get("total", 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        outcome = self.status if self.error is None else self.error
+        return f"RequestEvent({self.client}.{self.method} {self.http_method} {self.endpoint} -> {outcome})"
+
+
+class Hooks:
+    """Набор обработчиков событий; ошибка обработчика не прерывает запрос"""
+
+    def __init__(self):
+        self._hooks: Tuple[Callable[[RequestEvent], Any], ...] = ()
+        self._lock = threading.Lock()
+
+    def add(self, hook: Callable[[RequestEvent], Any]) -> Callable[[RequestEvent], Any]:
+        with self._lock:
+            self._hooks = self._hooks + (hook,)
+        return hook
+
+    def remove(self, hook: Callable[[RequestEvent], Any]):
+        with self._lock:
+            self._hooks = tuple(h for h in self._hooks if h is not hook)
+
+    def clear(self):
+        with self._lock:
+            self._hooks = ()
+
+    def __bool__(self):
+        return bool(self._hooks)
+
+    def __len__(self):
+        return len(self._hooks)
+
+    def emit(self, event: RequestEvent):
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Ошибка обработчика событий запроса %r", hook)
+
+
+class LogSink:
+    """Строка в лог на каждый вызов (логгер api_clients.requests)"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("api_clients.requests")
+        self.level = level
+
+    def __call__(self, event: RequestEvent):
+        if not self.logger.isEnabledFor(self.level):
+            return
+        timings = event.timings
+        phases = " ".join(f"{phase}={timings[phase] * 1000:.0f}" for phase in PHASES[:-1] if timings.get(phase))
+        outcome = event.status if event.error is None else event.error
+        cache = " (кэш)" if event.from_cache else ""
+        self.logger.log(
+            self.level, "%s.%s %s %s -> %s%s %.0f мс [%s] %s Б",
+            event.client, event.method, event.http_method, event.endpoint, outcome, cache,
+            event.duration * 1000, phases, event.bytes_received if event.bytes_received is not None else "?"
+        )
+
+
+class _Histogram:
+    """Интервалы LATENCY_BUCKETS_MS, сумма и максимум времени одного ключа"""
+
+    __slots__ = ("counts", "count", "errors", "sum", "max", "bytes")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.bytes = 0
+
+    def record(self, seconds: float, ok: bool, size: Optional[int]):
+        ms = seconds * 1000
+        index = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        if not ok:
+            self.errors += 1
+        if size:
+            self.bytes += size
+
+    def percentile(self, pct: float) -> float:
+        """Оценка перцентиля, с (линейно внутри интервала)"""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        lower = 0.0
+        for count, bound in zip(self.counts, LATENCY_BUCKETS_MS + (math.inf,)):
+            upper = min(bound / 1000, self.max)
+            if count and seen + count >= rank:
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return self.max
+
+
+class HistogramSink:
+    """
+    Гистограмма времени ответа в памяти по (клиент, эндпоинт)
+
+    Хранит только счетчики интервалов, поэтому подходит для долгих опросов.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str, str], _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        key = (event.client, event.http_method, event.endpoint)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.record(event.duration, event.ok, event.bytes_received)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Показатели по ключам "Клиент METHOD /endpoint": count, errors, mean/p50/p95/p99/max (мс), bytes"""
+        with self._lock:
+            items = list(self._histograms.items())
+        return {
+            f"{client} {http_method} {endpoint}": {
+                "count": histogram.count,
+                "errors": histogram.errors,
+                "mean_ms": histogram.sum / histogram.count * 1000,
+                "p50_ms": histogram.percentile(50) * 1000,
+                "p95_ms": histogram.percentile(95) * 1000,
+                "p99_ms": histogram.percentile(99) * 1000,
+                "max_ms": histogram.max * 1000,
+                "bytes": histogram.bytes,
+            }
+            for (client, http_method, endpoint), histogram in items
+        }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def format(self) -> str:
+        """Таблица показателей, самые медленные (p95) сверху"""
+        rows = sorted(self.stats().items(), key=lambda item: item[1]["p95_ms"], reverse=True)
+        lines = ["Время ответа по эндпоинтам (мс):"]
+        for name, stats in rows:
+            lines.append(
+                f"  {name:70} n={stats['count']:<6} ошибок {stats['errors']:<4} "
+                f"p50={stats['p50_ms']:7.0f} p95={stats['p95_ms']:7.0f} p99={stats['p99_ms']:7.0f} "
+                f"max={stats['max_ms']:7.0f}"
+            )
+        return "\n".join(lines)
+
+
+class JSONLSink:
+    """Событие на строку JSON в файле (дописывается)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __call__(self, event: RequestEvent):
+        line = json.dumps(event.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def sinks_from_spec(spec: str) -> List[Callable[[RequestEvent], Any]]:
+    """
+    Обработчики по описанию вида "log,histogram,jsonl:requests.jsonl"
+
+    prometheus[:порт] и textfile:<файл> подключают сборщик метрик (metrics.py)
+    и запускают HTTP endpoint или периодическую запись файла.
+
+    Raises:
+        ValueError: неизвестный обработчик
+    """
+    sinks = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, arg = item.partition(":")
+        if name == "log":
+            sink = LogSink(level=logging.getLevelName(arg.upper()) if arg else logging.INFO)
+            if not sink.logger.handlers:
+                sink.logger.addHandler(logging.StreamHandler(sys.stderr))
+            sink.logger.setLevel(sink.level)
+        elif name == "histogram":
+            sink = HistogramSink()
+        elif name == "jsonl":
+            sink = JSONLSink(arg or "requests.jsonl")
+        elif name in ("prometheus", "textfile"):
+            from . import metrics
+
+            sink = metrics.MetricsCollector()
+            if name == "prometheus":
+                metrics.start_http_server(int(arg) if arg else metrics.DEFAULT_PORT, collector=sink)
+            else:
+                metrics.start_textfile_writer(arg or "api_clients.prom", collector=sink)
+        else:
+            raise ValueError(f"Неизвестный обработчик событий {name!r} в {HOOKS_ENV}")
+        sinks.append(sink)
+    return sinks
+
+
+_hooks: Optional[Hooks] = None
+_hooks_lock = threading.Lock()
+
+
+def get_hooks() -> Hooks:
+    """
+    Общий для процесса набор обработчиков
+
+    При создании подключаются обработчики из API_HOOKS; их гистограмма печатается
+    в stderr при завершении процесса.
+    """
+    global _hooks
+    if _hooks is None:
+        with _hooks_lock:
+            if _hooks is None:
+                hooks = Hooks()
+                for sink in sinks_from_spec(os.getenv(HOOKS_ENV, "")):
+                    if isinstance(sink, HistogramSink):
+                        atexit.register(lambda sink=sink: print(sink.format(), file=sys.stderr))
+                    elif isinstance(sink, JSONLSink):
+                        atexit.register(sink.close)
+                    hooks.add(sink)
+                _hooks = hooks
+    return _hooks
+
+
+def add_hook(hook: Callable[[RequestEvent], Any]) -> Callable[[RequestEvent], Any]:
+    """Подписать обработчик на события всех клиентов"""
+    return get_hooks().add(hook)
+
+
+def remove_hook(hook: Callable[[RequestEvent], Any]):
+    """Отписать обработчик"""
+    get_hooks().remove(hook)
+
+
+def _body_size(body) -> Optional[int]:
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return None
+
+
+def response_sizes(response) -> Tuple[Optional[int], Optional[int]]:
+    """Размер тела запроса и ответа (requests или httpx)"""
+    request = getattr(response, "request", None)
+    sent = None
+    if request is not None:
+        body = getattr(request, "body", None)
+        if body is None and hasattr(request, "stream"):
+            # httpx.Request: тело доступно, если не потоковое
+            try:
+                body = request.content
+            except Exception:
+                body = None
+        sent = _body_size(body)
+    received = None
+    if getattr(response, "_content", False) not in (False, None):
+        received = len(response._content)
+    else:
+        length = response.headers.get("Content-Length") if response.headers is not None else None
+        received = int(length) if length and length.isdigit() else None
+    return sent, received
+
+
+def observe(hooks: Hooks, client: str, method: str, http_method: str, url: str, call: Callable[[], Any]):
+    """
+    Выполнить call() с замером фаз и отправить событие hooks
+
+    Для асинхронного транспорта call() возвращает корутину: замер выполняется внутри
+    возвращаемой корутины, чтобы фазы учитывались в контексте задачи.
+    """
+    started_at = time.time()
+    timer = PhaseTimer()
+
+    def finish(started, response, error):
+        timer.total = time.perf_counter() - started
+        status = sent = received = None
+        from_cache = False
+        if response is not None:
+            status = response.status_code
+            sent, received = response_sizes(response)
+            from_cache = bool(getattr(response, "from_cache", False))
+        hooks.emit(RequestEvent(
+            client, method, http_method, url, status=status, error=error, bytes_sent=sent,
+            bytes_received=received, attempts=timer.attempts, from_cache=from_cache,
+            started_at=started_at, timings=timer.as_dict()
+        ))
+
+    started = time.perf_counter()
+    token = _current_timer.set(timer)
+    try:
+        result = call()
+    except Exception as e:
+        finish(started, None, f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_timer.reset(token)
+
+    if not hasattr(result, "__await__"):
+        finish(started, result, None)
+        return result
+
+    async def observed():
+        token = _current_timer.set(timer)
+        try:
+            response = await result
+        except Exception as e:
+            finish(started, None, f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_timer.reset(token)
+        finish(started, response, None)
+        return response
+    return observed()
@@ -4,27 +4,26 @@ API клиент для раздела Инциденты
 """
 
 import requests
-import os
+
+from .auth import get_token_provider
+from .bulk import DEFAULT_BULK_WORKERS, bulk_create, bulk_delete, bulk_update
+from .models import Incident, parse_list, parse_one, typed
+from .transport import bind_transport
 
 
 class IncidentsAPIClient:
     """API клиент для работы с разделом Инциденты"""
     
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = bind_transport(self, transport)
         self.base_url = "http://91.227.17.139/services/react/api"
         self.token = self._get_token()
         self.headers = self._get_headers()
+        get_token_provider().subscribe(self)
     
     def _get_token(self):
         """Получить токен"""
-        try:
-            with open('.env', 'r') as f:
-                for line in f:
-                    if line.startswith('EPUTS_TOKEN='):
-                        return line.split('=', 1)[1].strip()
-        except:
-            pass
-        return None
+        return get_token_provider().get_token()
     
     def _get_headers(self):
         """Получить заголовки"""
@@ -47,12 +46,13 @@ class IncidentsAPIClient:
             dict: {"valid": bool, "status_code": int, "message": str}
         """
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/incident",
                 params={"page": 1, "limit": 1},
                 headers=self.headers,
                 verify=False,
-                timeout=10
+                timeout=10,
+                auth_retry=False
             )
             
             if response.status_code == 401:
@@ -90,16 +90,24 @@ class IncidentsAPIClient:
     def get_incidents_list(self, page=1, limit=10):
         """Получить список инцидентов"""
         data = {"page": page, "limit": limit, "is_simple": True}
-        return requests.post(f"{self.base_url}/incident/list", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/incident/list", json=data, headers=self.headers, verify=False)
     
     def get_incident_by_id(self, incident_id):
         """Получить инцидент по ID"""
-        return requests.get(f"{self.base_url}/incident/{incident_id}", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/incident/{incident_id}", headers=self.headers, verify=False)
+    
+    def get_incidents_list_typed(self, page=1, limit=10):
+        """Получить список инцидентов как ModelList[Incident]"""
+        return typed(self.get_incidents_list(page=page, limit=limit), parse_list, Incident)
+    
+    def get_incident_by_id_typed(self, incident_id):
+        """Получить инцидент по ID как Incident"""
+        return typed(self.get_incident_by_id(incident_id), parse_one, Incident)
     
     def search_incidents(self, page=1, limit=10):
         """Поиск инцидентов"""
         data = {"page": page, "limit": limit}
-        return requests.post(f"{self.base_url}/incident/search", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/incident/search", json=data, headers=self.headers, verify=False)
     
     def create_incident(self, name, description, type_id=1, status_id=1, threat_level_id=1, category_id=1):
         """Создать инцидент с полными данными"""
@@ -119,7 +127,7 @@ class IncidentsAPIClient:
             "registered_at": datetime.now().strftime("%Y-%m-%dT%H:%M:%S+00:00"),
             "resolve_rules": 1
         }
-        return requests.post(f"{self.base_url}/incident", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/incident", json=data, headers=self.headers, verify=False)
     
     def update_incident(self, incident_id, **fields):
         """Обновить инцидент с полными данными"""
@@ -140,20 +148,32 @@ class IncidentsAPIClient:
             "registered_at": fields.get("registered_at", datetime.now().strftime("%Y-%m-%dT%H:%M:%S+00:00")),
             "resolve_rules": fields.get("resolve_rules", 1)
         }
-        return requests.put(f"{self.base_url}/incident/{incident_id}", json=data, headers=self.headers, verify=False)
+        return self.http.put(f"{self.base_url}/incident/{incident_id}", json=data, headers=self.headers, verify=False)
     
     def delete_incident(self, incident_id):
         """Удалить инцидент"""
-        return requests.delete(f"{self.base_url}/incident/{incident_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.base_url}/incident/{incident_id}", headers=self.headers, verify=False)
+    
+    def bulk_create_incidents(self, payloads, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Создать инциденты параллельно (payloads - аргументы create_incident), BulkResult"""
+        return bulk_create(self.create_incident, payloads, workers=workers, rate=rate)
+    
+    def bulk_update_incidents(self, changes, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Обновить инциденты параллельно ({incident_id: fields} или пары), BulkResult"""
+        return bulk_update(self.update_incident, changes, workers=workers, rate=rate)
+    
+    def bulk_delete_incidents(self, incident_ids, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Удалить инциденты параллельно, BulkResult"""
+        return bulk_delete(self.delete_incident, incident_ids, workers=workers, rate=rate)
     
     # === EVENTS ===
     def get_events_list(self):
         """Получить список событий"""
-        return requests.get(f"{self.base_url}/event", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/event", headers=self.headers, verify=False)
     
     def get_event_by_id(self, event_id):
         """Получить событие по ID"""
-        return requests.get(f"{self.base_url}/event/{event_id}", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/event/{event_id}", headers=self.headers, verify=False)
     
     def create_event(self, name, description, short_name=None):
         """Создать событие с полными данными"""
@@ -170,7 +190,7 @@ class IncidentsAPIClient:
             "date_start": now.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
             "date_end": (now + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S+00:00")
         }
-        return requests.post(f"{self.base_url}/event", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/event", json=data, headers=self.headers, verify=False)
     
     def update_event(self, event_id, **fields):
         """Обновить событие с полными данными"""
@@ -184,55 +204,55 @@ class IncidentsAPIClient:
             "date_start": fields.get("date_start", now.strftime("%Y-%m-%dT%H:%M:%S+00:00")),
             "date_end": fields.get("date_end", (now + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S+00:00"))
         }
-        return requests.put(f"{self.base_url}/event/{event_id}", json=data, headers=self.headers, verify=False)
+        return self.http.put(f"{self.base_url}/event/{event_id}", json=data, headers=self.headers, verify=False)
     
     def delete_event(self, event_id):
         """Удалить событие"""
-        return requests.delete(f"{self.base_url}/event/{event_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.base_url}/event/{event_id}", headers=self.headers, verify=False)
     
     # === CATEGORIES ===
     def get_categories_list(self):
         """Получить список категорий"""
-        return requests.get(f"{self.base_url}/category", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/category", headers=self.headers, verify=False)
     
     def get_category_by_id(self, category_id):
         """Получить категорию по ID"""
-        return requests.get(f"{self.base_url}/category/{category_id}", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/category/{category_id}", headers=self.headers, verify=False)
     
     def create_category(self, name, description):
         """Создать категорию"""
         data = {"name": name, "description": description}
-        return requests.post(f"{self.base_url}/category", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/category", json=data, headers=self.headers, verify=False)
     
     def update_category(self, category_id, **fields):
         """Обновить категорию"""
-        return requests.put(f"{self.base_url}/category/{category_id}", json=fields, headers=self.headers, verify=False)
+        return self.http.put(f"{self.base_url}/category/{category_id}", json=fields, headers=self.headers, verify=False)
     
     def delete_category(self, category_id):
         """Удалить категорию"""
-        return requests.delete(f"{self.base_url}/category/{category_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.base_url}/category/{category_id}", headers=self.headers, verify=False)
     
     # === KEYWORDS ===
     def get_keywords_list(self):
         """Получить список ключевых слов"""
-        return requests.get(f"{self.base_url}/keyword", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/keyword", headers=self.headers, verify=False)
     
     def get_keyword_by_id(self, keyword_id):
         """Получить ключевое слово по ID"""
-        return requests.get(f"{self.base_url}/keyword/{keyword_id}", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/keyword/{keyword_id}", headers=self.headers, verify=False)
     
     def create_keyword(self, name, description):
         """Создать ключевое слово"""
         data = {"name": name, "description": description}
-        return requests.post(f"{self.base_url}/keyword", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/keyword", json=data, headers=self.headers, verify=False)
     
     def update_keyword(self, keyword_id, **fields):
         """Обновить ключевое слово"""
-        return requests.put(f"{self.base_url}/keyword/{keyword_id}", json=fields, headers=self.headers, verify=False)
+        return self.http.put(f"{self.base_url}/keyword/{keyword_id}", json=fields, headers=self.headers, verify=False)
     
     def delete_keyword(self, keyword_id):
         """Удалить ключевое слово"""
-        return requests.delete(f"{self.base_url}/keyword/{keyword_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.base_url}/keyword/{keyword_id}", headers=self.headers, verify=False)
     
     # === FACTORS ===
     def get_factors_list(self, page=1, limit=25, name=None):
@@ -240,16 +260,16 @@ class IncidentsAPIClient:
         params = {"page": page, "limit": limit}
         if name:
             params["name"] = name
-        return requests.get(f"{self.base_url}/factor", params=params, headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/factor", params=params, headers=self.headers, verify=False)
     
     def get_factor_by_id(self, factor_id):
         """Получить фактор по ID"""
-        return requests.get(f"{self.base_url}/factor/{factor_id}", headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/factor/{factor_id}", headers=self.headers, verify=False)
     
     def create_factor(self, name, is_geo=False):
         """Создать фактор"""
         data = {"name": name, "is_geo": is_geo}
-        return requests.post(f"{self.base_url}/factor", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/factor", json=data, headers=self.headers, verify=False)
     
     def update_factor(self, factor_id, **fields):
         """Обновить фактор с полными данными"""
@@ -257,9 +277,9 @@ class IncidentsAPIClient:
             "name": fields.get("name", "Обновленный фактор"),
             "is_geo": fields.get("is_geo", False)
         }
-        return requests.put(f"{self.base_url}/factor/{factor_id}", json=data, headers=self.headers, verify=False)
+        return self.http.put(f"{self.base_url}/factor/{factor_id}", json=data, headers=self.headers, verify=False)
     
     def delete_factor(self, factor_id):
         """Удалить фактор"""
-        return requests.delete(f"{self.base_url}/factor/{factor_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.base_url}/factor/{factor_id}", headers=self.headers, verify=False)
 
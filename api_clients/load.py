@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный прогон сценария вызовов клиентов
+
+Сценарий - взвешенный набор вызовов методов клиентов. Нагрузка подается
+в одном из режимов:
+
+- closed: concurrency виртуальных пользователей, каждый выполняет следующий
+  вызов сразу после ответа на предыдущий (нагрузка зависит от скорости сервера);
+- open: вызовы запускаются с частотой rps независимо от ответов; время ответа
+  считается от запланированного момента отправки, поэтому отставание
+  генератора при перегрузке сервера попадает в латентность.
+
+    scenario = Scenario.load("load_scenarios/city_event.yaml")
+    report = LoadRunner(scenario).run()
+    print(report.format())
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .data_bus import DataBusAPIClient
+from .digital_twin import DigitalTwinAPIClient
+from .dtp import DTPAPIClient
+from .external_transport import ExternalTransportAPIClient
+from .incidents import IncidentsAPIClient
+from .metro import MetroAPIClient
+from .organizations import OrganizationsAPIClient
+from .parking import ParkingAPIClient
+from .passenger_transport import PassengerTransportAPIClient
+from .water_transport import WaterTransportAPIClient
+
+
+CLIENTS = {
+    "incidents": IncidentsAPIClient,
+    "dtp": DTPAPIClient,
+    "metro": MetroAPIClient,
+    "parking": ParkingAPIClient,
+    "digital_twin": DigitalTwinAPIClient,
+    "external_transport": ExternalTransportAPIClient,
+    "water_transport": WaterTransportAPIClient,
+    "passenger_transport": PassengerTransportAPIClient,
+    "data_bus": DataBusAPIClient,
+    "organizations": OrganizationsAPIClient,
+}
+
+MODES = ("closed", "open")
+
+# Верхние границы интервалов гистограммы, мс
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class ScenarioCall:
+    """
+    Вызов сценария: метод method клиента client с аргументами params
+
+    Подстрока "{seq}" в строковых аргументах заменяется номером запроса,
+    чтобы создаваемые записи получали разные имена.
+    """
+
+    __slots__ = ("client", "method", "weight", "params")
+
+    def __init__(self, client: str, method: str, weight: float = 1, params: Optional[Dict[str, Any]] = None):
+        if client not in CLIENTS:
+            raise ValueError(f"Неизвестный клиент {client!r}, доступны: {', '.join(CLIENTS)}")
+        if not hasattr(CLIENTS[client], method):
+            raise ValueError(f"У клиента {client!r} нет метода {method!r}")
+        if weight <= 0:
+            raise ValueError(f"Вес вызова {client}.{method} должен быть положительным")
+        self.client = client
+        self.method = method
+        self.weight = weight
+        self.params = params or {}
+
+    @property
+    def name(self) -> str:
+        return f"{self.client}.{self.method}"
+
+    def arguments(self, seq: int) -> Dict[str, Any]:
+        """Аргументы вызова с подставленным номером запроса"""
+        return {
+            key: value.replace("{seq}", str(seq)) if isinstance(value, str) else value
+            for key, value in self.params.items()
+        }
+
+
+class Scenario:
+    """
+    Сценарий нагрузки
+
+    Args:
+        calls: взвешенные вызовы
+        mode: "closed" (фиксированное число пользователей) или "open" (фиксированная частота)
+        duration: длительность прогона, с
+        rps: частота запуска вызовов в режиме open
+        concurrency: число пользователей (closed) или максимум одновременных запросов (open)
+        interval: ширина окна для отчета о пропускной способности во времени, с
+        name: название сценария
+    """
+
+    def __init__(self, calls: List[ScenarioCall], mode: str = "closed", duration: float = 60,
+                 rps: Optional[float] = None, concurrency: int = 10, interval: float = 5, name: str = "scenario"):
+        if not calls:
+            raise ValueError("Сценарий не содержит вызовов")
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим {mode!r}, доступны: {', '.join(MODES)}")
+        if mode == "open" and not rps:
+            raise ValueError("Для режима open нужно задать rps")
+        self.calls = calls
+        self.mode = mode
+        self.duration = duration
+        self.rps = rps
+        self.concurrency = concurrency
+        self.interval = interval
+        self.name = name
+        self._cumulative = []
+        total = 0.0
+        for call in calls:
+            total += call.weight
+            self._cumulative.append(total)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Scenario":
+        """Сценарий из словаря (формат файла сценария)"""
+        options = {key: value for key, value in data.items() if key != "calls"}
+        calls = [ScenarioCall(**call) for call in data.get("calls") or []]
+        return cls(calls, **options)
+
+    @classmethod
+    def load(cls, path: str) -> "Scenario":
+        """Загрузить сценарий из YAML или JSON файла"""
+        import yaml
+
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(yaml.safe_load(f) or {})
+
+    def pick(self, rng: random.Random) -> ScenarioCall:
+        """Случайный вызов с учетом весов"""
+        point = rng.random() * self._cumulative[-1]
+        for call, bound in zip(self.calls, self._cumulative):
+            if point < bound:
+                return call
+        return self.calls[-1]
+
+
+class LatencyHistogram:
+    """Время ответа: интервалы HISTOGRAM_BOUNDS_MS и точные перцентили по замерам"""
+
+    def __init__(self):
+        self.counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.samples: List[float] = []
+
+    def record(self, seconds: float):
+        ms = seconds * 1000
+        for index, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if ms <= bound:
+                break
+        else:
+            index = len(HISTOGRAM_BOUNDS_MS)
+        self.counts[index] += 1
+        self.samples.append(seconds)
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.samples.extend(other.samples)
+
+    @property
+    def count(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, pct: float) -> float:
+        """Перцентиль времени ответа, с"""
+        if not self.samples:
+            return 0.0
+        timings = sorted(self.samples)
+        return timings[min(int(round(pct / 100 * (len(timings) - 1))), len(timings) - 1)]
+
+    def buckets(self):
+        """Пары (подпись интервала, количество)"""
+        labels = [f"<= {bound} мс" for bound in HISTOGRAM_BOUNDS_MS] + [f"> {HISTOGRAM_BOUNDS_MS[-1]} мс"]
+        return list(zip(labels, self.counts))
+
+
+class CallStats:
+    """Показатели одного вызова сценария"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.status_codes: Dict[Any, int] = {}
+
+    @property
+    def requests(self) -> int:
+        return self.latency.count
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+
+class LoadReport:
+    """Итоги прогона: показатели по вызовам и пропускная способность по окнам времени"""
+
+    def __init__(self, scenario: Scenario):
+        self.scenario = scenario
+        self.calls: Dict[str, CallStats] = {call.name: CallStats() for call in scenario.calls}
+        # [запросов, ошибок] в окне номер i (по времени завершения запроса)
+        self.windows: List[List[int]] = []
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, call: ScenarioCall, status: Any, error: bool, latency: float, finished_at: float):
+        window = int(finished_at // self.scenario.interval)
+        with self._lock:
+            stats = self.calls[call.name]
+            stats.latency.record(latency)
+            stats.status_codes[status] = stats.status_codes.get(status, 0) + 1
+            if error:
+                stats.errors += 1
+            while len(self.windows) <= window:
+                self.windows.append([0, 0])
+            self.windows[window][0] += 1
+            if error:
+                self.windows[window][1] += 1
+
+    @property
+    def latency(self) -> LatencyHistogram:
+        """Время ответа по всем вызовам"""
+        total = LatencyHistogram()
+        for stats in self.calls.values():
+            total.merge(stats.latency)
+        return total
+
+    @property
+    def requests(self) -> int:
+        return sum(stats.requests for stats in self.calls.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(stats.errors for stats in self.calls.values())
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Достигнутая пропускная способность, запросов в секунду"""
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def timeline(self):
+        """Тройки (начало окна, с; запросов в секунду; доля ошибок) по окнам"""
+        interval = self.scenario.interval
+        return [
+            (index * interval, requests / interval, errors / requests if requests else 0.0)
+            for index, (requests, errors) in enumerate(self.windows)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        latency = self.latency
+        return {
+            "scenario": self.scenario.name,
+            "mode": self.scenario.mode,
+            "elapsed": self.elapsed,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "throughput": self.throughput,
+            "latency_ms": {f"p{pct}": latency.percentile(pct) * 1000 for pct in (50, 90, 95, 99, 100)},
+            "histogram": dict(latency.buckets()),
+            "calls": {
+                name: {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "status_codes": {str(code): count for code, count in stats.status_codes.items()},
+                    "p50_ms": stats.latency.percentile(50) * 1000,
+                    "p95_ms": stats.latency.percentile(95) * 1000,
+                    "p99_ms": stats.latency.percentile(99) * 1000,
+                }
+                for name, stats in self.calls.items()
+            },
+            "timeline": [
+                {"start": start, "rps": rps, "error_rate": error_rate}
+                for start, rps, error_rate in self.timeline()
+            ],
+        }
+
+    def format(self) -> str:
+        """Текстовый отчет"""
+        latency = self.latency
+        scenario = self.scenario
+        load = f"{scenario.rps} req/s" if scenario.mode == "open" else f"{scenario.concurrency} пользователей"
+        lines = [
+            f"Сценарий {scenario.name}: режим {scenario.mode}, {load}, {self.elapsed:.1f} с",
+            f"Запросов {self.requests}, ошибок {self.errors} ({self.error_rate:.2%}), "
+            f"пропускная способность {self.throughput:.1f} req/s",
+            "Время ответа: " + ", ".join(
+                f"p{pct}={latency.percentile(pct) * 1000:.0f} мс" for pct in (50, 90, 95, 99, 100)
+            ),
+            "",
+            "Гистограмма:",
+        ]
+        widest = max(latency.counts) or 1
+        for label, count in latency.buckets():
+            lines.append(f"  {label:>12} {count:8} {'#' * round(40 * count / widest)}")
+        lines += ["", "Вызовы:"]
+        for name, stats in self.calls.items():
+            lines.append(
+                f"  {name:50} {stats.requests:7} запр. ошибок {stats.error_rate:6.2%}  "
+                f"p50={stats.latency.percentile(50) * 1000:.0f} p95={stats.latency.percentile(95) * 1000:.0f} мс"
+            )
+        lines += ["", "Во времени:"]
+        for start, rps, error_rate in self.timeline():
+            lines.append(f"  {start:7.0f} с  {rps:8.1f} req/s  ошибок {error_rate:.2%}")
+        return "\n".join(lines)
+
+
+class LoadRunner:
+    """
+    Выполнение сценария
+
+    Args:
+        scenario: сценарий
+        clients: готовые клиенты по имени сервиса (остальные создаются при первом вызове)
+        seed: зерно выбора вызовов для воспроизводимого порядка
+    """
+
+    def __init__(self, scenario: Scenario, clients: Optional[Dict[str, Any]] = None, seed: Optional[int] = None):
+        self.scenario = scenario
+        self.clients = dict(clients or {})
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def _client(self, name: str):
+        with self._lock:
+            if name not in self.clients:
+                self.clients[name] = CLIENTS[name]()
+            return self.clients[name]
+
+    def _next(self):
+        with self._lock:
+            self._seq += 1
+            return self.scenario.pick(self._rng), self._seq
+
+    def _execute(self, report: LoadReport, call: ScenarioCall, seq: int, scheduled: float, started: float):
+        try:
+            response = getattr(self._client(call.client), call.method)(**call.arguments(seq))
+            status = response.status_code
+            error = status >= 400
+        except Exception as e:
+            status = type(e).__name__
+            error = True
+        finished = time.perf_counter()
+        report.record(call, status, error, finished - scheduled, finished - started)
+
+    def run(self) -> LoadReport:
+        """Выполнить сценарий в течение scenario.duration секунд"""
+        report = LoadReport(self.scenario)
+        started = time.perf_counter()
+        if self.scenario.mode == "closed":
+            self._run_closed(report, started)
+        else:
+            self._run_open(report, started)
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def _run_closed(self, report: LoadReport, started: float):
+        deadline = started + self.scenario.duration
+
+        def user():
+            while time.perf_counter() < deadline:
+                call, seq = self._next()
+                self._execute(report, call, seq, time.perf_counter(), started)
+
+        threads = [threading.Thread(target=user, daemon=True) for _ in range(self.scenario.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run_open(self, report: LoadReport, started: float):
+        period = 1.0 / self.scenario.rps
+        total = int(self.scenario.duration * self.scenario.rps)
+        with ThreadPoolExecutor(max_workers=self.scenario.concurrency) as executor:
+            for index in range(total):
+                scheduled = started + index * period
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                call, seq = self._next()
+                executor.submit(self._execute, report, call, seq, scheduled, started)
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Метрики запросов клиентов в формате Prometheus
+
+Сборщик подписывается на события запросов (hooks.py) и ведет счетчики и
+гистограммы времени ответа с метками service, endpoint, method и status_class.
+Обработка события - поиск в словаре и несколько сложений под блокировкой;
+текст метрик формируется только при чтении.
+
+    collector = enable_metrics()
+    start_http_server(9108)                        # http://127.0.0.1:9108/metrics
+    start_textfile_writer("/var/lib/node_exporter/api_clients.prom")
+
+То же без изменения кода: API_HOOKS=prometheus:9108 или API_HOOKS=textfile:<файл>
+"""
+
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from .hooks import LATENCY_BUCKETS_MS, RequestEvent, add_hook, remove_hook
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_PORT = 9108
+
+# Метка service по классу клиента (асинхронные клиенты - без префикса Async)
+SERVICES = {
+    "IncidentsAPIClient": "incidents",
+    "DTPAPIClient": "dtp",
+    "MetroAPIClient": "metro",
+    "ParkingAPIClient": "parking",
+    "DigitalTwinAPIClient": "digital-twin",
+    "ExternalTransportAPIClient": "transport-external",
+    "WaterTransportAPIClient": "transport-water",
+    "PassengerTransportAPIClient": "transport-passenger",
+    "DataBusAPIClient": "data-bus",
+    "OrganizationsAPIClient": "organization",
+}
+
+BUCKETS = tuple(bound / 1000 for bound in LATENCY_BUCKETS_MS)
+
+_BUCKET_LABELS = tuple(f'le="{bound}"' for bound in BUCKETS) + ('le="+Inf"',)
+
+LABELS = ("service", "endpoint", "method", "status_class")
+
+
+def service_name(client: str) -> str:
+    """Метка service для имени класса клиента"""
+    if client.startswith("Async"):
+        client = client[len("Async"):]
+    return SERVICES.get(client) or client.replace("APIClient", "").lower()
+
+
+def status_class(event: RequestEvent) -> str:
+    """2xx, 3xx, 4xx, 5xx или error (исключение без ответа)"""
+    if event.status is None:
+        return "error"
+    return f"{event.status // 100}xx"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class _Series:
+    """Счетчики одного набора меток"""
+
+    __slots__ = ("buckets", "count", "sum", "bytes", "retries", "cache_hits")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.bytes = 0
+        self.retries = 0
+        self.cache_hits = 0
+
+
+class MetricsCollector:
+    """
+    Обработчик событий, накапливающий метрики
+
+    Args:
+        prefix: префикс имен метрик
+    """
+
+    def __init__(self, prefix: str = "api_client"):
+        self.prefix = prefix
+        self._series: Dict[Tuple[str, str, str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        key = (service_name(event.client), event.endpoint, event.http_method, status_class(event))
+        duration = event.timings.get("total", 0.0)
+        index = bisect_left(BUCKETS, duration)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.buckets[index] += 1
+            series.count += 1
+            series.sum += duration
+            if event.bytes_received:
+                series.bytes += event.bytes_received
+            if event.attempts > 1:
+                series.retries += event.attempts - 1
+            if event.from_cache:
+                series.cache_hits += 1
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        """Метрики в текстовом формате Prometheus"""
+        with self._lock:
+            snapshot = [
+                (key, list(series.buckets), series.count, series.sum, series.bytes, series.retries,
+                 series.cache_hits)
+                for key, series in sorted(self._series.items())
+            ]
+
+        name = self.prefix
+        lines: List[str] = []
+
+        def header(metric: str, kind: str, help_text: str):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+
+        def labels(key, extra: str = "") -> str:
+            pairs = [f'{label}="{_escape(value)}"' for label, value in zip(LABELS, key)]
+            if extra:
+                pairs.append(extra)
+            return "{" + ",".join(pairs) + "}"
+
+        header(f"{name}_requests_total", "counter", "Запросы клиентов")
+        for key, _, count, *_ in snapshot:
+            lines.append(f"{name}_requests_total{labels(key)} {count}")
+
+        header(f"{name}_request_duration_seconds", "histogram", "Время вызова метода клиента, с")
+        for key, buckets, count, total, *_ in snapshot:
+            cumulative = 0
+            for le, bucket in zip(_BUCKET_LABELS, buckets):
+                cumulative += bucket
+                lines.append(f"{name}_request_duration_seconds_bucket{labels(key, le)} {cumulative}")
+            lines.append(f"{name}_request_duration_seconds_sum{labels(key)} {total!r}")
+            lines.append(f"{name}_request_duration_seconds_count{labels(key)} {count}")
+
+        header(f"{name}_response_bytes_total", "counter", "Объем тел ответов, байт")
+        for key, _, _, _, size, _, _ in snapshot:
+            lines.append(f"{name}_response_bytes_total{labels(key)} {size}")
+
+        header(f"{name}_retries_total", "counter", "Повторные отправки запросов")
+        for key, _, _, _, _, retries, _ in snapshot:
+            lines.append(f"{name}_retries_total{labels(key)} {retries}")
+
+        header(f"{name}_cache_hits_total", "counter", "Ответы из кэша клиента или подтвержденные 304")
+        for key, *_, hits in snapshot:
+            lines.append(f"{name}_cache_hits_total{labels(key)} {hits}")
+
+        return "\n".join(lines) + "\n"
+
+
+_collector: Optional[MetricsCollector] = None
+_collector_lock = threading.Lock()
+
+
+def enable_metrics() -> MetricsCollector:
+    """Подписать общий сборщик метрик на события всех клиентов (повторный вызов возвращает тот же)"""
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            _collector = MetricsCollector()
+            add_hook(_collector)
+        return _collector
+
+
+def disable_metrics():
+    """Отписать общий сборщик"""
+    global _collector
+    with _collector_lock:
+        if _collector is not None:
+            remove_hook(_collector)
+            _collector = None
+
+
+def start_http_server(port: int = DEFAULT_PORT, addr: str = "127.0.0.1",
+                      collector: Optional[MetricsCollector] = None) -> ThreadingHTTPServer:
+    """
+    Отдавать метрики по http://addr:port/metrics в фоновом потоке
+
+    Returns:
+        сервер; остановка - server.shutdown()
+    """
+    collector = collector or enable_metrics()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = collector.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="api-clients-metrics", daemon=True).start()
+    return server
+
+
+def write_textfile(path: str, collector: Optional[MetricsCollector] = None):
+    """Записать метрики в файл для textfile collector node_exporter (атомарная замена)"""
+    collector = collector or enable_metrics()
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(collector.render())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class TextfileWriter:
+    """
+    Периодическая запись метрик в файл в фоновом потоке
+
+    Args:
+        path: файл .prom
+        interval: период записи, с
+        collector: сборщик (None - общий)
+    """
+
+    def __init__(self, path: str, interval: float = 15, collector: Optional[MetricsCollector] = None):
+        self.path = path
+        self.interval = interval
+        self.collector = collector or enable_metrics()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="api-clients-metrics-textfile", daemon=True)
+
+    def start(self) -> "TextfileWriter":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            write_textfile(self.path, self.collector)
+
+    def stop(self):
+        """Остановить поток и записать последние значения"""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        write_textfile(self.path, self.collector)
+
+
+def start_textfile_writer(path: str, interval: float = 15,
+                          collector: Optional[MetricsCollector] = None) -> TextfileWriter:
+    """Запустить периодическую запись метрик в файл"""
+    return TextfileWriter(path, interval, collector).start()
@@ -4,29 +4,28 @@ API клиент для раздела Метрополитен
 """
 
 import requests
-import os
 from datetime import datetime
 
+from .auth import get_token_provider
+from .models import Vestibule, parse_list, typed
+from .streaming import stream_items
+from .transport import bind_transport
+
 
 class MetroAPIClient:
     """API клиент для работы с разделом Метрополитен"""
     
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = bind_transport(self, transport)
         self.base_url = "http://91.227.17.139/services/transport-metro/api"
         self.report_base_url = "http://91.227.17.139/services/report/api"
         self.token = self._get_token()
         self.headers = self._get_headers()
+        get_token_provider().subscribe(self)
     
     def _get_token(self):
         """Получить токен"""
-        try:
-            with open('.env', 'r') as f:
-                for line in f:
-                    if line.startswith('EPUTS_TOKEN='):
-                        return line.split('=', 1)[1].strip()
-        except:
-            pass
-        return None
+        return get_token_provider().get_token()
     
     def _get_headers(self):
         """Получить заголовки"""
@@ -48,12 +47,13 @@ class MetroAPIClient:
             dict: {"valid": bool, "status_code": int, "message": str}
         """
         try:
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/vestibule",
                 json={"page": 1, "limit": 1},
                 headers=self.headers,
                 verify=False,
-                timeout=10
+                timeout=10,
+                auth_retry=False
             )
             
             if response.status_code == 401:
@@ -95,14 +95,28 @@ class MetroAPIClient:
         Получить список вестибюлей на странице
         """
         data = {"page": page, "limit": limit}
-        return requests.post(f"{self.base_url}/vestibule", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/vestibule", json=data, headers=self.headers, verify=False)
+
+    def get_vestibules_on_page_typed(self, page=1, limit=500):
+        """
+        Получить список вестибюлей на странице как ModelList[Vestibule]
+        """
+        return typed(self.get_vestibules_on_page(page=page, limit=limit), parse_list, Vestibule)
+
+    def stream_vestibules_on_page(self, page=1, limit=500):
+        """
+        Потоково получить вестибюли на странице: записи отдаются по мере чтения ответа
+        """
+        data = {"page": page, "limit": limit}
+        response = self.http.post(f"{self.base_url}/vestibule", json=data, headers=self.headers, verify=False, stream=True)
+        return stream_items(response, codec=self.http.codec)
     
     def get_vestibule_traffic_thresholds_list(self):
         """
         Получить список вестибюлей (пороги пассажиропотока)
         """
         data = {}
-        return requests.post(f"{self.base_url}/vestibule-traffic-threshold/list", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/vestibule-traffic-threshold/list", json=data, headers=self.headers, verify=False)
     
     def update_vestibule_traffic_thresholds(self, thresholds_data):
         """
@@ -122,7 +136,7 @@ class MetroAPIClient:
                     }
                 ]
         """
-        return requests.put(f"{self.base_url}/vestibule-traffic-threshold", json=thresholds_data, headers=self.headers, verify=False)
+        return self.http.put(f"{self.base_url}/vestibule-traffic-threshold", json=thresholds_data, headers=self.headers, verify=False)
     
     # === Отчеты ===
     
@@ -138,7 +152,7 @@ class MetroAPIClient:
             "start_date": start_date,
             "end_date": end_date
         }
-        return requests.post(f"{self.base_url}/vestibule/traffic", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/vestibule/traffic", json=data, headers=self.headers, verify=False)
     
     def generate_passenger_report(self, start_date, end_date, formats=None):
         """
@@ -157,5 +171,5 @@ class MetroAPIClient:
             "end_date": end_date,
             "formats": formats
         }
-        return requests.post(f"{self.report_base_url}/v2/report/request/31", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.report_base_url}/v2/report/request/31", json=data, headers=self.headers, verify=False)
 
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Типизированные модели ответов
+
+Модели объявлены со __slots__: объект хранит только поля сущности, без словаря
+атрибутов. Списочный ответ разбирается один раз при первом обращении, а объект
+модели создается из записи только когда к ней обращаются; после этого исходный
+словарь записи освобождается.
+
+    incidents = client.get_incidents_list_typed(page=1, limit=100)
+    for incident in incidents:
+        print(incident.id, incident.name)
+"""
+
+import inspect
+from collections.abc import Sequence
+from typing import Any, Dict, Optional
+
+import requests
+
+
+class Model:
+    """
+    Базовая модель: поля из __slots__ подкласса, остальные поля записи - в extra
+
+    Отсутствующее в ответе поле имеет значение None и не попадает в to_dict.
+    """
+
+    __slots__ = ("extra",)
+    _fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls._fields + tuple(cls.__dict__.get("__slots__", ()))
+        cls._field_set = frozenset(cls._fields)
+
+    def __init__(self, **fields):
+        self.extra = None
+        for name, value in fields.items():
+            if name in self._field_set:
+                setattr(self, name, value)
+            else:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[name] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Model":
+        """Создать модель из записи ответа"""
+        return cls(**data)
+
+    def __getattr__(self, name):
+        # Вызывается только для незаполненных слотов и неизвестных имен
+        if name in self._field_set:
+            return None
+        raise AttributeError(f"{type(self).__name__} не имеет поля {name!r}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Запись в исходном виде (поля модели и extra)"""
+        data = {}
+        for name in self._fields:
+            try:
+                data[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def get(self, name: str, default=None):
+        """Значение поля модели или дополнительного поля"""
+        if name in self._field_set:
+            return getattr(self, name)
+        return (self.extra or {}).get(name, default)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+
+class Incident(Model):
+    """Инцидент"""
+
+    __slots__ = ("id", "name", "description", "type_id", "status_id", "threat_level_id", "category_id",
+                 "geometry", "registered_at", "created_at", "updated_at")
+
+    id: Optional[int]
+    name: Optional[str]
+    description: Optional[str]
+    type_id: Optional[int]
+    status_id: Optional[int]
+    threat_level_id: Optional[int]
+    category_id: Optional[int]
+    geometry: Optional[Dict[str, Any]]
+    registered_at: Optional[str]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
+
+class Dtp(Model):
+    """Дорожно-транспортное происшествие"""
+
+    __slots__ = ("id", "status", "dtp_type", "dtp_at", "address", "address_text", "lat", "lon",
+                 "description", "count_members", "count_ts", "geometry", "created_at")
+
+    id: Optional[int]
+    status: Optional[int]
+    dtp_type: Optional[int]
+    dtp_at: Optional[str]
+    address: Optional[Dict[str, Any]]
+    address_text: Optional[str]
+    lat: Optional[float]
+    lon: Optional[float]
+    description: Optional[str]
+    count_members: Optional[int]
+    count_ts: Optional[int]
+    geometry: Optional[Dict[str, Any]]
+    created_at: Optional[str]
+
+
+class Parking(Model):
+    """Парковка"""
+
+    __slots__ = ("id", "name", "address", "address_text", "contacts", "description", "location",
+                 "tariff_id", "category_id", "is_aggregating", "is_blocked", "lat", "lon", "spaces")
+
+    id: Optional[int]
+    name: Optional[str]
+    address: Optional[Dict[str, Any]]
+    address_text: Optional[str]
+    contacts: Optional[str]
+    description: Optional[str]
+    location: Optional[Dict[str, Any]]
+    tariff_id: Optional[int]
+    category_id: Optional[int]
+    is_aggregating: Optional[bool]
+    is_blocked: Optional[bool]
+    lat: Optional[float]
+    lon: Optional[float]
+    spaces: Optional[Dict[str, Any]]
+
+
+class Vestibule(Model):
+    """Вестибюль метрополитена"""
+
+    __slots__ = ("id", "name", "station_id", "lat", "lon", "geometry", "status")
+
+    id: Optional[int]
+    name: Optional[str]
+    station_id: Optional[int]
+    lat: Optional[float]
+    lon: Optional[float]
+    geometry: Optional[Dict[str, Any]]
+    status: Optional[int]
+
+
+class WaterVehicle(Model):
+    """Судно водного транспорта"""
+
+    __slots__ = ("id", "name", "short_name", "mmsi", "imo", "type")
+
+    id: Optional[int]
+    name: Optional[str]
+    short_name: Optional[str]
+    mmsi: Optional[str]
+    imo: Optional[str]
+    type: Optional[str]
+
+
+class Organization(Model):
+    """Организация"""
+
+    __slots__ = ("id", "title", "full_name", "inn", "juristic_address", "mail_address", "real_address",
+                 "phones", "emails")
+
+    id: Optional[int]
+    title: Optional[str]
+    full_name: Optional[str]
+    inn: Optional[str]
+    juristic_address: Optional[Any]
+    mail_address: Optional[Any]
+    real_address: Optional[Any]
+    phones: Optional[list]
+    emails: Optional[list]
+
+
+def _items_of(body: Dict[str, Any]):
+    """Список записей и метаданные: data или вложенный data.data (Organizations)"""
+    data = body.get("data")
+    meta = body.get("meta")
+    if isinstance(data, dict) and isinstance(data.get("data"), list):
+        meta = meta or {key: value for key, value in data.items() if key != "data"}
+        data = data["data"]
+    return data if isinstance(data, list) else [], meta
+
+
+class ModelList(Sequence):
+    """
+    Список моделей поверх ответа
+
+    Тело ответа декодируется один раз при первом обращении; модель записи
+    создается при первом обращении к ней и заменяет словарь в списке.
+    """
+
+    __slots__ = ("model", "response", "_items", "_meta")
+
+    def __init__(self, model, response: requests.Response):
+        self.model = model
+        self.response = response
+        self._items = None
+        self._meta = None
+
+    def _load(self):
+        if self._items is None:
+            self._items, self._meta = _items_of(self.response.json())
+        return self._items
+
+    @property
+    def meta(self) -> Optional[Dict[str, Any]]:
+        """Метаданные страницы (total, last_page и т.п.)"""
+        self._load()
+        return self._meta
+
+    def __len__(self):
+        return len(self._load())
+
+    def __getitem__(self, index):
+        items = self._load()
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(items)))]
+        item = items[index]
+        if not isinstance(item, Model):
+            item = items[index] = self.model.from_dict(item)
+        return item
+
+    def __repr__(self):
+        return f"ModelList({self.model.__name__}, {len(self)} items)"
+
+
+def parse_list(response: requests.Response, model) -> ModelList:
+    """Списочный ответ как ModelList (ошибка HTTP - requests.HTTPError)"""
+    response.raise_for_status()
+    return ModelList(model, response)
+
+
+def parse_one(response: requests.Response, model) -> Model:
+    """Ответ с одной записью в data как модель (ошибка HTTP - requests.HTTPError)"""
+    response.raise_for_status()
+    body = response.json()
+    data = body.get("data", body) if isinstance(body, dict) else body
+    return model.from_dict(data)
+
+
+def typed(result, parse, model):
+    """
+    Применить parse к ответу метода клиента
+
+    Для асинхронного клиента метод возвращает корутину - разбор выполняется после await.
+    """
+    if not inspect.isawaitable(result):
+        return parse(result, model)
+
+    async def wrapper():
+        return parse(await result, model)
+    return wrapper()
@@ -4,36 +4,32 @@ API клиент для Organizations (Организации)
 """
 
 import requests
-from typing import Dict, Any, Optional, List
-import os
+from typing import Dict, Any, Iterator, Optional, List
 import urllib3
 
+from .auth import get_token_provider
+from .models import ModelList, Organization, parse_list, typed
+from .pagination import iter_records
+from .transport import bind_transport
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
 class OrganizationsAPIClient:
     """API клиент для работы с Организациями"""
     
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = bind_transport(self, transport)
         self.base_url = "http://91.227.17.139/services/organization"
         self.token = self._get_token()
         self.headers = self._get_headers()
+        get_token_provider().subscribe(self)
     
     def _get_token(self) -> str:
-        """Получает токен из .env файла"""
-        token = None
-        env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
-        
-        if os.path.exists(env_path):
-            with open(env_path, 'r') as f:
-                for line in f:
-                    if line.startswith('EPUTS_TOKEN=') or line.startswith('API_TOKEN='):
-                        token = line.split('=', 1)[1].strip()
-                        break
-        
+        """Получает токен из общего источника токена"""
+        token = get_token_provider().get_token()
         if not token:
             raise ValueError("Токен не найден! Запустите refresh_token.py")
-        
         return token
     
     def _get_headers(self) -> Dict[str, str]:
@@ -48,7 +44,8 @@ class OrganizationsAPIClient:
     def check_token(self) -> bool:
         """Проверяет валидность токена"""
         try:
-            response = self.organization_list(page=1, limit=1)
+            response = self.http.get(f"{self.base_url}/api/organization", params={"page": 1, "limit": 1},
+                                     headers=self.headers, verify=False, timeout=30, auth_retry=False)
             return response.status_code == 200
         except Exception:
             return False
@@ -59,7 +56,15 @@ class OrganizationsAPIClient:
         """Получение списка организаций"""
         url = f"{self.base_url}/api/organization"
         params = {"page": page, "limit": limit}
-        return requests.get(url, params=params, headers=self.headers, verify=False, timeout=30)
+        return self.http.get(url, params=params, headers=self.headers, verify=False, timeout=30)
+    
+    def organization_list_typed(self, page: int = 1, limit: int = 25) -> ModelList:
+        """Получение списка организаций как ModelList[Organization]"""
+        return typed(self.organization_list(page=page, limit=limit), parse_list, Organization)
+    
+    def iter_organization_list(self, limit: int = 25, prefetch: bool = False) -> Iterator[Dict[str, Any]]:
+        """Обход всех организаций постранично (prefetch - загрузка следующей страницы в фоне)"""
+        return iter_records(lambda page: self.organization_list(page=page, limit=limit), limit, prefetch=prefetch)
     
     def organization_create(self, title: str, full_name: str, inn: str,
                            juristic_address: Dict[str, str],
@@ -79,23 +84,23 @@ class OrganizationsAPIClient:
             "phones": phones or [],
             "emails": emails or []
         }
-        return requests.post(url, json=payload, headers=self.headers, verify=False, timeout=30)
+        return self.http.post(url, json=payload, headers=self.headers, verify=False, timeout=30)
     
     def organization_update(self, org_id: int, **fields) -> requests.Response:
         """Обновление организации"""
         url = f"{self.base_url}/api/organization/{org_id}"
-        return requests.put(url, json=fields, headers=self.headers, verify=False, timeout=30)
+        return self.http.put(url, json=fields, headers=self.headers, verify=False, timeout=30)
     
     def organization_delete(self, org_id: int) -> requests.Response:
         """Удаление организации"""
         url = f"{self.base_url}/api/organization/{org_id}"
-        return requests.delete(url, headers=self.headers, verify=False, timeout=30)
+        return self.http.delete(url, headers=self.headers, verify=False, timeout=30)
     
     def organization_add_attachments(self, org_id: int, attachments: List[Dict[str, Any]]) -> requests.Response:
         """Добавление документов к организации"""
         url = f"{self.base_url}/api/organization/{org_id}"
         payload = {"attachments": attachments}
-        return requests.put(url, json=payload, headers=self.headers, verify=False, timeout=30)
+        return self.http.put(url, json=payload, headers=self.headers, verify=False, timeout=30)
     
     # ===== Roles =====
     
@@ -103,24 +108,24 @@ class OrganizationsAPIClient:
         """Получение списка ролей организаций"""
         url = f"{self.base_url}/api/role/"
         params = {"page": page, "limit": limit}
-        return requests.get(url, params=params, headers=self.headers, verify=False, timeout=30)
+        return self.http.get(url, params=params, headers=self.headers, verify=False, timeout=30)
     
     def role_create(self, name: str) -> requests.Response:
         """Создание роли"""
         url = f"{self.base_url}/api/role"
         payload = {"name": name}
-        return requests.post(url, json=payload, headers=self.headers, verify=False, timeout=30)
+        return self.http.post(url, json=payload, headers=self.headers, verify=False, timeout=30)
     
     def role_update(self, role_id: int, name: str) -> requests.Response:
         """Обновление роли"""
         url = f"{self.base_url}/api/role/{role_id}"
         payload = {"name": name}
-        return requests.put(url, json=payload, headers=self.headers, verify=False, timeout=30)
+        return self.http.put(url, json=payload, headers=self.headers, verify=False, timeout=30)
     
     def role_delete(self, role_id: int) -> requests.Response:
         """Удаление роли"""
         url = f"{self.base_url}/api/role/{role_id}"
-        return requests.delete(url, headers=self.headers, verify=False, timeout=30)
+        return self.http.delete(url, headers=self.headers, verify=False, timeout=30)
     
     # ===== Role Contracts =====
     
@@ -128,11 +133,11 @@ class OrganizationsAPIClient:
         """Добавление роли и договора к организации"""
         url = f"{self.base_url}/api/role/contracts/upload"
         payload = {"role_contracts": role_contracts}
-        return requests.post(url, json=payload, headers=self.headers, verify=False, timeout=30)
+        return self.http.post(url, json=payload, headers=self.headers, verify=False, timeout=30)
     
     def role_contracts_delete_by_organization(self, organization_id: int) -> requests.Response:
         """Удаление ролей и договоров по ID организации"""
         url = f"{self.base_url}/api/role/contracts/by_organization"
         params = {"organization_id": organization_id}
-        return requests.delete(url, params=params, headers=self.headers, verify=False, timeout=30)
+        return self.http.delete(url, params=params, headers=self.headers, verify=False, timeout=30)
 
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Постраничный обход списочных эндпоинтов
+Генераторы лениво запрашивают страницы и отдают записи по одной,
+fetch_all_pages выгружает все страницы параллельно
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from .ratelimit import TokenBucket
+
+
+def last_page_of(body: Dict[str, Any], limit: int) -> Optional[int]:
+    """
+    Номер последней страницы по метаданным ответа
+
+    Понимает last_page и total (в meta или в корне ответа).
+    Returns:
+        int или None, если в ответе нет сведений о количестве записей
+    """
+    meta = body.get("meta") if isinstance(body.get("meta"), dict) else {}
+    last_page = meta.get("last_page", body.get("last_page"))
+    if last_page is not None:
+        return int(last_page)
+    total = meta.get("total", body.get("total"))
+    if total is not None and limit:
+        return max((int(total) + limit - 1) // limit, 1)
+    return None
+
+
+def total_of(body: Dict[str, Any]) -> Optional[int]:
+    """Общее количество записей из метаданных ответа"""
+    meta = body.get("meta") if isinstance(body.get("meta"), dict) else {}
+    total = meta.get("total", body.get("total"))
+    return int(total) if total is not None else None
+
+
+def page_of(body: Dict[str, Any], items_key: str = "data") -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Записи страницы и тело с метаданными
+
+    Записи берутся из поля items_key; если в нем объект со списком items_key
+    (Organizations: {"data": {"data": [...], "last_page": ..., "total": ...}}),
+    записи и метаданные берутся из этого объекта.
+    """
+    items = body.get(items_key)
+    if isinstance(items, dict) and isinstance(items.get(items_key), list):
+        return items[items_key], items
+    return items if isinstance(items, list) else [], body
+
+
+def _is_last(body: Dict[str, Any], items: List[Any], page: int, limit: int) -> bool:
+    last_page = last_page_of(body, limit)
+    if last_page is not None:
+        return page >= last_page
+    return len(items) < limit
+
+
+def iter_pages(fetch_page: Callable[[int], requests.Response], limit: int, start_page: int = 1,
+               prefetch: bool = False, items_key: str = "data") -> Iterator[List[Any]]:
+    """
+    Обойти страницы списка
+
+    Args:
+        fetch_page: функция page -> Response (например, lambda page: client.get_parking_list(page, limit))
+        limit: размер страницы, переданный в fetch_page
+        start_page: номер первой страницы
+        prefetch: запрашивать следующую страницу в фоне, пока обрабатывается текущая
+        items_key: поле ответа со списком записей (в том числе вложенное, см. page_of)
+
+    Следующая страница запрашивается только когда текущая не последняя; при prefetch
+    вперед загружается не больше одной страницы, а при остановке обхода ожидающий
+    запрос отменяется.
+    """
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    pending = None
+    page = start_page
+    try:
+        while True:
+            if pending is not None:
+                response, pending = pending.result(), None
+            else:
+                response = fetch_page(page)
+            response.raise_for_status()
+            items, body = page_of(response.json(), items_key)
+            last = not items or _is_last(body, items, page, limit)
+
+            if executor is not None and not last:
+                pending = executor.submit(fetch_page, page + 1)
+
+            yield items
+            if last:
+                return
+            page += 1
+    finally:
+        if pending is not None:
+            pending.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def iter_records(fetch_page: Callable[[int], requests.Response], limit: int, start_page: int = 1,
+                 prefetch: bool = False, items_key: str = "data") -> Iterator[Any]:
+    """Обойти все страницы и отдавать записи по одной (аргументы как у iter_pages)"""
+    pages = iter_pages(fetch_page, limit, start_page=start_page, prefetch=prefetch, items_key=items_key)
+    try:
+        for items in pages:
+            yield from items
+    finally:
+        pages.close()
+
+
+class BulkFetchResult:
+    """Результат параллельной выгрузки: записи в порядке страниц и пропускная способность"""
+
+    def __init__(self, records: List[Any], pages: int, elapsed: float):
+        self.records = records
+        self.pages = pages
+        self.elapsed = elapsed
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return len(self.records) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        """Строка с итогами выгрузки"""
+        return (
+            f"Выгружено {len(self.records)} записей, {self.pages} страниц за {self.elapsed:.2f} с "
+            f"({self.pages_per_second:.1f} стр/с, {self.records_per_second:.1f} записей/с)"
+        )
+
+
+def _pages_until_short(executor, load, limit: int, workers: int, items_key: str) -> List[list]:
+    """
+    Страницы 2, 3, ... до первой неполной: не больше workers запросов одновременно
+
+    После неполной страницы новые запросы не отправляются, еще не начатые
+    запросы следующих страниц отменяются, их ответы не учитываются.
+    """
+    pending = {}
+    results = {}
+    last = None
+    next_page = 2
+    try:
+        while True:
+            while last is None and len(pending) < workers:
+                pending[executor.submit(load, next_page)] = next_page
+                next_page += 1
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = pending.pop(future)
+                items, _ = page_of(future.result(), items_key)
+                results[page] = items
+                if len(items) < limit and (last is None or page < last):
+                    last = page
+            if last is not None:
+                for future in [future for future, page in pending.items() if page > last]:
+                    future.cancel()
+                    del pending[future]
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+    return [results[page] for page in range(2, last + 1)]
+
+
+def fetch_all_pages(fetch_page: Callable[[int], requests.Response], limit: int, workers: int = 4,
+                    rate: Optional[float] = None, items_key: str = "data") -> BulkFetchResult:
+    """
+    Выгрузить все страницы параллельно
+
+    Первая страница запрашивается отдельно: из нее берется количество страниц, остальные
+    загружаются пулом из workers потоков. Если ответ не содержит meta.last_page/total,
+    страницы запрашиваются по порядку, не больше workers одновременно, до первой
+    неполной (или пустой): после нее новые страницы не запрашиваются.
+
+    Args:
+        fetch_page: функция page -> Response
+        limit: размер страницы, переданный в fetch_page
+        workers: количество одновременных запросов
+        rate: ограничение запросов в секунду (None - без ограничения)
+        items_key: поле ответа со списком записей
+    """
+    cap = TokenBucket(rate, burst=1) if rate else None
+
+    def load(page):
+        if cap is not None:
+            wait = cap.reserve()
+            if wait > 0:
+                time.sleep(wait)
+        response = fetch_page(page)
+        response.raise_for_status()
+        return response.json()
+
+    started = time.perf_counter()
+    items, first = page_of(load(1), items_key)
+    pages = [items]
+    last_page = last_page_of(first, limit)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if last_page is not None:
+            for body in executor.map(load, range(2, last_page + 1)):
+                pages.append(page_of(body, items_key)[0])
+        elif len(pages[0]) >= limit:
+            pages.extend(_pages_until_short(executor, load, limit, workers, items_key))
+
+    records = [record for items in pages for record in items]
+    return BulkFetchResult(records, len(pages), time.perf_counter() - started)
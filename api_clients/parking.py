@@ -4,28 +4,28 @@ API клиент для раздела Парковочное пространс
 """
 
 import requests
-import os
 import random
 
+from .auth import get_token_provider
+from .bulk import DEFAULT_BULK_WORKERS, bulk_create, bulk_delete, bulk_update
+from .models import Parking, parse_list, typed
+from .pagination import iter_records
+from .transport import bind_transport
+
 
 class ParkingAPIClient:
     """API клиент для работы с парковками"""
     
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = bind_transport(self, transport)
         self.base_url = "http://91.227.17.139/services/parking/api"
         self.token = self._get_token()
         self.headers = self._get_headers()
+        get_token_provider().subscribe(self)
     
     def _get_token(self):
         """Получить токен"""
-        try:
-            with open('.env', 'r') as f:
-                for line in f:
-                    if line.startswith('EPUTS_TOKEN='):
-                        return line.split('=', 1)[1].strip()
-        except:
-            pass
-        return None
+        return get_token_provider().get_token()
     
     def _get_headers(self):
         """Получить заголовки"""
@@ -47,12 +47,13 @@ class ParkingAPIClient:
             dict: {"valid": bool, "status_code": int, "message": str}
         """
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/parking",
                 params={"page": 1, "limit": 1},
                 headers=self.headers,
                 verify=False,
-                timeout=10
+                timeout=10,
+                auth_retry=False
             )
             
             if response.status_code == 401:
@@ -94,7 +95,25 @@ class ParkingAPIClient:
         Получить список парковок
         """
         params = {"page": page, "limit": limit}
-        return requests.get(f"{self.base_url}/parking", params=params, headers=self.headers, verify=False)
+        return self.http.get(f"{self.base_url}/parking", params=params, headers=self.headers, verify=False)
+    
+    def get_parking_list_typed(self, page=1, limit=25):
+        """
+        Получить список парковок как ModelList[Parking]
+        """
+        return typed(self.get_parking_list(page=page, limit=limit), parse_list, Parking)
+    
+    def iter_parking_list(self, limit=25, prefetch=False):
+        """
+        Обойти все парковки постранично
+        
+        Args:
+            limit: int - размер страницы
+            prefetch: bool - загружать следующую страницу в фоне
+        Yields:
+            dict - парковка
+        """
+        return iter_records(lambda page: self.get_parking_list(page=page, limit=limit), limit, prefetch=prefetch)
     
     def create_parking(self, name, address, address_text, contacts, description, lat, lon, 
                       tariff_id=23, category_id=35, is_aggregating=True, is_blocked=True,
@@ -150,7 +169,7 @@ class ParkingAPIClient:
                 "handicapped": handicapped
             }
         }
-        return requests.post(f"{self.base_url}/parking", json=data, headers=self.headers, verify=False)
+        return self.http.post(f"{self.base_url}/parking", json=data, headers=self.headers, verify=False)
     
     def update_parking(self, parking_id, **fields):
         """
@@ -160,7 +179,7 @@ class ParkingAPIClient:
             parking_id: int - ID парковки
             **fields: дополнительные поля для обновления
         """
-        return requests.put(f"{self.base_url}/parking/{parking_id}", json=fields, headers=self.headers, verify=False)
+        return self.http.put(f"{self.base_url}/parking/{parking_id}", json=fields, headers=self.headers, verify=False)
     
     def delete_parking(self, parking_id):
         """
@@ -169,7 +188,38 @@ class ParkingAPIClient:
         Args:
             parking_id: int - ID парковки
         """
-        return requests.delete(f"{self.base_url}/parking/{parking_id}", headers=self.headers, verify=False)
+        return self.http.delete(f"{self.base_url}/parking/{parking_id}", headers=self.headers, verify=False)
+    
+    def bulk_create_parking(self, payloads, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """
+        Создать парковки параллельно
+        
+        Args:
+            payloads: iterable[dict] - аргументы create_parking для каждой парковки
+            workers: int - количество одновременных запросов
+            rate: float - ограничение запросов в секунду (None - без ограничения)
+        Returns:
+            BulkResult - исход каждого элемента, ids созданных парковок, summary()
+        """
+        return bulk_create(self.create_parking, payloads, workers=workers, rate=rate)
+    
+    def bulk_update_parking(self, changes, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """
+        Обновить парковки параллельно
+        
+        Args:
+            changes: {parking_id: fields} или iterable[(parking_id, fields)]
+        """
+        return bulk_update(self.update_parking, changes, workers=workers, rate=rate)
+    
+    def bulk_delete_parking(self, parking_ids, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """
+        Удалить парковки параллельно
+        
+        Args:
+            parking_ids: iterable[int] - ID парковок
+        """
+        return bulk_delete(self.delete_parking, parking_ids, workers=workers, rate=rate)
     
     # === Вспомогательные методы ===
     
@@ -3,19 +3,25 @@
 API клиент для раздела Пассажирский транспорт
 """
 
-import os
 import requests
 
+from .auth import get_token_provider
+from .bulk import DEFAULT_BULK_WORKERS, bulk_create, bulk_delete, bulk_update
+from .pagination import fetch_all_pages, iter_records
+from .transport import bind_transport
+
 
 class PassengerTransportAPIClient:
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = bind_transport(self, transport)
         self.base_url = "http://91.227.17.139/services/transport-passenger/api"
         self.report_url = "http://91.227.17.139/services/report/api/v2/report/request"
         self.token = self._get_token()
         self.headers = self._get_headers()
+        get_token_provider().subscribe(self)
 
     def _get_token(self):
-        token = os.getenv("API_TOKEN")
+        token = get_token_provider().get_token()
         if not token:
             raise ValueError("Токен не найден! Запустите refresh_token.py")
         return token
@@ -31,7 +37,7 @@ class PassengerTransportAPIClient:
     def check_token(self):
         """Проверяет валидность токена"""
         try:
-            response = requests.get(f"{self.base_url}/station", headers=self.headers, params={"page": 1, "limit": 1}, verify=False, timeout=10)
+            response = self.http.get(f"{self.base_url}/station", headers=self.headers, params={"page": 1, "limit": 1}, verify=False, timeout=10, auth_retry=False)
             if response.status_code == 200:
                 return True
             elif response.status_code == 401:
@@ -48,20 +54,20 @@ class PassengerTransportAPIClient:
         if status_list:
             for status in status_list:
                 params[f"status_list[]"] = status
-        return requests.get(url, headers=self.headers, params=params, verify=False)
+        return self.http.get(url, headers=self.headers, params=params, verify=False)
 
     def get_trans_organizations_list(self, page=1, limit=25):
         """Получить список привязки организаций"""
         url = f"{self.base_url}/trans-organization"
         params = {"page": page, "limit": limit}
-        return requests.get(url, headers=self.headers, params=params, verify=False)
+        return self.http.get(url, headers=self.headers, params=params, verify=False)
 
     # ========== STATIONS (Остановки) ==========
     def get_stations_list(self, page=1, limit=25):
         """Получить список остановок"""
         url = f"{self.base_url}/station"
         params = {"page": page, "limit": limit}
-        return requests.get(url, headers=self.headers, params=params, verify=False)
+        return self.http.get(url, headers=self.headers, params=params, verify=False)
 
     def create_station(self, name, direction, comment, attribute, type_list, view, organization_id, check_point):
         """Создать остановку"""
@@ -76,7 +82,7 @@ class PassengerTransportAPIClient:
             "organization_id": organization_id,
             "check_point": check_point
         }
-        return requests.post(url, headers=self.headers, json=payload, verify=False)
+        return self.http.post(url, headers=self.headers, json=payload, verify=False)
 
     def update_station(self, station_id, name, direction, comment, attribute, type_list, view, organization_id, check_point):
         """Обновить остановку"""
@@ -91,19 +97,44 @@ class PassengerTransportAPIClient:
             "organization_id": organization_id,
             "check_point": check_point
         }
-        return requests.put(url, headers=self.headers, json=payload, verify=False)
+        return self.http.put(url, headers=self.headers, json=payload, verify=False)
 
     def delete_station(self, station_id):
         """Удалить остановку"""
         url = f"{self.base_url}/station/{station_id}"
-        return requests.delete(url, headers=self.headers, verify=False)
+        return self.http.delete(url, headers=self.headers, verify=False)
+
+    def bulk_create_stations(self, payloads, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Создать остановки параллельно (payloads - аргументы create_station), BulkResult"""
+        return bulk_create(self.create_station, payloads, workers=workers, rate=rate)
+
+    def bulk_update_stations(self, changes, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Обновить остановки параллельно ({station_id: аргументы update_station} или пары), BulkResult"""
+        return bulk_update(self.update_station, changes, workers=workers, rate=rate)
+
+    def bulk_delete_stations(self, station_ids, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Удалить остановки параллельно, BulkResult"""
+        return bulk_delete(self.delete_station, station_ids, workers=workers, rate=rate)
 
     # ========== VEHICLES (Транспортные средства) ==========
     def get_vehicles_list(self, page=1, limit=25):
         """Получить список ТС"""
         url = f"{self.base_url}/vehicle"
         params = {"page": page, "limit": limit}
-        return requests.get(url, headers=self.headers, params=params, verify=False)
+        return self.http.get(url, headers=self.headers, params=params, verify=False)
+
+    def iter_vehicles_list(self, limit=25, prefetch=False):
+        """Обойти все ТС постранично (prefetch - загружать следующую страницу в фоне)"""
+        return iter_records(lambda page: self.get_vehicles_list(page=page, limit=limit), limit, prefetch=prefetch)
+
+    def fetch_all_vehicles(self, limit=100, workers=4, rate=None):
+        """Выгрузить все ТС параллельными запросами страниц (workers потоков, rate запросов/с)"""
+        return fetch_all_pages(
+            lambda page: self.get_vehicles_list(page=page, limit=limit),
+            limit,
+            workers=workers,
+            rate=rate
+        )
 
     def create_vehicle(self, number, garage_number, model_id, category_id, class_id, characteristics, organization_id):
         """Создать ТС"""
@@ -117,7 +148,7 @@ class PassengerTransportAPIClient:
             "characteristics": characteristics,
             "organization_id": organization_id
         }
-        return requests.post(url, headers=self.headers, json=payload, verify=False)
+        return self.http.post(url, headers=self.headers, json=payload, verify=False)
 
     def update_vehicle(self, vehicle_id, number, garage_number, model_id, category_id, class_id, characteristics, organization_id):
         """Обновить ТС"""
@@ -131,23 +162,35 @@ class PassengerTransportAPIClient:
             "characteristics": characteristics,
             "organization_id": organization_id
         }
-        return requests.put(url, headers=self.headers, json=payload, verify=False)
+        return self.http.put(url, headers=self.headers, json=payload, verify=False)
 
     def delete_vehicle(self, vehicle_id):
         """Удалить ТС"""
         url = f"{self.base_url}/vehicle/{vehicle_id}"
-        return requests.delete(url, headers=self.headers, verify=False)
+        return self.http.delete(url, headers=self.headers, verify=False)
+
+    def bulk_create_vehicles(self, payloads, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Создать ТС параллельно (payloads - аргументы create_vehicle), BulkResult"""
+        return bulk_create(self.create_vehicle, payloads, workers=workers, rate=rate)
+
+    def bulk_update_vehicles(self, changes, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Обновить ТС параллельно ({vehicle_id: аргументы update_vehicle} или пары), BulkResult"""
+        return bulk_update(self.update_vehicle, changes, workers=workers, rate=rate)
+
+    def bulk_delete_vehicles(self, vehicle_ids, workers=DEFAULT_BULK_WORKERS, rate=None):
+        """Удалить ТС параллельно, BulkResult"""
+        return bulk_delete(self.delete_vehicle, vehicle_ids, workers=workers, rate=rate)
 
     def get_vehicle_card(self, vehicle_id):
         """Получить учетную карточку ТС"""
         url = f"{self.base_url}/vehicle/{vehicle_id}/card"
-        return requests.get(url, headers=self.headers, verify=False)
+        return self.http.get(url, headers=self.headers, verify=False)
 
     def get_vehicle_history(self, vehicle_id, date_start, date_end):
         """Получить историю перемещений ТС"""
         url = f"{self.base_url}/vehicle/history/{vehicle_id}"
         params = {"date_start": date_start, "date_end": date_end}
-        return requests.get(url, headers=self.headers, params=params, verify=False)
+        return self.http.get(url, headers=self.headers, params=params, verify=False)
 
     def generate_vehicle_report(self, vehicle_id, start_date, end_date, formats):
         """Сгенерировать отчет по ТС"""
@@ -158,14 +201,14 @@ class PassengerTransportAPIClient:
             "end_date": end_date,
             "formats": formats
         }
-        return requests.post(url, headers=self.headers, json=payload, verify=False)
+        return self.http.post(url, headers=self.headers, json=payload, verify=False)
 
     # ========== BRANDS (Марки) ==========
     def get_brands_list(self, page=1, limit=25):
         """Получить список марок"""
         url = f"{self.base_url}/brand"
         params = {"page": page, "limit": limit}
-        return requests.get(url, headers=self.headers, params=params, verify=False)
+        return self.http.get(url, headers=self.headers, params=params, verify=False)
 
     def create_brand(self, name_ru, name_en, slug, category_id):
         """Создать марку"""
@@ -176,7 +219,7 @@ class PassengerTransportAPIClient:
             "slug": slug,
             "category_id": category_id
         }
-        return requests.post(url, headers=self.headers, json=payload, verify=False)
+        return self.http.post(url, headers=self.headers, json=payload, verify=False)
 
     def update_brand(self, brand_id, name_ru, name_en, slug, category_id):
         """Обновить марку"""
@@ -187,19 +230,19 @@ class PassengerTransportAPIClient:
             "slug": slug,
             "category_id": category_id
         }
-        return requests.put(url, headers=self.headers, json=payload, verify=False)
+        return self.http.put(url, headers=self.headers, json=payload, verify=False)
 
     def delete_brand(self, brand_id):
         """Удалить марку"""
         url = f"{self.base_url}/brand/{brand_id}"
-        return requests.delete(url, headers=self.headers, verify=False)
+        return self.http.delete(url, headers=self.headers, verify=False)
 
     # ========== MODELS (Модели) ==========
     def get_models_list(self, page=1, limit=25):
         """Получить список моделей"""
         url = f"{self.base_url}/model"
         params = {"page": page, "limit": limit}
-        return requests.get(url, headers=self.headers, params=params, verify=False)
+        return self.http.get(url, headers=self.headers, params=params, verify=False)
 
     def create_model(self, brand_id, name_ru, name_en, slug):
         """Создать модель"""
@@ -210,7 +253,7 @@ class PassengerTransportAPIClient:
             "name_en": name_en,
             "slug": slug
         }
-        return requests.post(url, headers=self.headers, json=payload, verify=False)
+        return self.http.post(url, headers=self.headers, json=payload, verify=False)
 
     def update_model(self, model_id, brand_id, name_ru, name_en, slug):
         """Обновить модель"""
@@ -221,11 +264,11 @@ class PassengerTransportAPIClient:
             "name_en": name_en,
             "slug": slug
         }
-        return requests.put(url, headers=self.headers, json=payload, verify=False)
+        return self.http.put(url, headers=self.headers, json=payload, verify=False)
 
     def delete_model(self, model_id):
         """Удалить модель"""
         url = f"{self.base_url}/model/{model_id}"
-        return requests.delete(url, headers=self.headers, verify=False)
+        return self.http.delete(url, headers=self.headers, verify=False)
 
 
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Политика запросов: таймауты и повторы с экспоненциальной задержкой
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class RequestPolicy:
+    """
+    Таймауты и повторы для клиента или отдельного эндпоинта
+
+    Args:
+        connect_timeout: таймаут установки соединения, с
+        read_timeout: таймаут ожидания ответа, с
+        retries: количество повторов после первой попытки
+        backoff_factor: базовая задержка, с (попытка n ждет backoff_factor * 2**n)
+        backoff_max: максимальная задержка между попытками, с
+        jitter: случайная задержка в диапазоне [0, backoff] вместо фиксированной
+        retry_statuses: коды ответа, после которых запрос повторяется
+        retry_methods: методы, которые можно повторять (списочные POST можно добавить явно)
+        respect_retry_after: ждать столько, сколько указано в Retry-After
+        retry_after_max: не повторять, если Retry-After больше этого значения, с
+    """
+
+    def __init__(self, connect_timeout: float = 5.0, read_timeout: float = 60.0, retries: int = 2,
+                 backoff_factor: float = 0.5, backoff_max: float = 10.0, jitter: bool = True,
+                 retry_statuses: Iterable[int] = RETRY_STATUSES,
+                 retry_methods: Iterable[str] = IDEMPOTENT_METHODS,
+                 respect_retry_after: bool = True, retry_after_max: float = 60.0):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+        self.respect_retry_after = respect_retry_after
+        self.retry_after_max = retry_after_max
+
+    @property
+    def timeout(self):
+        """Таймаут в формате requests: (connect, read)"""
+        return (self.connect_timeout, self.read_timeout)
+
+    def copy(self, **overrides) -> "RequestPolicy":
+        """Копия политики с измененными параметрами"""
+        policy = RequestPolicy.__new__(RequestPolicy)
+        policy.__dict__.update(self.__dict__)
+        for name, value in overrides.items():
+            if not hasattr(policy, name):
+                raise TypeError(f"Неизвестный параметр политики: {name}")
+            if name == "retry_statuses":
+                value = frozenset(value)
+            elif name == "retry_methods":
+                value = frozenset(m.upper() for m in value)
+            setattr(policy, name, value)
+        return policy
+
+    def backoff(self, attempt: int) -> float:
+        """Задержка перед повтором номер attempt (с нуля)"""
+        delay = min(self.backoff_factor * (2 ** attempt), self.backoff_max)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def should_retry_error(self, method: str, attempt: int, connect_failed: bool) -> bool:
+        """
+        Повторять ли запрос после сетевой ошибки
+
+        Неудачное соединение повторяется для любого метода (запрос не был отправлен),
+        остальные ошибки - только для retry_methods.
+        """
+        if attempt >= self.retries:
+            return False
+        return connect_failed or method.upper() in self.retry_methods
+
+    def retry_delay(self, method: str, status_code: int, headers, attempt: int) -> Optional[float]:
+        """
+        Задержка перед повтором после ответа с кодом status_code
+
+        Returns:
+            float: сколько ждать перед повтором или None, если повторять не нужно
+        """
+        if attempt >= self.retries or status_code not in self.retry_statuses:
+            return None
+        if method.upper() not in self.retry_methods:
+            return None
+        if self.respect_retry_after:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.retry_after_max else None
+        return self.backoff(attempt)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Разобрать Retry-After: число секунд или HTTP-дата"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+DEFAULT_POLICY = RequestPolicy()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Ограничение частоты запросов на стороне клиента (token bucket)
+Общий для потоков и asyncio задач, настраивается по префиксу сервиса
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    Корзина токенов: rate запросов в секунду, всплеск до burst запросов
+
+    Резервирование не блокирует: токен забирается сразу (баланс может уйти в минус),
+    а вызывающий ждет возвращенное время. Поэтому одна корзина подходит и для
+    потоков (time.sleep), и для asyncio (asyncio.sleep).
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self) -> float:
+        """Забрать токен и вернуть, сколько секунд ждать перед запросом"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.requests += 1
+            if wait > 0:
+                self.delayed += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def stats(self) -> Dict[str, float]:
+        """Метрики ожидания"""
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "requests": self.requests,
+                "delayed": self.delayed,
+                "total_wait": self.total_wait,
+                "max_wait": self.max_wait,
+                "avg_wait": self.total_wait / self.requests if self.requests else 0.0,
+            }
+
+
+class RateLimiter:
+    """
+    Набор корзин по префиксам пути URL
+
+    Запрос резервирует токен во всех корзинах, префикс которых совпадает с его путем
+    по границе сегмента (/services/dtp - это /services/dtp и /services/dtp/..., но не
+    /services/dtp-archive), и ждет самую долгую из них. Префикс "/" ограничивает весь
+    хост. Без host корзина общая для всех хостов; с host (имя или имя:порт) - только
+    для запросов к нему:
+
+        limiter = RateLimiter()
+        limiter.set_limit("/", rate=50)
+        limiter.set_limit("/services/dtp", rate=10, burst=20)
+        limiter.set_limit("/services/dtp", rate=2, host="stage.example.com")
+        get_transport().rate_limiter = limiter
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[Optional[str], str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def set_limit(self, prefix: str, rate: float, burst: Optional[float] = None, host: Optional[str] = None):
+        """Задать ограничение для префикса пути (host - только для этого хоста)"""
+        with self._lock:
+            self._buckets[(_host_key(host), prefix)] = TokenBucket(rate, burst)
+
+    def remove_limit(self, prefix: str, host: Optional[str] = None):
+        """Снять ограничение префикса"""
+        with self._lock:
+            self._buckets.pop((_host_key(host), prefix), None)
+
+    def reserve(self, url: str) -> float:
+        """Зарезервировать запрос к url и вернуть время ожидания, с"""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        hosts = {None, (parts.hostname or "").lower(), parts.netloc.lower()}
+        with self._lock:
+            buckets = [bucket for (host, prefix), bucket in self._buckets.items()
+                       if host in hosts and _path_matches(path, prefix)]
+        return max((bucket.reserve() for bucket in buckets), default=0.0)
+
+    def acquire(self, url: str) -> float:
+        """Дождаться разрешения на запрос (потоки)"""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """Дождаться разрешения на запрос (asyncio)"""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Метрики ожидания по префиксам (корзины хоста - с ключом host + префикс)"""
+        with self._lock:
+            items = list(self._buckets.items())
+        return {(host or "") + prefix: bucket.stats() for (host, prefix), bucket in items}
+
+
+def _host_key(host: Optional[str]) -> Optional[str]:
+    return host.lower() if host else None
+
+
+def _path_matches(path: str, prefix: str) -> bool:
+    """Путь совпадает с префиксом по границе сегмента"""
+    return path == prefix or path.startswith(prefix.rstrip("/") + "/")
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Потоковый разбор больших списочных ответов
+
+Тело читается порциями, и каждый элемент массива верхнего уровня (по умолчанию
+"data") отдается сразу после того, как он полностью получен. В памяти держится
+только текущий элемент и непрочитанный остаток порции.
+
+    for vestibule in client.stream_vestibules_on_page(limit=500):
+        ...
+    for kind, item in client.stream_graph(geometry):   # kind: "nodes" или "edges"
+        ...
+"""
+
+import inspect
+import json
+import re
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Optional, Tuple
+
+from .codec import JSONCodec, STDLIB_CODEC
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = b" \t\r\n"
+_STRUCT = re.compile(rb'["\[\]{}]')
+_STRING = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb'[,\]}\s]')
+
+# Порог, после которого прочитанная часть буфера отбрасывается
+_COMPACT_AT = 64 * 1024
+
+
+class JSONArrayStream:
+    """
+    Инкрементальный разбор объекта верхнего уровня с массивами в полях keys
+
+    feed(chunk) возвращает элементы, завершенные этой порцией, в виде (ключ, элемент).
+    Значения остальных полей пропускаются без накопления в памяти.
+
+    Args:
+        keys: поля верхнего уровня, элементы массивов которых нужно отдавать
+        codec: кодек для разбора элементов (по умолчанию стандартный json)
+    """
+
+    def __init__(self, keys: Iterable[str] = ("data",), codec: Optional[JSONCodec] = None):
+        self.keys = frozenset(keys)
+        self.codec = codec or STDLIB_CODEC
+        self._buf = bytearray()
+        self._pos = 0
+        self._state = "start"
+        self._key = None
+        self._scan = None
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, Any]]:
+        """Добавить порцию тела и получить завершенные элементы"""
+        if self._pos >= _COMPACT_AT:
+            self._compact()
+        self._buf += chunk
+        items = []
+        self._parse(items, final=False)
+        return items
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """
+        Завершить разбор
+
+        Raises:
+            ValueError: тело оборвано или не является JSON объектом
+        """
+        items = []
+        self._parse(items, final=True)
+        if self._state != "done":
+            raise ValueError(f"Неполный JSON ответ (состояние разбора: {self._state})")
+        return items
+
+    def _compact(self):
+        cut = self._pos
+        del self._buf[:cut]
+        self._pos = 0
+        if self._scan is not None:
+            self._scan[0] -= cut
+            self._scan[1] -= cut
+
+    def _skip_ws(self) -> Optional[int]:
+        buf = self._buf
+        pos = self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _error(self, expected: str):
+        got = chr(self._buf[self._pos]) if self._pos < len(self._buf) else "конец"
+        raise ValueError(f"Ошибка разбора JSON: ожидалось {expected}, получено {got!r} (позиция {self._pos})")
+
+    def _parse(self, items, final: bool):
+        while True:
+            state = self._state
+            if state == "done":
+                return
+            if self._scan is None:
+                char = self._skip_ws()
+                if char is None:
+                    return
+            else:
+                char = None
+
+            if state == "start":
+                if char != ord("{"):
+                    self._error("{")
+                self._pos += 1
+                self._state = "key"
+            elif state == "key":
+                if self._scan is None:
+                    if char == ord("}"):
+                        self._pos += 1
+                        self._state = "done"
+                        continue
+                    if char != ord('"'):
+                        self._error("ключ")
+                    self._start_scan(keep=True)
+                value = self._scan_value(final)
+                if value is None:
+                    return
+                self._key = json.loads(value)
+                self._state = "colon"
+            elif state == "colon":
+                if char != ord(":"):
+                    self._error(":")
+                self._pos += 1
+                self._state = "value"
+            elif state == "value":
+                if self._scan is None and char == ord("[") and self._key in self.keys:
+                    self._pos += 1
+                    self._state = "item"
+                    continue
+                if self._scan is None:
+                    self._start_scan(keep=False)
+                if self._scan_value(final) is None:
+                    return
+                self._state = "member"
+            elif state == "item":
+                if self._scan is None:
+                    if char == ord("]"):
+                        self._pos += 1
+                        self._state = "member"
+                        continue
+                    self._start_scan(keep=True)
+                value = self._scan_value(final)
+                if value is None:
+                    return
+                items.append((self._key, self.codec.loads(value)))
+                self._state = "item_sep"
+            elif state == "item_sep":
+                if char == ord(","):
+                    self._pos += 1
+                    self._state = "item"
+                elif char == ord("]"):
+                    self._pos += 1
+                    self._state = "member"
+                else:
+                    self._error(", или ]")
+            elif state == "member":
+                if char == ord(","):
+                    self._pos += 1
+                    self._state = "key"
+                elif char == ord("}"):
+                    self._pos += 1
+                    self._state = "done"
+                else:
+                    self._error(", или }")
+
+    def _start_scan(self, keep: bool):
+        # [начало, позиция сканирования, глубина, внутри строки, вид значения, сохранять байты]
+        start = self._pos
+        first = self._buf[start]
+        if first == ord('"'):
+            self._scan = [start, start + 1, 0, True, "string", keep]
+        elif first in b"[{":
+            self._scan = [start, start + 1, 1, False, "container", keep]
+        else:
+            self._scan = [start, start, 0, False, "scalar", keep]
+
+    def _scan_value(self, final: bool) -> Optional[bytes]:
+        """
+        Продолжить сканирование значения
+
+        Returns:
+            bytes: значение целиком (b"" для пропускаемых) или None, если нужны еще данные
+        """
+        buf = self._buf
+        scan = self._scan
+        start, i, depth, in_string, kind, keep = scan
+        end = None
+        if kind == "scalar":
+            match = _SCALAR_END.search(buf, i)
+            if match is not None:
+                end = match.start()
+            elif final:
+                end = len(buf)
+            else:
+                i = len(buf)
+        else:
+            while True:
+                if in_string:
+                    match = _STRING.search(buf, i)
+                    if match is None:
+                        i = len(buf)
+                        break
+                    if buf[match.start()] == ord("\\"):
+                        if match.end() >= len(buf):
+                            i = match.start()
+                            break
+                        i = match.end() + 1
+                        continue
+                    in_string = False
+                    i = match.end()
+                    if depth == 0:
+                        end = i
+                        break
+                else:
+                    match = _STRUCT.search(buf, i)
+                    if match is None:
+                        i = len(buf)
+                        break
+                    char = buf[match.start()]
+                    i = match.end()
+                    if char == ord('"'):
+                        in_string = True
+                    elif char in b"[{":
+                        depth += 1
+                    else:
+                        depth -= 1
+                        if depth == 0:
+                            end = i
+                            break
+
+        if end is None:
+            if not keep:
+                # Пропускаемое значение не накапливается: прочитанное можно отбросить
+                start = self._pos = i
+            scan[:] = [start, i, depth, in_string, kind, keep]
+            return None
+        self._scan = None
+        self._pos = end
+        return bytes(buf[start:end]) if keep else b""
+
+
+def iter_json_items(chunks: Iterable[bytes], keys: Iterable[str] = ("data",),
+                    codec: Optional[JSONCodec] = None) -> Iterator[Tuple[str, Any]]:
+    """Элементы массивов keys из тела, заданного порциями байт: (ключ, элемент)"""
+    parser = JSONArrayStream(keys, codec)
+    for chunk in chunks:
+        if chunk:
+            yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def iter_response_items(response, keys: Iterable[str] = ("data",), codec: Optional[JSONCodec] = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """Потоковый разбор ответа requests, полученного с stream=True (соединение закрывается в конце)"""
+    try:
+        response.raise_for_status()
+        yield from iter_json_items(response.iter_content(chunk_size), keys, codec)
+    finally:
+        response.close()
+
+
+async def aiter_response_items(response, keys: Iterable[str] = ("data",), codec: Optional[JSONCodec] = None,
+                               chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[Tuple[str, Any]]:
+    """Потоковый разбор ответа httpx, полученного с stream=True"""
+    parser = JSONArrayStream(keys, codec)
+    try:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes(chunk_size):
+            for item in parser.feed(chunk):
+                yield item
+        for item in parser.close():
+            yield item
+    finally:
+        await response.aclose()
+
+
+def stream_items(result, keys: Iterable[str] = ("data",), codec: Optional[JSONCodec] = None,
+                 with_keys: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Итератор элементов ответа метода клиента, вызванного с stream=True
+
+    Для асинхронного клиента (результат - корутина) возвращается асинхронный итератор.
+    with_keys=False отдает только элементы, True - пары (ключ, элемент).
+    """
+    if not inspect.isawaitable(result):
+        items = iter_response_items(result, keys, codec, chunk_size)
+        return items if with_keys else (item for _, item in items)
+
+    async def agen():
+        response = await result
+        async for key, item in aiter_response_items(response, keys, codec, chunk_size):
+            yield (key, item) if with_keys else item
+    return agen()
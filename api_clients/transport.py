@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+Общий HTTP транспорт для всех API клиентов
+Один keep-alive пул соединений на хост вместо нового TCP соединения на каждый запрос
+"""
+
+import inspect
+import socket
+import sys
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError, NewConnectionError
+from urllib3.poolmanager import PoolManager
+
+from .auth import refreshed_auth_headers
+from .cache import ResponseCache
+from .codec import JSONCodec, encode_json_body, get_codec
+from .disk_cache import DiskCache
+from .hooks import Hooks, current_timer, get_hooks, observe
+from .policy import DEFAULT_POLICY, RequestPolicy
+from .ratelimit import RateLimiter
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+DEFAULT_POOL_SIZE = 10
+
+
+class PoolStats:
+    """Счетчики использования пула соединений одного хоста"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.checkouts = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def reused(self) -> int:
+        """Количество запросов, обслуженных уже открытым соединением"""
+        return max(self.checkouts - self.opened, 0)
+
+    def connection_opened(self):
+        with self._lock:
+            self.opened += 1
+
+    def connection_checked_out(self):
+        with self._lock:
+            self.checkouts += 1
+
+    def request_started(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            if self.in_flight > self.max_in_flight:
+                self.max_in_flight = self.in_flight
+
+    def request_finished(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Получить срез счетчиков"""
+        with self._lock:
+            return {
+                "opened": self.opened,
+                "reused": self.reused,
+                "requests": self.requests,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+            }
+
+
+class _TimedConnectionMixin:
+    """Время DNS, TCP соединения и TLS рукопожатия для наблюдаемого вызова (hooks)"""
+
+    def _new_conn(self):
+        timer = current_timer()
+        if timer is None:
+            return super()._new_conn()
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        resolved = time.perf_counter()
+        timer.dns += resolved - started
+        # Соединение по уже полученным адресам, по очереди, как create_connection
+        dns_host = self._dns_host
+        error = None
+        try:
+            for *_, address in addresses:
+                self._dns_host = address[0]
+                try:
+                    return super()._new_conn()
+                except NewConnectionError as e:
+                    error = e
+            raise error
+        finally:
+            self._dns_host = dns_host
+            timer.connect += time.perf_counter() - resolved
+
+    def connect(self):
+        timer = current_timer()
+        if timer is None:
+            return super().connect()
+        started = time.perf_counter()
+        before = timer.dns + timer.connect
+        try:
+            return super().connect()
+        finally:
+            # Остаток времени установки соединения - TLS рукопожатие (для http близок к нулю)
+            timer.tls += max(time.perf_counter() - started - (timer.dns + timer.connect - before), 0.0)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CountingPoolMixin:
+    """Учет новых и переиспользованных соединений пула urllib3"""
+
+    stats: Optional[PoolStats] = None
+
+    def _new_conn(self):
+        if self.stats is not None:
+            self.stats.connection_opened()
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        if self.stats is not None:
+            self.stats.connection_checked_out()
+        return super()._get_conn(timeout=timeout)
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _CountingPoolManager(PoolManager):
+    """PoolManager, привязывающий к каждому пулу счетчики его хоста"""
+
+    def __init__(self, stats_for_host, *args, **kwargs):
+        self._stats_for_host = stats_for_host
+        super().__init__(*args, **kwargs)
+        self.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.stats = self._stats_for_host(f"{host}:{port}")
+        return pool
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter с подсчетом соединений"""
+
+    def __init__(self, stats_for_host, **kwargs):
+        self._stats_for_host = stats_for_host
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _CountingPoolManager(
+            self._stats_for_host,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs
+        )
+
+
+class HTTPTransport:
+    """
+    Транспорт поверх одной requests.Session
+
+    Args:
+        pool_size: максимальное число keep-alive соединений на хост
+        pool_block: ждать свободное соединение вместо открытия сверх pool_size
+        auth_retry: при 401 обновить токен и повторить запрос один раз
+        policy: таймауты и повторы по умолчанию
+        rate_limiter: ограничение частоты запросов (None - без ограничения)
+        disk_cache: кэш ответов на диске с проверкой ETag/Last-Modified (None - без кэша)
+        codec: JSON кодек для json= и response.json() (None - самый быстрый из установленных)
+        hooks: обработчики событий запросов клиентов (None - общие для процесса, см. hooks.py)
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, pool_block: bool = False, auth_retry: bool = True,
+                 policy: RequestPolicy = DEFAULT_POLICY, rate_limiter: Optional[RateLimiter] = None,
+                 disk_cache: Optional[DiskCache] = None, codec: Optional[JSONCodec] = None,
+                 hooks: Optional[Hooks] = None):
+        self.pool_size = pool_size
+        self.auth_retry = auth_retry
+        self.policy = policy
+        self.rate_limiter = rate_limiter
+        self.disk_cache = disk_cache
+        self.codec = codec or get_codec()
+        self.hooks = hooks if hooks is not None else get_hooks()
+        self._stats: Dict[str, PoolStats] = {}
+        self._stats_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = _PooledAdapter(
+            self._stats_for_host,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=pool_block
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _stats_for_host(self, host: str) -> PoolStats:
+        with self._stats_lock:
+            stats = self._stats.get(host)
+            if stats is None:
+                stats = self._stats[host] = PoolStats()
+            return stats
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        return f"{parts.hostname}:{port}"
+
+    def request(self, method: str, url: str, auth_retry: Optional[bool] = None,
+                policy: Optional[RequestPolicy] = None, **kwargs) -> requests.Response:
+        """
+        Выполнить запрос через общий пул соединений
+
+        Args:
+            auth_retry: переопределить повтор после 401 для этого запроса (None - как у транспорта)
+            policy: таймауты и повторы для этого запроса (None - политика транспорта)
+        """
+        policy = policy or self.policy
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = policy.timeout
+        disk = self.disk_cache
+        if disk is None or kwargs.get("stream") or not disk.cacheable(method, url):
+            return self._request(method, url, auth_retry, policy, kwargs)
+
+        key = disk.key(method, url, kwargs)
+        entry = disk.load(key)
+        if entry is not None:
+            kwargs["headers"] = disk.conditional_headers(entry, kwargs.get("headers"))
+        response = self._request(method, url, auth_retry, policy, kwargs)
+        if response.status_code == 304 and entry is not None:
+            disk.record(hit=True)
+            return self._with_codec(self._cached_response(response, entry))
+        disk.record(hit=False)
+        if response.status_code == 200:
+            disk.store(key, url, response.headers, response.content)
+        return response
+
+    @staticmethod
+    def _cached_response(not_modified: requests.Response, entry) -> requests.Response:
+        """Ответ 200 с телом с диска вместо 304"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict({**entry["headers"], **not_modified.headers})
+        response.headers.pop("Content-Length", None)
+        response._content = entry["body"]
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.from_cache = True
+        return response
+
+    def _request(self, method, url, auth_retry, policy, kwargs) -> requests.Response:
+        codec = self.codec
+        if codec.name != "json" and kwargs.get("json") is not None:
+            encode_json_body(kwargs, codec)
+        return self._with_codec(self._request_with_retries(method, url, auth_retry, policy, kwargs))
+
+    def _with_codec(self, response: requests.Response) -> requests.Response:
+        """Декодировать response.json() кодеком транспорта"""
+        if self.codec.name != "json":
+            response.json = _decoder(response, self.codec)
+        return response
+
+    def _request_with_retries(self, method, url, auth_retry, policy, kwargs) -> requests.Response:
+        stats = self._stats_for_host(self._host_key(url))
+        stats.request_started()
+        try:
+            attempt = 0
+            while True:
+                try:
+                    response = self._send(method, url, auth_retry, kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    connect_failed = isinstance(e, requests.ConnectTimeout)
+                    if not policy.should_retry_error(method, attempt, connect_failed):
+                        raise
+                    delay = policy.backoff(attempt)
+                else:
+                    delay = policy.retry_delay(method, response.status_code, response.headers, attempt)
+                    if delay is None:
+                        return response
+                    response.close()
+                attempt += 1
+                timer = current_timer()
+                if timer is not None:
+                    timer.retry += delay
+                time.sleep(delay)
+        finally:
+            stats.request_finished()
+
+    def _send(self, method, url, auth_retry, kwargs) -> requests.Response:
+        response = self._send_once(method, url, kwargs)
+        if response.status_code == 401 and (self.auth_retry if auth_retry is None else auth_retry):
+            headers = refreshed_auth_headers(kwargs.get("headers"))
+            if headers is not None:
+                response.close()
+                kwargs["headers"] = headers
+                response = self._send_once(method, url, kwargs)
+        return response
+
+    def _send_once(self, method, url, kwargs) -> requests.Response:
+        timer = current_timer()
+        if timer is None:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            return self.session.request(method, url, **kwargs)
+
+        started = time.perf_counter()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url)
+        sending = time.perf_counter()
+        timer.queue += sending - started
+        timer.attempts += 1
+        connecting = timer.dns + timer.connect + timer.tls
+        response = self.session.request(method, url, **kwargs)
+        # response.elapsed - до получения заголовков, остальное - загрузка тела
+        headers_at = response.elapsed.total_seconds()
+        connected = timer.dns + timer.connect + timer.tls - connecting
+        timer.server += max(headers_at - connected, 0.0)
+        timer.download += max(time.perf_counter() - sending - headers_at, 0.0)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Статистика пулов по хостам
+
+        Returns:
+            dict: {"host:port": {"opened", "reused", "requests", "in_flight", "max_in_flight"}}
+        """
+        with self._stats_lock:
+            items = list(self._stats.items())
+        return {host: stats.snapshot() for host, stats in items}
+
+    def close(self):
+        """Закрыть все соединения пула"""
+        self.session.close()
+
+
+class ClientTransport:
+    """
+    Общий транспорт с настройками одного клиента
+
+    Args:
+        transport: общий транспорт (HTTPTransport или AsyncHTTPTransport)
+        client: имя клиента
+        policy: политика клиента (None - политика транспорта)
+
+    Политика эндпоинта задается фрагментом пути URL и имеет приоритет над
+    таймаутом, переданным в методе клиента:
+
+        client.http.set_policy(RequestPolicy(read_timeout=120), endpoint="/v2/get-graph")
+
+    Кэш справочников включается через enable_cache; запись (POST/PUT/DELETE)
+    через этого же клиента сбрасывает кэшированные ответы ресурса.
+    """
+
+    def __init__(self, transport, client: str, policy: Optional[RequestPolicy] = None):
+        self.transport = transport
+        self.client = client
+        self.policy = policy
+        self.endpoint_policies: Dict[str, RequestPolicy] = {}
+        self.cache: Optional[ResponseCache] = None
+
+    def set_policy(self, policy: RequestPolicy, endpoint: Optional[str] = None):
+        """Задать политику клиента или эндпоинта (фрагмент пути URL)"""
+        if endpoint is None:
+            self.policy = policy
+        else:
+            self.endpoint_policies[endpoint] = policy
+
+    def enable_cache(self, ttl: float = 300, max_entries: int = 256, endpoints=None) -> ResponseCache:
+        """Включить кэш GET ответов клиента (параметры как у ResponseCache)"""
+        self.cache = ResponseCache(ttl=ttl, max_entries=max_entries, endpoints=endpoints)
+        return self.cache
+
+    def disable_cache(self):
+        """Выключить кэш клиента"""
+        self.cache = None
+
+    def _endpoint_policy(self, url: str) -> Optional[RequestPolicy]:
+        if not self.endpoint_policies:
+            return None
+        path = urlsplit(url).path
+        matches = [endpoint for endpoint in self.endpoint_policies if endpoint in path]
+        return self.endpoint_policies[max(matches, key=len)] if matches else None
+
+    def request(self, method: str, url: str, **kwargs):
+        hooks = getattr(self.transport, "hooks", None)
+        if not hooks:
+            return self._request(method, url, kwargs)
+        return observe(hooks, self.client, _caller_name(), method.upper(), url,
+                       lambda: self._request(method, url, kwargs))
+
+    def _request(self, method: str, url: str, kwargs):
+        policy = self._endpoint_policy(url)
+        if policy is not None:
+            kwargs["timeout"] = policy.timeout
+        else:
+            policy = self.policy
+        cache = self.cache
+        if cache is None or kwargs.get("stream"):
+            return self.transport.request(method, url, policy=policy, **kwargs)
+
+        if method.upper() != "GET":
+            cache.invalidate(url)
+            return _then(self.transport.request(method, url, policy=policy, **kwargs),
+                         lambda response: cache.invalidate(url))
+        if not cache.cacheable(url):
+            return self.transport.request(method, url, policy=policy, **kwargs)
+
+        key = cache.key(url, kwargs.get("params"), kwargs.get("headers"))
+        cached = cache.get(key)
+        if cached is not None:
+            cached = _copy_response(cached, from_cache=True)
+            return _ready(cached) if self._is_async() else cached
+
+        def store(response):
+            if response.status_code == 200:
+                cache.put(key, _copy_response(response))
+        return _then(self.transport.request(method, url, policy=policy, **kwargs), store)
+
+    def _is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.transport.request)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.transport, name)
+
+
+def _caller_name() -> str:
+    """Имя метода клиента, вызвавшего транспорт (первый публичный кадр вне этого модуля)"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename != __file__ and not code.co_name.startswith(("_", "<")):
+            return code.co_name
+        frame = frame.f_back
+    return "request"
+
+
+def _decoder(response: requests.Response, codec: JSONCodec):
+    """response.json() через codec с ошибкой разбора как у requests"""
+    def decode(**kwargs):
+        try:
+            return codec.loads(response.content)
+        except ValueError as e:
+            raise requests.exceptions.JSONDecodeError(str(e), response.text, 0)
+    return decode
+
+
+def _copy_response(response, from_cache: bool = False):
+    """
+    Копия ответа для кэша в памяти: у каждого вызывающего свой объект
+
+    Тело (bytes) общее, заголовки копируются; from_cache=True - ответ отдан из кэша.
+    """
+    copied = object.__new__(type(response))
+    copied.__dict__.update(response.__dict__)
+    copied.headers = type(response.headers)(response.headers)
+    copied.from_cache = from_cache
+    return copied
+
+
+def _then(result, callback):
+    """Вызвать callback с ответом; для асинхронного транспорта - после await"""
+    if not inspect.isawaitable(result):
+        callback(result)
+        return result
+
+    async def wrapper():
+        response = await result
+        callback(response)
+        return response
+    return wrapper()
+
+
+async def _ready(response):
+    return response
+
+
+def bind_transport(client, transport=None) -> ClientTransport:
+    """Привязать клиента к транспорту (по умолчанию к общему для процесса)"""
+    if isinstance(transport, ClientTransport):
+        transport = transport.transport
+    return ClientTransport(transport or get_transport(), type(client).__name__)
+
+
+_default_transport: Optional[HTTPTransport] = None
+_default_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """Получить общий для процесса транспорт (создается при первом обращении)"""
+    global _default_transport
+    if _default_transport is None:
+        with _default_lock:
+            if _default_transport is None:
+                _default_transport = HTTPTransport()
+    return _default_transport
+
+
+def configure_transport(pool_size: int = DEFAULT_POOL_SIZE, pool_block: bool = False,
+                        rate_limiter: Optional[RateLimiter] = None) -> HTTPTransport:
+    """
+    Пересоздать общий транспорт с новыми параметрами пула
+
+    Прежний транспорт не закрывается: клиенты, созданные до вызова, продолжают
+    использовать его пул, поэтому настраивать пул нужно до создания клиентов.
+    """
+    global _default_transport
+    with _default_lock:
+        _default_transport = HTTPTransport(pool_size=pool_size, pool_block=pool_block, rate_limiter=rate_limiter)
+        return _default_transport
@@ -1,24 +1,29 @@
 """
 API клиент для работы с Водным транспортом
 """
-import os
-import requests
 from dotenv import load_dotenv
 
+from .auth import get_token_provider
+from .models import WaterVehicle, parse_list, typed
+from .pagination import iter_records
+from .transport import bind_transport
+
 load_dotenv()
 
 
 class WaterTransportAPIClient:
     """Клиент для работы с API Водного транспорта"""
 
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = bind_transport(self, transport)
         self.base_url = "http://91.227.17.139/services/transport-water/api"
         self.token = self._get_token()
         self.headers = self._get_headers()
+        get_token_provider().subscribe(self)
 
     def _get_token(self):
-        """Получение токена из .env файла"""
-        token = os.getenv("API_TOKEN")
+        """Получение токена из общего источника токена"""
+        token = get_token_provider().get_token()
         if not token:
             raise ValueError("Токен не найден! Запустите update_token.py")
         return token
@@ -35,7 +40,8 @@ class WaterTransportAPIClient:
     def check_token(self):
         """Проверка валидности токена"""
         try:
-            response = self.vehicle_list(page=1, limit=1)
+            response = self.http.post(f"{self.base_url}/vehicle/list", json={"page": 1, "limit": 1},
+                                      headers=self.headers, auth_retry=False)
             return response.status_code != 401
         except Exception:
             return False
@@ -55,7 +61,23 @@ class WaterTransportAPIClient:
             "page": page,
             "limit": limit
         }
-        return requests.post(url, json=payload, headers=self.headers)
+        return self.http.post(url, json=payload, headers=self.headers)
+
+    def vehicle_list_typed(self, page: int = 1, limit: int = 25):
+        """
+        Получение списка транспортных средств как ModelList[WaterVehicle]
+        """
+        return typed(self.vehicle_list(page=page, limit=limit), parse_list, WaterVehicle)
+
+    def iter_vehicle_list(self, limit: int = 25, prefetch: bool = False):
+        """
+        Обход всех транспортных средств постранично
+        
+        Args:
+            limit: количество элементов на странице
+            prefetch: загружать следующую страницу в фоне
+        """
+        return iter_records(lambda page: self.vehicle_list(page=page, limit=limit), limit, prefetch=prefetch)
 
     def vehicle_create(self, name: str, short_name: str, mmsi: str, imo: str, vehicle_type: str = "5"):
         """
@@ -76,7 +98,7 @@ class WaterTransportAPIClient:
             "imo": imo,
             "type": vehicle_type
         }
-        return requests.post(url, json=payload, headers=self.headers)
+        return self.http.post(url, json=payload, headers=self.headers)
 
     def vehicle_update(self, vehicle_id: int, name: str, short_name: str, mmsi: str, imo: str, vehicle_type: str = "5"):
         """
@@ -98,7 +120,7 @@ class WaterTransportAPIClient:
             "imo": imo,
             "type": vehicle_type
         }
-        return requests.put(url, json=payload, headers=self.headers)
+        return self.http.put(url, json=payload, headers=self.headers)
 
     def vehicle_delete(self, vehicle_id: int):
         """
@@ -108,5 +130,5 @@ class WaterTransportAPIClient:
             vehicle_id: ID транспортного средства
         """
         url = f"{self.base_url}/vehicle/{vehicle_id}"
-        return requests.delete(url, headers=self.headers)
+        return self.http.delete(url, headers=self.headers)
 
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк JSON кодеков: время кодирования payload и декодирования ответов по клиентам
+
+Payload берутся из методов клиентов (запрос перехватывается без отправки),
+ответы - синтетические списки записей того же размера, что отдает стенд.
+
+    python3 benchmarks/codec_benchmark.py
+    python3 benchmarks/codec_benchmark.py --number 2000 --records 500
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_clients import DataBusAPIClient, DigitalTwinAPIClient, DTPAPIClient, ParkingAPIClient  # noqa: E402
+from api_clients.auth import get_token_provider  # noqa: E402
+from api_clients.codec import STDLIB_CODEC, available_codecs  # noqa: E402
+
+
+class _Recorder:
+    """Транспорт, запоминающий json= вместо отправки запроса"""
+
+    def __init__(self):
+        self.payload = None
+
+    def request(self, method, url, **kwargs):
+        self.payload = kwargs.get("json")
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+
+def _capture(client, call):
+    recorder = _Recorder()
+    client.http = recorder
+    call(client)
+    return recorder.payload
+
+
+def _polygon(points):
+    return {
+        "type": "Polygon",
+        "coordinates": [[[30.3 + i * 0.0001, 59.9 + i * 0.0001] for i in range(points)]]
+    }
+
+
+def collect_payloads():
+    """Представительные тела запросов: {клиент.метод: payload}"""
+    address = ParkingAPIClient.generate_test_address()
+    return {
+        "ParkingAPIClient.create_parking": _capture(
+            ParkingAPIClient(),
+            lambda c: c.create_parking("Парковка", address, "Санкт-Петербург, Невский 1", "+7 812 000-00-00",
+                                       "Описание", 59.93, 30.31)
+        ),
+        "DTPAPIClient.create_dtp": _capture(
+            DTPAPIClient(),
+            lambda c: c.create_dtp(1, 2, "2025-01-01 10:00:00", address, 59.93, 30.31, "Описание",
+                                   {"type": "Point", "coordinates": [30.31, 59.93]})
+        ),
+        "DigitalTwinAPIClient.create_road_section": _capture(
+            DigitalTwinAPIClient(),
+            lambda c: c.create_road_section("Участок", "Описание", "Невский пр.", "2025-01-01", 1, 1, 1, 1200.5,
+                                            59.93, 30.31, 1, "78:00:0000000:1", address, _polygon(200),
+                                            {"lanes": 4, "surface": "асфальт"})
+        ),
+        "DataBusAPIClient.relay_egts_telemetry_create": _capture(
+            DataBusAPIClient(),
+            lambda c: c.relay_egts_telemetry_create("Ретрансляция", "10.0.0.1", 5000, list(range(50)),
+                                                    list(range(200)), 1)
+        ),
+    }
+
+
+def collect_responses(payloads, records):
+    """Тела списочных ответов: records записей на основе каждого payload"""
+    return {
+        name: STDLIB_CODEC.dumps({
+            "success": True,
+            "data": [dict(payload, id=i) for i in range(records)],
+            "meta": {"total": records, "last_page": 1},
+        })
+        for name, payload in payloads.items()
+    }
+
+
+def run(number, records):
+    get_token_provider().set_token("benchmark-token")
+    payloads = collect_payloads()
+    responses = collect_responses(payloads, records)
+    codecs = available_codecs()
+
+    print(f"Кодеки: {', '.join(codecs)}; повторов кодирования: {number}, записей в ответе: {records}")
+    header = f"{'Метод':<48}{'Кодек':<8}{'encode, мкс':>14}{'decode, мс':>14}{'ответ, КБ':>12}"
+    print(header)
+    print("-" * len(header))
+    for name, payload in payloads.items():
+        body = responses[name]
+        for codec_name, codec in codecs.items():
+            encode = timeit.timeit(lambda: codec.dumps(payload), number=number) / number * 1e6
+            decode_number = max(number // 100, 5)
+            decode = timeit.timeit(lambda: codec.loads(body), number=decode_number) / decode_number * 1e3
+            print(f"{name:<48}{codec_name:<8}{encode:>14.2f}{decode:>14.2f}{len(body) / 1024:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Микробенчмарк JSON кодеков по клиентам')
+    parser.add_argument('--number', type=int, default=1000, help='Повторов кодирования payload (по умолчанию: 1000)')
+    parser.add_argument('--records', type=int, default=500, help='Записей в синтетическом ответе (по умолчанию: 500)')
+    args = parser.parse_args()
+    run(args.number, args.records)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ MODULES = {
     'passenger_transport': 'tests/tests_passenger_transport/',
     'data_bus': 'tests/tests_data_bus/',
     'organizations': 'tests/tests_organizations/',
+    'performance': 'tests/tests_performance/',
     'all': 'tests/'
 }
 
@@ -53,9 +54,17 @@ def run_tests(module='all', verbose=True, parallel=False, allure=False, html=Fal
     # Цвет
     args.append("--color=yes")
     
+    # Тесты производительности: только по запросу и только последовательно
+    if module == 'performance':
+        args.append("--performance")
+        if parallel:
+            parallel = False
+            print("Режим: последовательный запуск (замер времени ответа без -n)")
+    
     # Параллельный запуск
     if parallel:
-        args.extend(["-n", "auto"])
+        # Группы xdist_group (CRUD сервиса) выполняются целиком на одном воркере
+        args.extend(["-n", "auto", "--dist", "loadgroup"])
         print("Режим: параллельный запуск")
     
     # Allure отчет
@@ -126,6 +135,8 @@ def main():
   - digital_twin     : Тесты цифрового двойника
   - external_transport: Тесты внешнего транспорта
   - water_transport  : Тесты водного транспорта
+  - performance      : Бюджеты времени ответа (tests/tests_performance/budgets.yaml),
+                       всегда последовательно; в all не входят (PERF_RUN=1 - включить)
   - all              : Все тесты (по умолчанию)
         """
     )
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Скрипт для нагрузочного прогона сценария вызовов API клиентов
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api_clients import configure_transport  # noqa: E402
+from api_clients.load import MODES, LoadRunner, Scenario  # noqa: E402
+
+
+def main():
+    """Главная функция с парсингом аргументов"""
+    parser = argparse.ArgumentParser(
+        description='Нагрузочный прогон сценария (взвешенный набор вызовов клиентов)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Примеры использования:
+
+  # Сценарий с параметрами из файла
+  python3 run_load.py load_scenarios/city_event.yaml
+
+  # Открытая модель: 100 запросов в секунду в течение 5 минут
+  python3 run_load.py load_scenarios/city_event.yaml --mode open --rps 100 --duration 300
+
+  # Закрытая модель: 32 пользователя, отчет в JSON
+  python3 run_load.py load_scenarios/metro_read.yaml --mode closed --concurrency 32 --json report.json
+        """
+    )
+    parser.add_argument('scenario', help='Файл сценария (YAML или JSON)')
+    parser.add_argument('--mode', choices=MODES, help='Режим нагрузки (по умолчанию из сценария)')
+    parser.add_argument('--rps', type=float, help='Частота запросов в режиме open')
+    parser.add_argument('--concurrency', '-c', type=int, help='Число пользователей / одновременных запросов')
+    parser.add_argument('--duration', '-d', type=float, help='Длительность прогона, с')
+    parser.add_argument('--interval', type=float, help='Окно отчета о пропускной способности, с')
+    parser.add_argument('--seed', type=int, help='Зерно выбора вызовов')
+    parser.add_argument('--json', help='Сохранить отчет в JSON файл')
+    args = parser.parse_args()
+
+    scenario = Scenario.load(args.scenario)
+    for option in ('mode', 'rps', 'concurrency', 'duration', 'interval'):
+        value = getattr(args, option)
+        if value is not None:
+            setattr(scenario, option, value)
+    if scenario.mode == 'open' and not scenario.rps:
+        parser.error('для режима open нужно задать --rps')
+
+    # Пул соединений не меньше числа одновременных запросов
+    configure_transport(pool_size=max(scenario.concurrency, 10))
+
+    load = f"{scenario.rps} req/s" if scenario.mode == 'open' else f"{scenario.concurrency} пользователей"
+    print("=" * 60)
+    print(f"Сценарий: {scenario.name} ({scenario.mode}, {load}, {scenario.duration:.0f} с)")
+    print("=" * 60)
+
+    report = LoadRunner(scenario, seed=args.seed).run()
+    print(report.format())
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"Отчет сохранен: {args.json}")
+
+    return 0 if report.errors == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Время запросов API в результатах тестов
+
+Во время каждого теста события запросов клиентов (api_clients.hooks) собираются
+и прикладываются к результату Allure: время, размер ответа и количество
+отправок каждого запроса. По итогам прогона выводятся самые медленные
+эндпоинты и тесты; при --alluredir сводка также сохраняется в
+api-timings-summary.json и api-timings-summary.txt рядом с результатами.
+
+Сводка запросов теста передается в report.user_properties, поэтому при запуске
+через pytest-xdist итог собирается по всем воркерам.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from api_clients.hooks import RequestEvent, get_hooks
+
+
+USER_PROPERTY = "api_requests"
+
+DEFAULT_SLOWEST = 10
+
+
+class RequestCapture:
+    """Обработчик событий, копящий запросы текущего теста"""
+
+    def __init__(self):
+        self._events: List[RequestEvent] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        with self._lock:
+            self._events.append(event)
+
+    def take(self) -> List[RequestEvent]:
+        """Забрать накопленные события"""
+        with self._lock:
+            events, self._events = self._events, []
+        return events
+
+
+def compact(events: List[RequestEvent]) -> List[List[Any]]:
+    """Запросы теста в виде списков для user_properties: [эндпоинт, статус, с, байт, отправок]"""
+    return [
+        [f"{event.client} {event.http_method} {event.endpoint}",
+         event.status if event.error is None else "error",
+         round(event.duration, 6), event.bytes_received, event.attempts]
+        for event in events
+    ]
+
+
+def attachment_text(events: List[RequestEvent]) -> str:
+    """Таблица запросов теста для вложения Allure"""
+    lines = [f"{'Метод клиента':40} {'Запрос':60} {'Статус':>7} {'мс':>8} {'байт':>10} {'отправок':>8}"]
+    for event in events:
+        outcome = event.status if event.error is None else "error"
+        size = event.bytes_received if event.bytes_received is not None else "?"
+        lines.append(
+            f"{event.client + '.' + event.method:40} {event.http_method + ' ' + event.endpoint:60} "
+            f"{outcome!s:>7} {event.duration * 1000:8.0f} {size!s:>10} {event.attempts:8}"
+        )
+    total = sum(event.duration for event in events)
+    retries = sum(max(event.attempts - 1, 0) for event in events)
+    lines.append(f"Всего запросов: {len(events)}, время {total * 1000:.0f} мс, повторов {retries}")
+    return "\n".join(lines)
+
+
+def attach_to_allure(events: List[RequestEvent]):
+    """Приложить таблицу и JSON запросов к текущему результату Allure"""
+    import allure
+
+    allure.attach(attachment_text(events), name="Запросы API", attachment_type=allure.attachment_type.TEXT)
+    allure.attach(
+        json.dumps([event.to_dict() for event in events], ensure_ascii=False, indent=2, default=str),
+        name="Запросы API (JSON)", attachment_type=allure.attachment_type.JSON
+    )
+
+
+class TimingSummary:
+    """Итог прогона по эндпоинтам и тестам"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        self.tests: List[Dict[str, Any]] = []
+
+    def add_report(self, report):
+        """Учесть отчет фазы call теста (в том числе полученный от воркера xdist)"""
+        requests = dict(report.user_properties).get(USER_PROPERTY) or []
+        api_time = 0.0
+        for endpoint, status, seconds, size, attempts in requests:
+            stats = self.endpoints.setdefault(
+                endpoint, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0, "bytes": 0, "retries": 0}
+            )
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            stats["bytes"] += size or 0
+            stats["retries"] += max(attempts - 1, 0)
+            if status == "error" or status >= 400:
+                stats["errors"] += 1
+            api_time += seconds
+        self.tests.append({
+            "test": report.nodeid,
+            "outcome": report.outcome,
+            "duration": report.duration,
+            "requests": len(requests),
+            "api_time": api_time,
+        })
+
+    def slowest_endpoints(self, n: int) -> List[Dict[str, Any]]:
+        rows = [
+            dict(stats, endpoint=endpoint, mean=stats["total"] / stats["count"])
+            for endpoint, stats in self.endpoints.items()
+        ]
+        return sorted(rows, key=lambda row: row["mean"], reverse=True)[:n]
+
+    def slowest_tests(self, n: int) -> List[Dict[str, Any]]:
+        return sorted(self.tests, key=lambda row: row["duration"], reverse=True)[:n]
+
+    def format(self, n: int) -> List[str]:
+        lines = [f"Самые медленные эндпоинты (среднее время запроса, топ {n}):"]
+        for row in self.slowest_endpoints(n):
+            lines.append(
+                f"  {row['endpoint']:75} n={row['count']:<5} mean={row['mean'] * 1000:7.0f} мс "
+                f"max={row['max'] * 1000:7.0f} мс ошибок {row['errors']} повторов {row['retries']}"
+            )
+        lines.append(f"Самые медленные тесты (топ {n}):")
+        for row in self.slowest_tests(n):
+            lines.append(
+                f"  {row['test']:95} {row['duration']:7.2f} с  запросов {row['requests']:<4} "
+                f"в API {row['api_time']:6.2f} с"
+            )
+        return lines
+
+    def save(self, directory: str, n: int):
+        """Сохранить сводку в directory (json и txt)"""
+        os.makedirs(directory, exist_ok=True)
+        data = {"endpoints": self.slowest_endpoints(n), "tests": self.slowest_tests(n)}
+        with open(os.path.join(directory, "api-timings-summary.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(os.path.join(directory, "api-timings-summary.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(self.format(n)) + "\n")
+
+
+def install_capture() -> RequestCapture:
+    """Подписать сборщик запросов на события всех клиентов процесса"""
+    capture = RequestCapture()
+    get_hooks().add(capture)
+    return capture
+
+
+def allure_dir(config) -> Optional[str]:
+    """Каталог результатов Allure, если отчет включен"""
+    return getattr(config.option, "allure_report_dir", None)
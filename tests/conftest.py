@@ -1,11 +1,26 @@
 #!/usr/bin/env python3
 """
 Общие настройки для всех тестов
+
+Клиенты создаются один раз на сессию (при запуске через pytest-xdist - один раз
+на воркер) и переиспользуют пул соединений общего транспорта. Тесты, создающие
+и изменяющие записи, группируются по сервису и при --dist loadgroup выполняются
+на одном воркере; имена создаваемых записей уникальны для воркера.
+
+Запросы каждого теста прикладываются к результату Allure, в конце прогона
+выводятся самые медленные эндпоинты и тесты (см. api_timings.py).
+
+Тесты производительности (маркер performance) по умолчанию не выбираются:
+включаются опцией --performance или переменной окружения PERF_RUN=1 и
+выполняются только без pytest-xdist (на воркере xdist пропускаются).
 """
 
+import itertools
 import pytest
+import re
 import sys
 import os
+import time
 
 # Добавляем корневую папку в путь
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,62 +38,181 @@ from api_clients import (
     OrganizationsAPIClient
 )
 
+from .api_timings import (
+    DEFAULT_SLOWEST, USER_PROPERTY, TimingSummary, allure_dir, attach_to_allure, compact, install_capture
+)
+
+
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+_name_counter = itertools.count(1)
+
+# Тесты, меняющие данные сервиса: выполняются последовательно в группе сервиса
+_MUTATING_CLASS = re.compile(r"CRUD|Update|Workflow")
+_MUTATING_TEST = re.compile(r"create|update|delete|workflow", re.IGNORECASE)
+
+
+_requests_key = pytest.StashKey[list]()
+_capture = None
+_timings = TimingSummary()
+
+
+def make_unique_name(prefix: str, sep: str = " ") -> str:
+    """Имя записи, уникальное между воркерами и вызовами: <prefix> <воркер>-<время>-<номер>"""
+    return f"{prefix}{sep}{WORKER_ID}-{time.strftime('%H%M%S')}-{next(_name_counter)}"
+
+
+def performance_enabled(config) -> bool:
+    """Запрошен ли прогон тестов производительности (--performance или PERF_RUN=1)"""
+    return config.getoption("performance") or os.environ.get("PERF_RUN", "") not in ("", "0")
+
+
+def _select_performance(config, items):
+    """Отменить выбор тестов производительности, если они не запрошены; под xdist - пропустить"""
+    performance = [item for item in items if item.get_closest_marker("performance")]
+    if not performance:
+        return
+    if not performance_enabled(config):
+        config.hook.pytest_deselected(items=performance)
+        items[:] = [item for item in items if not item.get_closest_marker("performance")]
+        return
+    if hasattr(config, "workerinput"):
+        skip = pytest.mark.skip(reason="тесты производительности выполняются только последовательно, без -n")
+        for item in performance:
+            item.add_marker(skip)
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Отобрать тесты производительности и назначить группу xdist (каталог сервиса)
+    тестам, создающим и изменяющим записи
+    """
+    _select_performance(config, items)
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    for item in items:
+        service = item.path.parent.name
+        if not service.startswith("tests_") or service == "tests_api_clients":
+            continue
+        cls = item.cls.__name__ if item.cls else ""
+        if _MUTATING_CLASS.search(cls) or _MUTATING_TEST.search(item.name):
+            item.add_marker(pytest.mark.xdist_group(name=service[len("tests_"):]))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--api-slowest", type=int, default=DEFAULT_SLOWEST, metavar="N",
+        help="Сколько самых медленных эндпоинтов и тестов показать в итогах (0 - не показывать)"
+    )
+    parser.addoption(
+        "--performance", action="store_true", default=False,
+        help="Выполнить тесты производительности (маркер performance; также PERF_RUN=1), только без -n"
+    )
+
+
+def pytest_configure(config):
+    global _capture
+    if _capture is None:
+        _capture = install_capture()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Собрать запросы теста и приложить их к результату Allure"""
+    _capture.take()
+    yield
+    events = _capture.take()
+    item.stash[_requests_key] = events
+    if events and allure_dir(item.config):
+        attach_to_allure(events)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    if call.when == "call":
+        outcome.get_result().user_properties.append((USER_PROPERTY, compact(item.stash.get(_requests_key, []))))
+
+
+def pytest_runtest_logreport(report):
+    if report.when == "call":
+        _timings.add_report(report)
+
 
-@pytest.fixture(scope="module")
+def pytest_terminal_summary(terminalreporter, config):
+    """Самые медленные эндпоинты и тесты прогона"""
+    count = config.getoption("api_slowest")
+    if count <= 0 or not _timings.endpoints or hasattr(config, "workerinput"):
+        return
+    terminalreporter.section("Время запросов API")
+    for line in _timings.format(count):
+        terminalreporter.write_line(line)
+    directory = allure_dir(config)
+    if directory:
+        _timings.save(directory, count)
+
+
+@pytest.fixture
+def unique_name():
+    """Фикстура-фабрика уникальных имен создаваемых записей"""
+    return make_unique_name
+
+
+@pytest.fixture(scope="session")
 def incidents_client():
     """Фикстура для предоставления API клиента инцидентов"""
     return IncidentsAPIClient()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def dtp_client():
     """Фикстура для предоставления API клиента ДТП"""
     return DTPAPIClient()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def metro_client():
     """Фикстура для предоставления API клиента Метрополитен"""
     return MetroAPIClient()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def parking_client():
     """Фикстура для предоставления API клиента Парковочное пространство"""
     return ParkingAPIClient()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def digital_twin_client():
     """Фикстура для предоставления API клиента Цифровой двойник"""
     return DigitalTwinAPIClient()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def external_transport_client():
     """Фикстура для предоставления API клиента Внешний транспорт"""
     return ExternalTransportAPIClient()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def water_transport_client():
     """Фикстура для предоставления API клиента Водный транспорт"""
     return WaterTransportAPIClient()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def passenger_transport_client():
     """Фикстура для предоставления API клиента Пассажирский транспорт"""
     return PassengerTransportAPIClient()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def data_bus_client():
     """Фикстура для предоставления API клиента Data Bus (Общая шина)"""
     return DataBusAPIClient()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def organizations_client():
     """Фикстура для предоставления API клиента Organizations (Организации)"""
     return OrganizationsAPIClient()
@@ -0,0 +1 @@
+# Тесты для общей инфраструктуры API клиентов
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Локальный HTTP сервер для тестов инфраструктуры клиентов (без обращения к стенду)
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+from api_clients.auth import set_token_provider
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class LocalServer:
+    """Сервер с подменяемыми обработчиками маршрутов"""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        self.httpd = _Server(("127.0.0.1", 0), self._make_handler())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def route(self, method, path, handler):
+        """
+        Зарегистрировать обработчик
+
+        handler(request) -> (status, headers, body), где body - bytes, str или объект для JSON
+        """
+        self.routes[(method, path)] = handler
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                request = {
+                    "method": self.command,
+                    "path": parts.path,
+                    "query": {k: v[-1] for k, v in parse_qs(parts.query).items()},
+                    "headers": dict(self.headers),
+                    "body": raw,
+                    "json": json.loads(raw) if raw else None,
+                }
+                with server.lock:
+                    server.requests.append(request)
+                handler = server.routes.get((self.command, parts.path))
+                if handler is None:
+                    status, headers, body = 404, {}, {"success": False}
+                else:
+                    status, headers, body = handler(request)
+                if not isinstance(body, (bytes, str)):
+                    body = json.dumps(body)
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                self.send_response(status)
+                headers = dict(headers)
+                headers.setdefault("Content-Type", "application/json")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        return Handler
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def local_server():
+    """Локальный HTTP сервер на случайном порту"""
+    server = LocalServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def env_token(tmp_path, monkeypatch):
+    """Временный .env с тестовым токеном в рабочей директории"""
+    token = "test-token-0123456789"
+    (tmp_path / ".env").write_text(f"EPUTS_TOKEN={token}\nAPI_TOKEN={token}\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("API_TOKEN", token)
+    set_token_provider(None)
+    yield token
+    set_token_provider(None)
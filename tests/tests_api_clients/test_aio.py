@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Тесты асинхронных версий клиентов
+"""
+
+import asyncio
+
+import pytest
+
+from api_clients.aio import AsyncDigitalTwinAPIClient, AsyncIncidentsAPIClient, AsyncParkingAPIClient
+
+
+class TestAsyncClients:
+    """Асинхронные клиенты используют методы и payload синхронных"""
+
+    def test_concurrent_requests_from_one_loop(self, local_server, env_token):
+        """Много запросов одновременно из одного event loop"""
+        def incident_list(request):
+            return 200, {}, {"success": True, "data": [{"id": request["json"]["page"]}]}
+
+        local_server.route("POST", "/incident/list", incident_list)
+
+        async def run():
+            client = AsyncIncidentsAPIClient()
+            client.base_url = local_server.url
+            results = await asyncio.gather(*(client.get_incidents_list(page=page, limit=1) for page in range(1, 51)))
+            await client.http.aclose()
+            return client, results
+
+        client, results = asyncio.run(run())
+
+        assert [r.json()["data"][0]["id"] for r in results] == list(range(1, 51))
+        payloads = [r["json"] for r in local_server.requests]
+        assert all(p["is_simple"] is True for p in payloads), "Payload не совпадает с синхронным клиентом"
+        assert list(client.http.pool_stats().values())[0]["max_in_flight"] > 1
+
+    def test_check_token(self, local_server, env_token):
+        """check_token возвращает тот же результат, что и синхронный клиент"""
+        local_server.route("GET", "/parking", lambda request: (401, {}, {"success": False}))
+
+        async def run():
+            client = AsyncParkingAPIClient()
+            client.base_url = local_server.url
+            result = await client.check_token()
+            await client.http.aclose()
+            return result
+
+        result = asyncio.run(run())
+        assert result["valid"] is False
+        assert result["status_code"] == 401
+        assert local_server.requests[0]["headers"]["Authorization"] == f"Bearer {env_token}"
+
+    def test_sync_only_helpers(self, local_server, env_token):
+        """Пагинация, массовые операции и помощники графа отклоняются без запросов"""
+        async def run():
+            parking = AsyncParkingAPIClient()
+            parking.base_url = local_server.url
+            with pytest.raises(TypeError, match="ParkingAPIClient.bulk_create_parking"):
+                parking.bulk_create_parking([{"name": "p"}])
+            with pytest.raises(TypeError, match="ParkingAPIClient.iter_parking_list"):
+                parking.iter_parking_list()
+            twin = AsyncDigitalTwinAPIClient()
+            for name in ("graph_sync", "infrastructure_index", "iter_road_sections_tiled"):
+                with pytest.raises(TypeError, match="DigitalTwinAPIClient"):
+                    getattr(twin, name)(None)
+            # Обычные методы по-прежнему асинхронные
+            assert asyncio.iscoroutine(coroutine := parking.get_parking_list())
+            await coroutine
+            await parking.http.aclose()
+
+        local_server.route("GET", "/parking", lambda request: (200, {}, {"success": True, "data": []}))
+        asyncio.run(run())
+        assert [r["path"] for r in local_server.requests] == ["/parking"]
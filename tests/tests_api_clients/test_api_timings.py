@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Тесты сводки времени запросов по тестам (tests/api_timings.py)
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from api_clients.hooks import RequestEvent
+from tests.api_timings import USER_PROPERTY, TimingSummary, attachment_text, compact
+
+
+def _event(url, status=200, duration=0.1, attempts=1):
+    return RequestEvent("ParkingAPIClient", "get_parking_list", "GET", url, status=status,
+                        bytes_received=100, attempts=attempts, timings={"total": duration})
+
+
+def _report(nodeid, duration, events):
+    return SimpleNamespace(nodeid=nodeid, outcome="passed", duration=duration,
+                           user_properties=[(USER_PROPERTY, compact(events))])
+
+
+class TestApiTimings:
+    """Агрегация запросов по эндпоинтам и тестам"""
+
+    def test_slowest_endpoints_and_tests(self, tmp_path):
+        summary = TimingSummary()
+        summary.add_report(_report("t::fast", 0.2, [_event("http://h/parking", duration=0.05)]))
+        summary.add_report(_report("t::slow", 1.5, [
+            _event("http://h/parking/1", duration=0.9, attempts=3),
+            _event("http://h/parking/2", status=500, duration=0.5),
+            _event("http://h/parking", duration=0.15),
+        ]))
+
+        endpoints = summary.slowest_endpoints(1)
+        assert endpoints[0]["endpoint"] == "ParkingAPIClient GET /parking/{id}"
+        assert endpoints[0]["count"] == 2 and endpoints[0]["errors"] == 1 and endpoints[0]["retries"] == 2
+        assert endpoints[0]["mean"] == pytest.approx(0.7)
+        assert [row["test"] for row in summary.slowest_tests(2)] == ["t::slow", "t::fast"]
+        assert summary.slowest_tests(1)[0]["api_time"] == pytest.approx(1.55)
+
+        summary.save(str(tmp_path), 5)
+        assert "ParkingAPIClient GET /parking/{id}" in (tmp_path / "api-timings-summary.txt").read_text(encoding="utf-8")
+        assert (tmp_path / "api-timings-summary.json").exists()
+
+    def test_attachment_lists_requests(self):
+        text = attachment_text([_event("http://h/parking/1", attempts=2)])
+        assert "GET /parking/{id}" in text
+        assert "повторов 1" in text
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Тесты общего источника токена
+"""
+
+import base64
+import json
+import threading
+import time
+
+from api_clients import ParkingAPIClient, DataBusAPIClient
+from api_clients.auth import TokenProvider, decode_jwt_expiry, set_token_provider
+
+
+def make_jwt(exp):
+    """Собрать неподписанный JWT с заданным exp"""
+    def part(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    return f"{part({'alg': 'none'})}.{part({'exp': exp})}.signature"
+
+
+class TestTokenProvider:
+    """Кэширование, обновление и рассылка токена"""
+
+    def test_decode_jwt_expiry(self):
+        """exp извлекается из JWT, не-JWT токен дает None"""
+        assert decode_jwt_expiry(make_jwt(1700000000)) == 1700000000
+        assert decode_jwt_expiry("plain-token") is None
+
+    def test_token_read_once(self, env_token, tmp_path):
+        """Токен читается из .env один раз на процесс"""
+        assert ParkingAPIClient().token == env_token
+
+        (tmp_path / ".env").write_text("EPUTS_TOKEN=changed-token-000000\n")
+        assert ParkingAPIClient().token == env_token
+        assert DataBusAPIClient().token == env_token
+
+    def test_refresh_pushed_to_live_clients(self, env_token):
+        """Новый токен попадает во все живые клиенты"""
+        provider = TokenProvider(login=lambda: "fresh-token-0123456789")
+        set_token_provider(provider)
+        parking, data_bus = ParkingAPIClient(), DataBusAPIClient()
+
+        provider.refresh()
+
+        assert parking.token == data_bus.token == "fresh-token-0123456789"
+        assert parking.headers["Authorization"] == "Bearer fresh-token-0123456789"
+
+    def test_concurrent_refresh_single_login(self, env_token):
+        """Одновременные обновления устаревшего токена дают один вход"""
+        calls = []
+
+        def login():
+            calls.append(1)
+            time.sleep(0.05)
+            return f"fresh-token-{len(calls)}"
+
+        provider = TokenProvider(login=login)
+        stale = provider.get_token()
+        threads = [threading.Thread(target=provider.refresh, args=(stale,)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert provider.get_token() == "fresh-token-1"
+
+    def test_concurrent_refresh_failed_login(self, env_token):
+        """Неудачный вход не повторяется каждым ожидающим потоком"""
+        calls = []
+
+        def login():
+            calls.append(1)
+            time.sleep(0.05)
+            return None
+
+        provider = TokenProvider(login=login)
+        stale = provider.get_token()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(provider.refresh(stale))) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [None] * 10
+        assert provider.get_token() == stale
+
+    def test_proactive_refresh_before_expiry(self, env_token):
+        """Токен обновляется заранее, до истечения срока"""
+        refreshed = threading.Event()
+
+        def login():
+            refreshed.set()
+            return make_jwt(time.time() + 3600)
+
+        provider = TokenProvider(refresh_margin=1, login=login)
+        provider.set_token(make_jwt(time.time() + 1.2))
+
+        assert refreshed.wait(2), "Токен не был обновлен заранее"
+        assert provider.expires_at > time.time() + 3000
+        provider.close()
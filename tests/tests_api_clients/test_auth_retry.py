@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Тесты повтора запроса после 401 с обновлением токена
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from api_clients import DataBusAPIClient, IncidentsAPIClient, DTPAPIClient, OrganizationsAPIClient, WaterTransportAPIClient
+from api_clients.aio import (
+    AsyncDataBusAPIClient, AsyncIncidentsAPIClient, AsyncOrganizationsAPIClient, AsyncWaterTransportAPIClient
+)
+from api_clients.auth import TokenProvider, set_token_provider
+from api_clients.transport import HTTPTransport
+
+FRESH = "fresh-token-0123456789"
+
+
+def _requires_fresh_token(request):
+    if request["headers"].get("Authorization") != f"Bearer {FRESH}":
+        return 401, {}, {"success": False}
+    return 200, {}, {"success": True, "data": []}
+
+
+class TestAuthRetry:
+    """Прозрачное обновление токена в транспорте"""
+
+    def _provider(self, calls):
+        def login():
+            calls.append(1)
+            time.sleep(0.05)
+            return FRESH
+        provider = TokenProvider(login=login)
+        set_token_provider(provider)
+        return provider
+
+    def test_request_replayed_after_refresh(self, local_server, env_token):
+        """Запрос с протухшим токеном повторяется с новым"""
+        calls = []
+        self._provider(calls)
+        local_server.route("POST", "/incident/list", _requires_fresh_token)
+        client = IncidentsAPIClient(transport=HTTPTransport())
+        client.base_url = local_server.url
+
+        result = client.get_incidents_list()
+
+        assert result.status_code == 200, f"Status code: {result.status_code}"
+        assert len(calls) == 1
+        assert client.token == FRESH, "Новый токен не разослан клиенту"
+        assert local_server.requests[-1]["json"]["is_simple"] is True, "Тело запроса не повторено"
+
+    def test_concurrent_401_single_login(self, local_server, env_token):
+        """Одновременные 401 схлопываются в один вход"""
+        calls = []
+        self._provider(calls)
+        local_server.route("POST", "/dtp/api/v2/dtp/list", _requires_fresh_token)
+        client = DTPAPIClient(transport=HTTPTransport())
+        client.base_url = local_server.url
+
+        statuses = []
+        threads = [threading.Thread(target=lambda: statuses.append(client.get_dtp_list().status_code)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert statuses == [200] * 8
+        assert len(calls) == 1
+
+    def test_check_token_reports_401(self, local_server, env_token):
+        """check_token не скрывает невалидный токен"""
+        calls = []
+        self._provider(calls)
+        local_server.route("GET", "/incident", _requires_fresh_token)
+        client = IncidentsAPIClient(transport=HTTPTransport())
+        client.base_url = local_server.url
+
+        assert client.check_token()["status_code"] == 401
+        assert calls == []
+
+    @pytest.mark.parametrize("client_class,async_class,method,path", [
+        (DataBusAPIClient, AsyncDataBusAPIClient, "POST", "/api/collection-service/list"),
+        (OrganizationsAPIClient, AsyncOrganizationsAPIClient, "GET", "/api/organization"),
+        (WaterTransportAPIClient, AsyncWaterTransportAPIClient, "POST", "/vehicle/list"),
+    ])
+    def test_check_token_without_refresh(self, local_server, env_token, client_class, async_class, method, path):
+        """check_token клиентов без отдельного эндпоинта проверки тоже не обновляет токен после 401"""
+        calls = []
+        self._provider(calls)
+        local_server.route(method, path, _requires_fresh_token)
+        client = client_class(transport=HTTPTransport())
+        client.base_url = local_server.url
+
+        assert client.check_token() is False
+
+        async def run():
+            async_client = async_class()
+            async_client.base_url = local_server.url
+            try:
+                return await async_client.check_token()
+            finally:
+                await async_client.http.aclose()
+
+        assert asyncio.run(run()) is False
+        assert calls == []
+        assert len(local_server.requests) == 2
+
+    def test_async_request_replayed_after_refresh(self, local_server, env_token):
+        """Асинхронный транспорт также повторяет запрос после 401"""
+        calls = []
+        self._provider(calls)
+        local_server.route("POST", "/incident/list", _requires_fresh_token)
+
+        async def run():
+            client = AsyncIncidentsAPIClient()
+            client.base_url = local_server.url
+            results = await asyncio.gather(*(client.get_incidents_list() for _ in range(5)))
+            await client.http.aclose()
+            return results
+
+        assert [r.status_code for r in asyncio.run(run())] == [200] * 5
+        assert len(calls) == 1
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Тесты массовых операций
+"""
+
+import threading
+import time
+
+from api_clients import ParkingAPIClient, PassengerTransportAPIClient
+from api_clients.bulk import run_bulk
+from api_clients.transport import HTTPTransport
+
+
+class _Concurrency:
+    """Обработчик с задержкой, считающий одновременные запросы"""
+
+    def __init__(self, delay=0.02, fail_names=()):
+        self.delay = delay
+        self.fail_names = set(fail_names)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.next_id = 0
+
+    def __call__(self, request):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.next_id += 1
+            new_id = self.next_id
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        body = request["json"] or {}
+        if body.get("name") in self.fail_names:
+            return 500, {}, {"success": False}
+        return 200, {}, {"success": True, "data": {"id": new_id, "name": body.get("name")}}
+
+
+def _parking_client(local_server):
+    client = ParkingAPIClient(transport=HTTPTransport(pool_size=16))
+    client.base_url = local_server.url
+    return client
+
+
+class TestBulk:
+    """Параллельность, исходы элементов и итоговые тайминги"""
+
+    def test_bulk_create_parking(self, local_server, env_token):
+        """Элементы создаются параллельно, исходы - в порядке входа"""
+        handler = _Concurrency(fail_names={"p-7"})
+        local_server.route("POST", "/parking", handler)
+        client = _parking_client(local_server)
+        address = client.generate_test_address()
+        payloads = (
+            {"name": f"p-{i}", "address": address, "address_text": "a", "contacts": "c",
+             "description": "d", "lat": 59.9, "lon": 30.3}
+            for i in range(60)
+        )
+
+        result = client.bulk_create_parking(payloads, workers=8)
+
+        assert len(result.results) == 60
+        assert [r.item["name"] for r in result.results] == [f"p-{i}" for i in range(60)]
+        assert [r.item["name"] for r in result.failed] == ["p-7"]
+        assert result.failed[0].status_code == 500
+        assert len(result.ids) == 59
+        assert 1 < handler.peak <= 8
+        # 60 запросов по 20 мс последовательно заняли бы больше 1.2 с
+        assert result.elapsed < 0.9
+        assert "успешно 59, ошибок 1" in result.summary()
+
+    def test_bulk_update_and_delete(self, local_server, env_token):
+        """Изменение по {id: fields} и удаление по списку ID"""
+        local_server.route("PUT", "/parking/1", lambda request: (200, {}, {"success": True}))
+        local_server.route("PUT", "/parking/2", lambda request: (200, {}, {"success": True}))
+        for parking_id in (1, 2, 3):
+            local_server.route("DELETE", f"/parking/{parking_id}", lambda request: (200, {}, {"success": True}))
+        client = _parking_client(local_server)
+
+        updated = client.bulk_update_parking({1: {"name": "a"}, 2: {"name": "b"}})
+        deleted = client.bulk_delete_parking([1, 2, 3, 4])
+
+        assert all(r.ok for r in updated.results)
+        assert sorted(r["json"]["name"] for r in local_server.requests if r["method"] == "PUT") == ["a", "b"]
+        assert [r.ok for r in deleted.results] == [True, True, True, False]
+        assert deleted.results[3].status_code == 404
+
+    def test_passenger_vehicles(self, local_server, env_token):
+        """Массовое удаление ТС пассажирского транспорта"""
+        local_server.route("DELETE", "/vehicle/5", lambda request: (200, {}, {"success": True}))
+        client = PassengerTransportAPIClient(transport=HTTPTransport())
+        client.base_url = local_server.url
+
+        result = client.bulk_delete_vehicles([5])
+        assert result.results[0].ok
+        assert local_server.requests[0]["path"] == "/vehicle/5"
+
+    def test_errors_do_not_abort(self):
+        """Исключение элемента записывается в его исход"""
+        def call(item):
+            if item == 2:
+                raise ConnectionError("нет соединения")
+
+            class Response:
+                status_code = 201
+
+                def json(self):
+                    return {"data": {"id": item}}
+            return Response()
+
+        result = run_bulk(call, range(4), workers=2)
+        assert [r.ok for r in result.results] == [True, True, False, True]
+        assert result.results[2].error == "ConnectionError: нет соединения"
+        assert result.ids == [0, 1, 3]
+
+    def test_input_consumed_lazily(self):
+        """Из входа читается не больше элементов, чем есть свободных потоков"""
+        consumed = []
+        gate = threading.Event()
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        def call(item):
+            gate.wait(1)
+
+            class Response:
+                status_code = 200
+
+                def json(self):
+                    return {}
+            return Response()
+
+        thread = threading.Thread(target=run_bulk, args=(call, items()), kwargs={"workers": 4})
+        thread.start()
+        time.sleep(0.1)
+        in_progress = len(consumed)
+        gate.set()
+        thread.join()
+
+        assert in_progress <= 5
+        assert len(consumed) == 100
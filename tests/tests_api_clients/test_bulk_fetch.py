@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Тесты параллельной выгрузки всех страниц
+"""
+
+import time
+
+from api_clients import DTPAPIClient
+
+
+def _dtp_pages(total, with_meta=True, delay=0.0, slow_pages=()):
+    """Обработчик списка ДТП, отдающий total записей постранично (slow_pages - с задержкой 0.3 с)"""
+    def handler(request):
+        time.sleep(0.3 if request["json"]["page"] in slow_pages else delay)
+        page, limit = request["json"]["page"], request["json"]["limit"]
+        ids = list(range((page - 1) * limit + 1, min(page * limit, total) + 1))
+        body = {"success": True, "data": [{"id": i} for i in ids]}
+        if with_meta:
+            body["meta"] = {"total": total}
+        return 200, {}, body
+    return handler
+
+
+class TestFetchAll:
+    """Параллельная выгрузка со сборкой в порядке страниц"""
+
+    def test_records_in_page_order(self, local_server, env_token):
+        """Записи собираются в порядке страниц независимо от порядка ответов"""
+        local_server.route("POST", "/dtp/api/v2/dtp/list", _dtp_pages(95, delay=0.05))
+        client = DTPAPIClient()
+        client.base_url = local_server.url
+
+        started = time.perf_counter()
+        result = client.fetch_all_dtp(limit=10, workers=5)
+        elapsed = time.perf_counter() - started
+
+        assert [r["id"] for r in result.records] == list(range(1, 96))
+        assert result.pages == 10
+        assert elapsed < 10 * 0.05, "Страницы загружались последовательно"
+        assert result.records_per_second > 0
+        print(result.summary())
+
+    def test_without_meta_stops_on_short_page(self, local_server, env_token):
+        """Без meta страницы запрашиваются пачками до первой неполной"""
+        local_server.route("POST", "/dtp/api/v2/dtp/list", _dtp_pages(42, with_meta=False))
+        client = DTPAPIClient()
+        client.base_url = local_server.url
+
+        result = client.fetch_all_dtp(limit=10, workers=3)
+
+        assert [r["id"] for r in result.records] == list(range(1, 43))
+        assert result.pages == 5
+
+    def test_without_meta_no_requests_after_short_page(self, local_server, env_token):
+        """После неполной страницы следующие не запрашиваются, пока ждут медленные предыдущие"""
+        local_server.route("POST", "/dtp/api/v2/dtp/list", _dtp_pages(42, with_meta=False, slow_pages=(3, 4)))
+        client = DTPAPIClient()
+        client.base_url = local_server.url
+
+        result = client.fetch_all_dtp(limit=10, workers=3)
+
+        assert [r["id"] for r in result.records] == list(range(1, 43))
+        assert sorted(r["json"]["page"] for r in local_server.requests) == [1, 2, 3, 4, 5]
+
+    def test_rate_cap(self, local_server, env_token):
+        """Ограничение частоты растягивает выгрузку"""
+        local_server.route("POST", "/dtp/api/v2/dtp/list", _dtp_pages(50))
+        client = DTPAPIClient()
+        client.base_url = local_server.url
+
+        started = time.perf_counter()
+        client.fetch_all_dtp(limit=10, workers=5, rate=20)
+        assert time.perf_counter() - started >= 4 / 20
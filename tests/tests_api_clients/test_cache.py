@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Тесты кэша ответов справочных эндпоинтов
+"""
+
+import asyncio
+import time
+
+from api_clients import IncidentsAPIClient
+from api_clients.aio import AsyncHTTPTransport, AsyncIncidentsAPIClient
+from api_clients.cache import ResponseCache, resource_path
+from api_clients.transport import HTTPTransport
+
+
+def _categories(request):
+    return 200, {}, {"success": True, "data": [{"id": 1, "name": "Авария"}]}
+
+
+def _created(request):
+    return 200, {}, {"success": True, "data": {"id": 2}}
+
+
+def _client(local_server, **cache_options):
+    client = IncidentsAPIClient(transport=HTTPTransport())
+    client.base_url = local_server.url
+    client.http.enable_cache(**cache_options)
+    return client
+
+
+class TestResponseCache:
+    """TTL, LRU, ключ кэша и сброс при записи"""
+
+    def test_repeated_get_served_from_cache(self, local_server, env_token):
+        """Повторный запрос справочника не уходит на сервер"""
+        local_server.route("GET", "/category", _categories)
+        client = _client(local_server)
+
+        first = client.get_categories_list()
+        second = client.get_categories_list()
+
+        assert second.json() == first.json()
+        assert len(local_server.requests) == 1
+        assert client.http.cache.stats()["hits"] == 1
+        # Попадание помечено, и у каждого вызывающего свой объект ответа
+        assert not getattr(first, "from_cache", False) and second.from_cache
+        third = client.get_categories_list()
+        assert third is not second and third is not first
+        second.headers["X-Changed"] = "1"
+        assert "X-Changed" not in third.headers
+
+    def test_write_invalidates_resource(self, local_server, env_token):
+        """create_category и delete_category сбрасывают кэш /category"""
+        local_server.route("GET", "/category", _categories)
+        local_server.route("GET", "/category/1", _categories)
+        local_server.route("POST", "/category", _created)
+        local_server.route("DELETE", "/category/1", _created)
+        client = _client(local_server)
+
+        client.get_categories_list()
+        client.get_category_by_id(1)
+        client.create_category("Новая", "Описание")
+        client.get_categories_list()
+        client.delete_category(1)
+        client.get_category_by_id(1)
+
+        gets = [r["path"] for r in local_server.requests if r["method"] == "GET"]
+        assert gets == ["/category", "/category/1", "/category", "/category/1"]
+
+    def test_ttl_expiry(self, local_server, env_token):
+        """Запись истекает через ttl секунд"""
+        local_server.route("GET", "/category", _categories)
+        client = _client(local_server, ttl=0.1)
+
+        client.get_categories_list()
+        time.sleep(0.15)
+        client.get_categories_list()
+
+        assert len(local_server.requests) == 2
+
+    def test_endpoints_filter(self, local_server, env_token):
+        """Кэшируются только перечисленные эндпоинты"""
+        local_server.route("GET", "/category", _categories)
+        local_server.route("GET", "/incident/7", _categories)
+        client = _client(local_server, endpoints=["/category"])
+
+        for _ in range(2):
+            client.get_categories_list()
+            client.get_incident_by_id(7)
+
+        assert [r["path"] for r in local_server.requests] == ["/category", "/incident/7", "/incident/7"]
+
+    def test_lru_eviction_and_key(self):
+        """Вытесняется давно неиспользованная запись; project входит в ключ"""
+        cache = ResponseCache(max_entries=2)
+        a = cache.key("http://h/a", {"page": 1}, {"project": "98_spb"})
+        b = cache.key("http://h/a", {"page": 1}, {"project": "other"})
+        c = cache.key("http://h/c")
+        assert a != b
+
+        cache.put(a, "A")
+        cache.put(b, "B")
+        cache.get(a)
+        cache.put(c, "C")
+
+        assert cache.get(b) is None
+        assert cache.get(a) == "A" and cache.get(c) == "C"
+        assert cache.stats()["evictions"] == 1
+
+    def test_resource_path(self):
+        """Идентификатор в конце пути отбрасывается"""
+        assert resource_path("http://h/api/category/5") == "/api/category"
+        assert resource_path("http://h/infrastructure_type/") == "/infrastructure_type"
+        assert resource_path("http://h/station/statuses") == "/station/statuses"
+
+    def test_async_client_cache(self, local_server, env_token):
+        """Асинхронный клиент получает закэшированный ответ через await"""
+        local_server.route("GET", "/category", _categories)
+
+        async def main():
+            transport = AsyncHTTPTransport()
+            client = AsyncIncidentsAPIClient(transport=transport)
+            client.base_url = local_server.url
+            client.http.enable_cache()
+            first = await client.get_categories_list()
+            second = await client.get_categories_list()
+            await transport.aclose()
+            return first, second
+
+        first, second = asyncio.run(main())
+        assert second is not first and second.from_cache
+        assert second.json() == first.json()
+        assert len(local_server.requests) == 1
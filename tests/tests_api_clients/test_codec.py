@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Тесты подключаемого JSON кодека
+"""
+
+import asyncio
+import json
+import sys
+
+import pytest
+import requests
+
+from api_clients import ParkingAPIClient
+from api_clients.aio import AsyncHTTPTransport, AsyncParkingAPIClient
+from api_clients.codec import STDLIB_CODEC, JSONCodec, available_codecs, get_codec
+from api_clients.transport import HTTPTransport
+
+
+def _counting_codec(calls):
+    """Кодек поверх стандартного json с подсчетом вызовов"""
+    return JSONCodec(
+        "counting",
+        lambda obj: calls.append("dumps") or json.dumps(obj, ensure_ascii=False).encode("utf-8"),
+        lambda raw: calls.append("loads") or json.loads(raw)
+    )
+
+
+def _echo(request):
+    return 200, {}, {"success": True, "data": request["json"]}
+
+
+class TestCodec:
+    """Выбор кодека, кодирование json= и декодирование ответа"""
+
+    def test_fallback_to_stdlib(self, monkeypatch):
+        """Без orjson и ujson используется стандартный json"""
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        monkeypatch.setitem(sys.modules, "ujson", None)
+
+        assert list(available_codecs()) == ["json"]
+        assert get_codec().name == "json"
+        with pytest.raises(ValueError):
+            get_codec("orjson")
+
+    def test_default_is_fastest_installed(self):
+        """По умолчанию выбирается первый установленный из orjson, ujson, json"""
+        assert get_codec().name == next(iter(available_codecs()))
+        assert get_codec("json").loads(get_codec().dumps({"a": [1, "б"]})) == {"a": [1, "б"]}
+
+    def test_transport_uses_codec(self, local_server, env_token):
+        """Тело запроса и response.json() проходят через кодек транспорта"""
+        local_server.route("POST", "/parking", _echo)
+        calls = []
+        client = ParkingAPIClient(transport=HTTPTransport(codec=_counting_codec(calls)))
+        client.base_url = local_server.url
+        address = client.generate_test_address()
+
+        response = client.create_parking("Парковка", address, "адрес", "контакты", "описание", 59.9, 30.3)
+
+        assert local_server.requests[0]["headers"]["Content-Type"] == "application/json"
+        assert local_server.requests[0]["json"]["name"] == "Парковка"
+        assert response.json()["data"]["address"] == address
+        assert calls == ["dumps", "loads"]
+
+    def test_decode_error_type(self, local_server, env_token):
+        """Ошибка разбора - requests.JSONDecodeError, как у стандартного requests"""
+        local_server.route("GET", "/parking", lambda request: (200, {}, b"not json"))
+        client = ParkingAPIClient(transport=HTTPTransport(codec=_counting_codec([])))
+        client.base_url = local_server.url
+
+        with pytest.raises(requests.exceptions.JSONDecodeError):
+            client.get_parking_list().json()
+
+    def test_stdlib_codec_leaves_requests_untouched(self, local_server, env_token):
+        """Со стандартным кодеком json= кодирует сам requests"""
+        local_server.route("POST", "/parking", _echo)
+        client = ParkingAPIClient(transport=HTTPTransport(codec=STDLIB_CODEC))
+        client.base_url = local_server.url
+
+        response = client.create_parking("p", {}, "a", "c", "d", 59.9, 30.3)
+        assert "json" not in response.__dict__
+        assert response.json()["data"]["name"] == "p"
+
+    def test_async_transport_uses_codec(self, local_server, env_token):
+        """Асинхронный транспорт использует тот же кодек"""
+        local_server.route("POST", "/parking", _echo)
+        calls = []
+
+        async def main():
+            transport = AsyncHTTPTransport(codec=_counting_codec(calls))
+            client = AsyncParkingAPIClient(transport=transport)
+            client.base_url = local_server.url
+            response = await client.create_parking("p", {}, "a", "c", "d", 59.9, 30.3)
+            await transport.aclose()
+            return response
+
+        assert asyncio.run(main()).json()["data"]["lat"] == 59.9
+        assert calls == ["dumps", "loads"]
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Тесты кэша ответов на диске с проверкой ETag/Last-Modified
+"""
+
+import asyncio
+
+from api_clients import DigitalTwinAPIClient, MetroAPIClient
+from api_clients.aio import AsyncHTTPTransport, AsyncMetroAPIClient
+from api_clients.disk_cache import DiskCache
+from api_clients.transport import HTTPTransport
+
+
+VESTIBULES = {"success": True, "data": [{"id": i, "name": f"Вестибюль {i}"} for i in range(50)]}
+
+
+def _etag_handler(etag='"v1"'):
+    """Отдает 304, если клиент прислал актуальный ETag"""
+    def handler(request):
+        if request["headers"].get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag}, VESTIBULES
+    return handler
+
+
+def _client(local_server, cache):
+    client = MetroAPIClient(transport=HTTPTransport(disk_cache=cache))
+    client.base_url = local_server.url
+    return client
+
+
+class TestDiskCache:
+    """Сохранение тел, условные запросы и ответ с диска при 304"""
+
+    def test_not_modified_served_from_disk(self, local_server, env_token, tmp_path):
+        """Второй процесс получает тело с диска после 304"""
+        local_server.route("POST", "/vestibule", _etag_handler())
+        cache_dir = str(tmp_path / "cache")
+
+        first = _client(local_server, DiskCache(cache_dir, methods=("POST",))).get_vestibules_on_page()
+        # Новый кэш над тем же каталогом - как повторный запуск
+        cache = DiskCache(cache_dir, methods=("POST",))
+        second = _client(local_server, cache).get_vestibules_on_page()
+
+        assert first.status_code == second.status_code == 200
+        assert second.json() == VESTIBULES
+        assert second.from_cache
+        assert "If-None-Match" not in local_server.requests[0]["headers"]
+        assert local_server.requests[1]["headers"]["If-None-Match"] == '"v1"'
+        assert cache.stats() == {"hits": 1, "misses": 0, "stores": 0}
+
+    def test_entry_is_single_file(self, tmp_path):
+        """Валидаторы и тело в одном файле; поврежденная запись - промах"""
+        cache = DiskCache(str(tmp_path))
+        key = cache.key("GET", "http://h/vestibule", {})
+        assert cache.store(key, "http://h/vestibule", {"ETag": '"v1"'}, b'{"a": 1}\n{"b": 2}')
+        assert [p.name for p in tmp_path.iterdir()] == [f"{key}.entry"]
+        entry = cache.load(key)
+        assert entry["etag"] == '"v1"' and entry["body"] == b'{"a": 1}\n{"b": 2}'
+
+        path = tmp_path / f"{key}.entry"
+        path.write_bytes(path.read_bytes()[:-3])
+        assert cache.load(key) is None
+        cache.clear()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_changed_resource_updates_entry(self, local_server, env_token, tmp_path):
+        """Новый ETag - полный ответ и обновленная запись"""
+        local_server.route("POST", "/vestibule", _etag_handler('"v1"'))
+        cache = DiskCache(str(tmp_path), methods=("POST",))
+        client = _client(local_server, cache)
+        client.get_vestibules_on_page()
+
+        local_server.route("POST", "/vestibule", _etag_handler('"v2"'))
+        assert not getattr(client.get_vestibules_on_page(), "from_cache", False)
+        assert client.get_vestibules_on_page().from_cache
+        assert cache.stats() == {"hits": 1, "misses": 2, "stores": 2}
+
+    def test_request_body_in_key(self, local_server, env_token, tmp_path):
+        """Разные страницы списочного POST хранятся отдельно"""
+        local_server.route("POST", "/vestibule", _etag_handler())
+        client = _client(local_server, DiskCache(str(tmp_path), methods=("POST",)))
+
+        client.get_vestibules_on_page(page=1)
+        client.get_vestibules_on_page(page=2)
+
+        assert all("If-None-Match" not in r["headers"] for r in local_server.requests)
+
+    def test_last_modified(self, local_server, env_token, tmp_path):
+        """Без ETag проверка идет по Last-Modified"""
+        stamp = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+        def handler(request):
+            if request["headers"].get("If-Modified-Since") == stamp:
+                return 304, {}, b""
+            return 200, {"Last-Modified": stamp}, VESTIBULES
+
+        local_server.route("GET", "/road-section", handler)
+        client = DigitalTwinAPIClient(transport=HTTPTransport(disk_cache=DiskCache(str(tmp_path))))
+        client.road_network_url = local_server.url
+        client.get_road_sections_list()
+
+        response = client.get_road_sections_list()
+        assert response.from_cache
+        assert response.json() == VESTIBULES
+
+    def test_async_transport(self, local_server, env_token, tmp_path):
+        """Асинхронный транспорт использует тот же каталог"""
+        local_server.route("POST", "/vestibule", _etag_handler())
+        cache = DiskCache(str(tmp_path), methods=("POST",))
+        _client(local_server, cache).get_vestibules_on_page()
+
+        async def main():
+            transport = AsyncHTTPTransport(disk_cache=cache)
+            client = AsyncMetroAPIClient(transport=transport)
+            client.base_url = local_server.url
+            response = await client.get_vestibules_on_page()
+            await transport.aclose()
+            return response
+
+        response = asyncio.run(main())
+        assert response.status_code == 200
+        assert response.json() == VESTIBULES
+        assert cache.stats()["hits"] == 1
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Тесты локального пространственного индекса
+"""
+
+import random
+import threading
+import time
+
+import pytest
+
+from api_clients import DigitalTwinAPIClient
+from api_clients.geo import (
+    GridIndex, distance_m, feature_points, point_in_ring, points_bbox, polygon_payload, polygon_ring,
+    split_polygon
+)
+
+
+def _features():
+    rng = random.Random(7)
+    features = [
+        {"id": i, "name": f"Объект {i}", "lon": str(rng.uniform(30.0, 30.5)), "lat": str(rng.uniform(59.8, 60.1))}
+        for i in range(300)
+    ]
+    features.append({"id": "road", "geometry": {"type": "LineString", "coordinates": [[30.01, 59.81], [30.49, 60.09]]}})
+    return features
+
+
+def _in_bbox(feature, bbox):
+    return any(bbox[0] <= lon <= bbox[2] and bbox[1] <= lat <= bbox[3] for lon, lat in feature_points(feature))
+
+
+def _digital_twin_client(local_server, features, delay=0.0):
+    """Клиент, сервер которого отдает объекты из прямоугольника полигона запроса"""
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def handler(request):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(delay)
+        bbox = points_bbox(polygon_ring(request["json"]))
+        with lock:
+            active["now"] -= 1
+        return 200, {}, {"success": True, "data": [f for f in features if _in_bbox(f, bbox)]}
+
+    local_server.route("POST", "/rn/infrastructure/polygon", handler)
+    local_server.route("POST", "/rn/road-section/polygon", handler)
+    local_server.active = active
+    client = DigitalTwinAPIClient()
+    client.road_network_url = local_server.url + "/rn"
+    return client
+
+
+class TestGeo:
+    """Индекс по сетке и догрузка незагруженных ячеек"""
+
+    def test_queries_match_brute_force(self):
+        features = _features()
+        points = features[:-1]
+        index = GridIndex(cell_size=0.03)
+        assert all(index.insert(feature) for feature in features)
+        assert not index.insert({"id": "nowhere"})
+        assert len(index) == len(features)
+
+        ring = [(30.1, 59.85), (30.4, 59.9), (30.25, 60.05)]
+        expected = {f["id"] for f in points if point_in_ring(float(f["lon"]), float(f["lat"]), ring)}
+        assert {f["id"] for f in index.query_polygon(polygon_payload(ring))} == expected | {"road"}
+
+        bbox = (30.2, 59.9, 30.3, 60.0)
+        expected = {f["id"] for f in points if _in_bbox(f, bbox)}
+        assert {f["id"] for f in index.query_bbox(bbox)} == expected | {"road"}
+
+        lon, lat = 30.33, 59.93
+        brute = sorted(distance_m(lon, lat, feature_points(f)) for f in features)[:5]
+        assert [distance for distance, _ in index.nearest(lon, lat, k=5)] == pytest.approx(brute)
+        assert index.nearest(lon, lat, k=3, max_distance=1.0) == []
+
+        index.remove("road")
+        assert "road" not in index
+        assert "road" not in {f["id"] for f in index.query_bbox(bbox)}
+
+    def test_fetches_only_missing_cells(self, local_server, env_token):
+        features = [f for f in _features() if f["id"] != "road"]
+        client = _digital_twin_client(local_server, features)
+        index = client.infrastructure_index(cell_size=0.05)
+        bbox = (30.11, 59.86, 30.19, 59.94)
+
+        found = index.query_bbox(bbox)
+        assert {f["id"] for f in found} == {f["id"] for f in features if _in_bbox(f, bbox)}
+        # 2x2 ячейки: по запросу на строку
+        assert len(local_server.requests) == index.stats()["requests"] == 2
+
+        index.query_bbox(bbox)
+        index.query_polygon([(30.12, 59.87), (30.18, 59.87), (30.15, 59.93)])
+        assert len(local_server.requests) == 2
+
+        # Сдвиг вправо: запрашивается только новый столбец
+        index.query_bbox((30.11, 59.86, 30.24, 59.94))
+        new_requests = local_server.requests[2:]
+        assert len(new_requests) == 2
+        assert all(points_bbox(polygon_ring(r["json"]))[0] == pytest.approx(30.2) for r in new_requests)
+
+        index.invalidate(bbox)
+        assert index.missing_cells(bbox)
+        assert not index.missing_cells((30.21, 59.86, 30.24, 59.94))
+
+    def test_fetch_outside_lock(self, local_server, env_token):
+        """Загруженные ячейки доступны во время запроса другой области; ячейка запрашивается один раз"""
+        features = [f for f in _features() if f["id"] != "road"]
+        client = _digital_twin_client(local_server, features, delay=0.3)
+        index = client.infrastructure_index(cell_size=0.05)
+        loaded, pending = (30.31, 59.86, 30.34, 59.89), (30.11, 59.86, 30.14, 59.89)
+        index.query_bbox(loaded)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(index.query_bbox(pending))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        found = index.query_bbox(loaded)
+        assert time.perf_counter() - started < 0.1, "Запрос загруженной области ждал чужой загрузки"
+        for thread in threads:
+            thread.join()
+
+        assert {f["id"] for f in found} == {f["id"] for f in features if _in_bbox(f, loaded)}
+        expected = {f["id"] for f in features if _in_bbox(f, pending)}
+        assert [{f["id"] for f in result} for result in results] == [expected, expected]
+        assert len(local_server.requests) == index.stats()["requests"] == 2
+
+    def test_tiled_query(self, local_server, env_token):
+        """Плитки запрашиваются параллельно, объекты с границ плиток не повторяются"""
+        features = _features()
+        client = _digital_twin_client(local_server, features, delay=0.05)
+        polygon = client.generate_test_polygon()
+
+        tiles = split_polygon(polygon, rows=2, cols=3)
+        assert len(tiles) == 6
+        assert sum(len(tile) for tile in tiles) == 24
+
+        sections = list(client.iter_road_sections_tiled(polygon, rows=2, cols=3, workers=6))
+        assert len(local_server.requests) == 6
+        assert local_server.active["max"] > 1
+        ids = [section["id"] for section in sections]
+        assert len(ids) == len(set(ids))
+        whole = points_bbox(polygon_ring(polygon))
+        assert set(ids) == {f["id"] for f in features if _in_bbox(f, whole)}
+        assert "road" in ids
+
+        # Треугольник: плитки вне полигона не запрашиваются
+        triangle = [(30.0, 59.8), (30.5, 59.8), (30.0, 60.1)]
+        assert len(split_polygon(triangle, rows=4, cols=4)) == 10
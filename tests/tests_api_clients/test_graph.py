@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Тесты компактного графа УДС
+"""
+
+import math
+import random
+
+import pytest
+
+from api_clients import DigitalTwinAPIClient
+from api_clients.graph import haversine_m, load_graph
+
+
+def _grid_graph(size=12, seed=3):
+    """Решетка size x size со случайно выброшенными ребрами и длинами"""
+    rng = random.Random(seed)
+    nodes = [{"id": f"n{x}-{y}", "lon": str(30.0 + x * 0.01), "lat": str(59.9 + y * 0.005)}
+             for x in range(size) for y in range(size)]
+    edges = []
+    for x in range(size):
+        for y in range(size):
+            for dx, dy in ((1, 0), (0, 1)):
+                if x + dx < size and y + dy < size and rng.random() < 0.8:
+                    edges.append({"id": len(edges), "source": f"n{x}-{y}", "target": f"n{x + dx}-{y + dy}",
+                                  "length": rng.uniform(600, 1500)})
+    return {"nodes": nodes, "edges": edges}
+
+
+def _dijkstra_reference(body, source):
+    adjacency = {}
+    for edge in body["edges"]:
+        adjacency.setdefault(edge["source"], []).append((edge["target"], edge["length"]))
+        adjacency.setdefault(edge["target"], []).append((edge["source"], edge["length"]))
+    distance = {source: 0.0}
+    done = set()
+    while True:
+        candidates = [(d, n) for n, d in distance.items() if n not in done]
+        if not candidates:
+            return distance
+        d, node = min(candidates)
+        done.add(node)
+        for neighbor, weight in adjacency.get(node, []):
+            if d + weight < distance.get(neighbor, math.inf):
+                distance[neighbor] = d + weight
+
+
+class TestCompactGraph:
+    """CSR-граф: соседи, компоненты, пути и разные имена полей"""
+
+    def test_paths_match_reference(self):
+        body = _grid_graph()
+        graph = load_graph(body)
+        assert graph.node_count == 144 and graph.edge_count == len(body["edges"])
+        assert len(graph.targets) == 2 * graph.edge_count
+
+        reference = _dijkstra_reference(body, "n0-0")
+        for target in ("n11-11", "n5-7", "n0-11"):
+            expected = reference.get(target, math.inf)
+            distance, path = graph.shortest_path("n0-0", target)
+            assert distance == pytest.approx(expected)
+            if path:
+                assert path[0] == "n0-0" and path[-1] == target
+                assert sum(dict(graph.neighbors(a))[b] for a, b in zip(path, path[1:])) == pytest.approx(distance)
+                assert len(graph.path_edges(path)) == len(path) - 1
+            assert graph.astar("n0-0", target)[0] == pytest.approx(expected)
+
+        labels = graph.component_labels()
+        reachable = [node_id for node_id in graph.ids if node_id in reference]
+        assert len({labels[graph.index_of(node_id)] for node_id in reachable}) == 1
+        assert sum(len(component) for component in graph.components()) == graph.node_count
+        assert graph.nearest_node(30.051, 59.921) == "n5-4"
+
+    def test_field_variants_and_oneway(self):
+        """Концы в from/to и вложенных узлах, вес по геометрии или координатам, oneway"""
+        body = {
+            "nodes": [
+                {"id": 1, "geometry": {"type": "Point", "coordinates": [30.0, 60.0]}},
+                {"id": 2, "lat": 60.0, "lon": 30.01},
+                {"id": 3, "lat": 60.01, "lon": 30.01},
+            ],
+            "edges": [
+                {"id": "a", "from": 1, "to": {"id": 2}},
+                {"id": "b", "start_node": 2, "end_node": 3, "oneway": True,
+                 "geometry": {"type": "LineString", "coordinates": [[30.01, 60.0], [30.02, 60.005], [30.01, 60.01]]}},
+                {"id": "c", "source_id": 4, "target_id": 1, "weight": "5"},
+                {"id": "broken"},
+            ],
+        }
+        graph = load_graph(body)
+        assert graph.edge_count == 3 and graph.node_count == 4
+        assert dict(graph.neighbors(1))[2] == pytest.approx(haversine_m(30.0, 60.0, 30.01, 60.0))
+        assert dict(graph.neighbors(2))[3] > haversine_m(30.01, 60.0, 30.01, 60.01)
+        assert 2 not in dict(graph.neighbors(3))
+        assert graph.shortest_path(3, 1) == (math.inf, [])
+        assert graph.shortest_path(4, 3)[1] == [4, 1, 2, 3]
+        assert graph.degree(1) == 2
+        assert math.isnan(graph.coordinates(4)[0])
+        with pytest.raises(KeyError):
+            graph.neighbors(99)
+
+    def test_load_from_stream(self, local_server, env_token):
+        body = _grid_graph(size=5)
+        body = {"edges": body["edges"], "nodes": body["nodes"]}   # ребра раньше узлов
+        local_server.route("POST", "/g/v2/get-graph", lambda request: (200, {}, body))
+        client = DigitalTwinAPIClient()
+        client.cifdv_graph_url = local_server.url + "/g"
+
+        graph = client.load_compact_graph({"type": "Feature"}, zoom=14)
+        assert local_server.requests[0]["json"]["zoom"] == 14
+        assert graph.node_count == 25
+        assert graph.coordinates("n4-4") == (30.04, 59.92)
+        # координаты 16 байт на узел, offsets 8, ненаправленное ребро - две позиции по 16 байт
+        assert graph.memory_bytes() == 16 * 25 + 8 * 26 + 32 * len(body["edges"])
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Тесты инкрементальной синхронизации графа по ревизиям
+"""
+
+import pytest
+
+from api_clients import DigitalTwinAPIClient
+
+
+class _GraphServer:
+    """
+    Ревизии, узлы и атрибуты cifdv-graph; фильтр revision_id отдает записи одной ревизии
+
+    filtering=False - сервер игнорирует фильтр, revision_field=False - записи без поля revision_id
+    """
+
+    def __init__(self, local_server, filtering=True, revision_field=True):
+        self.filtering = filtering
+        self.revision_field = revision_field
+        self.revisions = []
+        self.nodes = {}
+        self.attributes = {}
+        self.history = []      # (ревизия, коллекция, запись)
+        for path, collection in (("/g/nodes", "nodes"), ("/g/v2/attributes", "attributes")):
+            local_server.route("GET", path, self._list(collection))
+        local_server.route("GET", "/g/v2/revisions", lambda request: (200, {}, self._page(self.revisions, request)))
+
+    @staticmethod
+    def _page(items, request):
+        page, per_page = int(request["query"]["page"]), int(request["query"]["per_page"])
+        return {"items": items[(page - 1) * per_page:page * per_page], "total": len(items)}
+
+    def _list(self, collection):
+        def handler(request):
+            revision = request["query"].get("revision_id")
+            if revision is None or not self.filtering:
+                items = list(getattr(self, collection).values())
+                if not self.revision_field:
+                    items = [{k: v for k, v in item.items() if k != "revision_id"} for item in items]
+            else:
+                items = [item for rev, name, item in self.history if rev == revision and name == collection]
+            return 200, {}, self._page(items, request)
+        return handler
+
+    def commit(self, revision_id, parent=None, nodes=(), attributes=(), deleted_nodes=()):
+        self.revisions.append({"id": revision_id, "parent_id": parent, "created_at": f"2026-01-0{len(self.revisions) + 1}"})
+        for node in nodes:
+            self.nodes[node["id"]] = dict(node, revision_id=revision_id)
+            self.history.append((revision_id, "nodes", self.nodes[node["id"]]))
+        for attribute in attributes:
+            self.attributes[attribute["id"]] = dict(attribute, revision_id=revision_id)
+            self.history.append((revision_id, "attributes", self.attributes[attribute["id"]]))
+        for node_id in deleted_nodes:
+            self.nodes.pop(node_id)
+            self.history.append((revision_id, "nodes", {"id": node_id, "deleted": True, "revision_id": revision_id}))
+
+
+def _client(local_server):
+    client = DigitalTwinAPIClient()
+    client.cifdv_graph_url = local_server.url + "/g"
+    return client
+
+
+def _requests(local_server, path):
+    return [r for r in local_server.requests if r["path"] == path]
+
+
+class TestGraphSync:
+    """Полная загрузка, применение новых ревизий и разрыв цепочки"""
+
+    def test_incremental_after_full_load(self, local_server, env_token, tmp_path):
+        server = _GraphServer(local_server)
+        server.commit("r1", nodes=[{"id": i, "lat": "60.0", "lon": "30.0"} for i in range(250)],
+                      attributes=[{"id": "a1", "name": "Полосность"}])
+        path = str(tmp_path / "graph.json")
+        sync = _client(local_server).graph_sync(path=path)
+
+        result = sync.sync()
+        assert result.mode == "full" and result.reason == "локальная копия пуста"
+        assert len(sync.store.nodes) == 250 and sync.store.revision == "r1"
+
+        assert sync.sync().mode == "noop"
+
+        server.commit("r2", parent="r1", nodes=[{"id": 5, "lat": "60.1", "lon": "30.1"}], deleted_nodes=[7])
+        server.commit("r3", parent="r2", attributes=[{"id": "a2", "name": "Покрытие"}])
+        local_server.requests.clear()
+
+        # Новый процесс продолжает с сохраненной ревизии
+        sync = _client(local_server).graph_sync(path=path)
+        assert sync.store.revision == "r1"
+        result = sync.sync()
+        assert result.mode == "incremental" and result.revisions == ["r2", "r3"]
+        assert (result.nodes_changed, result.attributes_changed) == (2, 1)
+        assert sync.store.nodes[5]["lat"] == "60.1" and 7 not in sync.store.nodes
+        assert set(sync.store.attributes) == {"a1", "a2"}
+        assert sync.store.revision == "r3"
+        # Запрошены только записи новых ревизий
+        node_requests = _requests(local_server, "/g/nodes")
+        assert [r["query"].get("revision_id") for r in node_requests] == ["r2", "r3"]
+        assert "Изменений нет" not in result.summary()
+
+    def test_broken_chain_falls_back_to_full_load(self, local_server, env_token):
+        server = _GraphServer(local_server)
+        server.commit("r1", nodes=[{"id": 1}, {"id": 2}])
+        sync = _client(local_server).graph_sync()
+        sync.sync()
+
+        # Ревизия от другого родителя
+        server.commit("r2", parent="r0", nodes=[{"id": 3}])
+        result = sync.sync()
+        assert result.mode == "full" and "r0" in result.reason
+        assert set(sync.store.nodes) == {1, 2, 3} and sync.store.revision == "r2"
+
+        # Примененной ревизии больше нет в списке
+        server.revisions = [{"id": "r9", "created_at": "2026-02-01"}]
+        result = sync.sync()
+        assert result.mode == "full" and sync.store.revision == "r9"
+
+        local_server.requests.clear()
+        assert sync.sync(full=True).mode == "full"
+        assert all("revision_id" not in r["query"] for r in _requests(local_server, "/g/nodes"))
+
+    @pytest.mark.parametrize("revision_field", [True, False])
+    def test_ignored_filter_falls_back_to_full_load(self, local_server, env_token, revision_field):
+        """Сервер не применяет revision_id: удаление не теряется, выполняется полная загрузка"""
+        server = _GraphServer(local_server, filtering=False, revision_field=revision_field)
+        server.commit("r1", nodes=[{"id": 1}, {"id": 2}])
+        sync = _client(local_server).graph_sync()
+        sync.sync()
+
+        server.commit("r2", parent="r1", nodes=[{"id": 3}], deleted_nodes=[2])
+        local_server.requests.clear()
+        result = sync.sync()
+        assert result.mode == "full" and "revision_id" in result.reason
+        assert set(sync.store.nodes) == {1, 3} and sync.store.revision == "r2"
+        # Одна отфильтрованная страница узлов, затем полная выгрузка
+        filtered = [r for r in _requests(local_server, "/g/nodes") if "revision_id" in r["query"]]
+        assert len(filtered) == 1
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Тесты кэша плиток графа УДС
+"""
+
+import pytest
+
+from api_clients import DigitalTwinAPIClient
+from api_clients.geo import points_bbox, polygon_ring
+from api_clients.graph import load_graph
+from api_clients.graph_tiles import lonlat_to_tile, tile_bbox
+
+
+def _graph_server(local_server):
+    """Узлы решетки 0.01 градуса; ребро между соседями по долготе, ребра на границах плиток повторяются"""
+    nodes = {(x, y): {"id": f"n{x}-{y}", "lon": 30.0 + x * 0.01, "lat": 59.9 + y * 0.01}
+             for x in range(40) for y in range(20)}
+
+    def handler(request):
+        min_lon, min_lat, max_lon, max_lat = points_bbox(polygon_ring(request["json"]["geometry"]))
+        inside = {key for key, node in nodes.items()
+                  if min_lon <= node["lon"] < max_lon and min_lat <= node["lat"] < max_lat}
+        edges = [{"id": f"e{x}-{y}", "source": f"n{x}-{y}", "target": f"n{x + 1}-{y}", "length": 1.0}
+                 for x, y in sorted(nodes) if (x + 1, y) in nodes and ((x, y) in inside or (x + 1, y) in inside)]
+        return 200, {}, {"nodes": [nodes[key] for key in sorted(inside)], "edges": edges}
+
+    local_server.route("POST", "/g/v2/get-graph", handler)
+    client = DigitalTwinAPIClient()
+    client.cifdv_graph_url = local_server.url + "/g"
+    return client
+
+
+class TestGraphTiles:
+    """Сборка окна из плиток, догрузка недостающих, LRU по байтам и ревизия"""
+
+    def test_tile_math(self):
+        x, y = lonlat_to_tile(30.3, 59.95, 12)
+        min_lon, min_lat, max_lon, max_lat = tile_bbox(x, y, 12)
+        assert min_lon <= 30.3 < max_lon and min_lat <= 59.95 < max_lat
+        assert tile_bbox(0, 0, 0)[0] == -180.0 and tile_bbox(0, 0, 0)[3] == pytest.approx(85.0511, abs=1e-4)
+
+    def test_viewport_from_tiles(self, local_server, env_token):
+        client = _graph_server(local_server)
+        tiles = client.graph_tile_cache()
+        viewport = (30.05, 59.95, 30.2, 60.0)
+        expected_tiles = tiles.tiles_for(viewport, zoom=11)
+        assert 1 < len(expected_tiles) <= 4
+
+        graph = tiles.get_viewport(viewport, zoom=11)
+        assert len(local_server.requests) == len(expected_tiles)
+        assert all(request["json"]["zoom"] == 11 for request in local_server.requests)
+        node_ids = [node["id"] for node in graph["nodes"]]
+        edge_ids = [edge["id"] for edge in graph["edges"]]
+        assert len(node_ids) == len(set(node_ids)) and len(edge_ids) == len(set(edge_ids))
+        assert "n10-7" in node_ids
+        assert load_graph(graph).node_count >= len(node_ids)
+
+        # Повтор - из кэша; другой zoom - новые плитки
+        assert tiles.get_viewport(viewport, zoom=11) == graph
+        assert len(local_server.requests) == len(expected_tiles)
+        assert tiles.stats()["hits"] == len(expected_tiles)
+        tiles.get_viewport(viewport, zoom=10)
+        after_zoom = len(local_server.requests)
+        assert after_zoom > len(expected_tiles)
+
+        # Сдвиг окна - запрашиваются только новые плитки
+        shifted = (30.15, 59.95, 30.3, 60.0)
+        new_tiles = set(tiles.tiles_for(shifted, zoom=11)) - set(expected_tiles)
+        tiles.get_viewport(shifted, zoom=11)
+        assert len(local_server.requests) - after_zoom == len(new_tiles)
+
+        tiles.set_revision("r2")
+        tiles.get_viewport(viewport, zoom=11)
+        assert len(local_server.requests) - after_zoom == len(new_tiles) + len(expected_tiles)
+
+    def test_lru_by_bytes(self, local_server, env_token):
+        client = _graph_server(local_server)
+        x, y = lonlat_to_tile(30.1, 59.95, 12)
+        viewports = []
+        for dx in range(3):
+            min_lon, min_lat, max_lon, max_lat = tile_bbox(x + dx, y, 12)
+            viewports.append((min_lon + 1e-6, min_lat + 1e-6, max_lon - 1e-6, max_lat - 1e-6))
+
+        probe = client.graph_tile_cache()
+        probe.get_viewport(viewports[0], zoom=12)
+        tile_size = probe.stats()["bytes"]
+
+        tiles = client.graph_tile_cache(max_bytes=int(tile_size * 1.5))
+        for viewport in viewports:
+            assert len(tiles.tiles_for(viewport, zoom=12)) == 1
+            tiles.get_viewport(viewport, zoom=12)
+        stats = tiles.stats()
+        assert stats["evictions"] >= 1
+        assert 0 < stats["bytes"] <= tiles.max_bytes
+        assert tiles.invalidate() == stats["tiles"]
+        assert tiles.stats()["bytes"] == 0
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Тесты событий запросов и обработчиков (hooks)
+"""
+
+import asyncio
+import json
+import logging
+
+import pytest
+
+from api_clients import IncidentsAPIClient, ParkingAPIClient
+from api_clients.aio import AsyncHTTPTransport, AsyncParkingAPIClient
+from api_clients.hooks import (
+    HistogramSink, Hooks, JSONLSink, LogSink, endpoint_template, sinks_from_spec
+)
+from api_clients.policy import RequestPolicy
+from api_clients.transport import HTTPTransport
+
+
+def _parking_client(local_server, hooks, **options):
+    client = ParkingAPIClient(transport=HTTPTransport(hooks=hooks, **options))
+    client.base_url = local_server.url
+    return client
+
+
+class TestHooks:
+    """Событие на каждый вызов клиента и встроенные обработчики"""
+
+    def test_event_fields_and_phases(self, local_server, env_token):
+        """Клиент, метод, шаблон эндпоинта, статус, размеры и фазы"""
+        body = {"success": True, "data": {"id": 15, "name": "i"}}
+        local_server.route("GET", "/incident/15", lambda request: (200, {}, body))
+        events = []
+        hooks = Hooks()
+        hooks.add(events.append)
+        client = IncidentsAPIClient(transport=HTTPTransport(hooks=hooks))
+        client.base_url = local_server.url
+
+        client.get_incident_by_id(15)
+        client.get_incident_by_id_typed(15)
+
+        first, second = events
+        assert first.client == "IncidentsAPIClient"
+        assert first.method == second.method == "get_incident_by_id"
+        assert (first.http_method, first.endpoint, first.status) == ("GET", "/incident/{id}", 200)
+        assert first.bytes_received == len(json.dumps(body))
+        assert first.bytes_sent == 0
+        assert first.attempts == 1 and first.ok
+        timings = first.timings
+        assert timings["connect"] > 0 and timings["server"] > 0
+        assert timings["total"] >= timings["dns"] + timings["connect"] + timings["server"]
+        # Второй запрос идет по открытому соединению
+        assert second.timings["connect"] == 0 and second.timings["dns"] == 0
+
+    def test_retries_and_errors(self, local_server, env_token):
+        """Повторы учитываются в attempts и retry, исключение - в error"""
+        statuses = iter([503, 200])
+        local_server.route("GET", "/parking", lambda request: (next(statuses), {}, {"success": True}))
+        events = []
+        hooks = Hooks()
+        hooks.add(events.append)
+        policy = RequestPolicy(retries=1, backoff_factor=0.05, jitter=False)
+        client = _parking_client(local_server, hooks, policy=policy)
+
+        client.get_parking_list()
+        assert events[0].status == 200
+        assert events[0].attempts == 2
+        assert events[0].timings["retry"] == pytest.approx(0.05)
+
+        client.base_url = "http://127.0.0.1:1"
+        with pytest.raises(Exception):
+            client.get_parking_list()
+        assert events[1].status is None
+        assert events[1].error.startswith("ConnectionError")
+        assert not events[1].ok
+
+    def test_failing_hook_does_not_break_request(self, local_server, env_token):
+        local_server.route("GET", "/parking", lambda request: (200, {}, {"success": True}))
+        hooks = Hooks()
+        hooks.add(lambda event: 1 / 0)
+        client = _parking_client(local_server, hooks)
+        assert client.get_parking_list().status_code == 200
+
+    def test_sinks(self, local_server, env_token, tmp_path, caplog):
+        """Лог, гистограмма и JSONL"""
+        local_server.route("GET", "/parking", lambda request: (200, {}, {"success": True, "data": []}))
+        local_server.route("DELETE", "/parking/3", lambda request: (404, {}, {"success": False}))
+        histogram = HistogramSink()
+        jsonl = JSONLSink(str(tmp_path / "events.jsonl"))
+        hooks = Hooks()
+        for sink in (histogram, jsonl, LogSink()):
+            hooks.add(sink)
+        client = _parking_client(local_server, hooks)
+
+        with caplog.at_level(logging.INFO, logger="api_clients.requests"):
+            for _ in range(3):
+                client.get_parking_list()
+            client.delete_parking(3)
+        jsonl.close()
+
+        stats = histogram.stats()
+        assert stats["ParkingAPIClient GET /parking"]["count"] == 3
+        assert stats["ParkingAPIClient DELETE /parking/{id}"]["errors"] == 1
+        assert 0 < stats["ParkingAPIClient GET /parking"]["p50_ms"] <= stats["ParkingAPIClient GET /parking"]["max_ms"]
+        assert "/parking/{id}" in histogram.format()
+
+        lines = [json.loads(line) for line in (tmp_path / "events.jsonl").read_text(encoding="utf-8").splitlines()]
+        assert [line["method"] for line in lines] == ["get_parking_list"] * 3 + ["delete_parking"]
+        assert lines[-1]["status"] == 404
+        assert "ParkingAPIClient.delete_parking DELETE /parking/{id} -> 404" in caplog.text
+
+    def test_async_client(self, local_server, env_token):
+        local_server.route("GET", "/parking", lambda request: (200, {}, {"success": True, "data": []}))
+        events = []
+        hooks = Hooks()
+        hooks.add(events.append)
+
+        async def run():
+            client = AsyncParkingAPIClient(transport=AsyncHTTPTransport(hooks=hooks))
+            client.base_url = local_server.url
+            await asyncio.gather(client.get_parking_list(), client.get_parking_list())
+            await client.http.aclose()
+
+        asyncio.run(run())
+        assert [event.method for event in events] == ["get_parking_list"] * 2
+        assert all(event.status == 200 and event.attempts == 1 for event in events)
+        assert any(event.timings["connect"] > 0 for event in events)
+        assert all(event.timings["server"] > 0 for event in events)
+
+    def test_spec_and_template(self, tmp_path):
+        sinks = sinks_from_spec(f"histogram, jsonl:{tmp_path / 'e.jsonl'}")
+        assert [type(sink) for sink in sinks] == [HistogramSink, JSONLSink]
+        sinks[1].close()
+        with pytest.raises(ValueError):
+            sinks_from_spec("statsd")
+        assert endpoint_template("http://h/api/v1/vehicle/12/history") == "/api/v1/vehicle/{id}/history"
+        uuid = "0f8fad5b-d9cb-469f-a165-70867728950e"
+        assert endpoint_template(f"http://h/collection/{uuid}") == "/collection/{id}"
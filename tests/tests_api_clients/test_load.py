@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Тесты нагрузочного прогона сценария
+"""
+
+import random
+
+import pytest
+
+from api_clients import DTPAPIClient, IncidentsAPIClient, ParkingAPIClient
+from api_clients.load import LoadRunner, Scenario, ScenarioCall
+from api_clients.transport import HTTPTransport
+
+
+def _clients(local_server):
+    transport = HTTPTransport(pool_size=16)
+    clients = {
+        "parking": ParkingAPIClient(transport=transport),
+        "dtp": DTPAPIClient(transport=transport),
+        "incidents": IncidentsAPIClient(transport=transport),
+    }
+    for client in clients.values():
+        client.base_url = local_server.url
+    return clients
+
+
+def _scenario(**options):
+    return Scenario.from_dict(dict({
+        "name": "test",
+        "interval": 0.1,
+        "calls": [
+            {"client": "parking", "method": "get_parking_list", "weight": 70},
+            {"client": "dtp", "method": "get_dtp_list", "weight": 20},
+            {"client": "incidents", "method": "create_incident", "weight": 10,
+             "params": {"name": "Нагрузка {seq}", "description": "d"}},
+        ],
+    }, **options))
+
+
+def _routes(local_server):
+    ok = lambda request: (200, {}, {"success": True, "data": []})  # noqa: E731
+    local_server.route("GET", "/parking", ok)
+    local_server.route("POST", "/dtp/api/v2/dtp/list", lambda request: (500, {}, {"success": False}))
+    local_server.route("POST", "/incident", ok)
+
+
+class TestLoad:
+    """Режимы нагрузки, веса вызовов и отчет"""
+
+    def test_weights(self):
+        """Вызовы выбираются пропорционально весам"""
+        scenario = _scenario()
+        rng = random.Random(1)
+        picked = [scenario.pick(rng).method for _ in range(10000)]
+        assert 0.67 < picked.count("get_parking_list") / 10000 < 0.73
+        assert 0.08 < picked.count("create_incident") / 10000 < 0.12
+
+    def test_invalid_scenario(self):
+        with pytest.raises(ValueError):
+            ScenarioCall("parking", "no_such_method")
+        with pytest.raises(ValueError):
+            _scenario(mode="open")
+
+    def test_closed_loop(self, local_server, env_token):
+        """Фиксированное число пользователей, ошибки и номер запроса в аргументах"""
+        _routes(local_server)
+        report = LoadRunner(_scenario(mode="closed", concurrency=4, duration=0.4),
+                            clients=_clients(local_server), seed=1).run()
+
+        assert report.requests > 20
+        assert report.requests == len(local_server.requests)
+        assert report.errors == report.calls["dtp.get_dtp_list"].requests > 0
+        assert report.calls["dtp.get_dtp_list"].status_codes == {500: report.errors}
+        assert report.calls["parking.get_parking_list"].errors == 0
+        names = [r["json"]["name"] for r in local_server.requests if r["path"] == "/incident"]
+        assert names and all(name.startswith("Нагрузка ") and "{seq}" not in name for name in names)
+        assert len(set(names)) == len(names)
+        assert sum(count for _, count in report.latency.buckets()) == report.requests
+
+    def test_open_loop_rate(self, local_server, env_token):
+        """Вызовы запускаются с заданной частотой, окна отчета покрывают прогон"""
+        _routes(local_server)
+        report = LoadRunner(_scenario(mode="open", rps=100, concurrency=8, duration=0.5),
+                            clients=_clients(local_server), seed=2).run()
+
+        assert report.requests == 50
+        assert 60 < report.throughput <= 110
+        assert sum(requests for requests, _ in report.windows) == 50
+        data = report.to_dict()
+        assert data["requests"] == 50
+        assert data["latency_ms"]["p50"] <= data["latency_ms"]["p99"]
+        assert "Гистограмма" in report.format()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Тесты метрик запросов в формате Prometheus
+"""
+
+import urllib.request
+
+from api_clients import DigitalTwinAPIClient, ParkingAPIClient
+from api_clients.aio import AsyncParkingAPIClient
+from api_clients.hooks import Hooks, RequestEvent
+from api_clients.metrics import MetricsCollector, service_name, start_http_server, write_textfile
+from api_clients.transport import HTTPTransport
+
+
+def _sample(text, line_start):
+    """Значение первой строки метрики, начинающейся с line_start"""
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"Нет строки {line_start!r}")
+
+
+class TestMetrics:
+    """Счетчики, гистограммы и способы публикации"""
+
+    def test_labels_and_histogram(self, local_server, env_token):
+        local_server.route("GET", "/parking", lambda request: (200, {}, {"success": True, "data": []}))
+        local_server.route("DELETE", "/parking/7", lambda request: (500, {}, {"success": False}))
+        collector = MetricsCollector()
+        hooks = Hooks()
+        hooks.add(collector)
+        client = ParkingAPIClient(transport=HTTPTransport(hooks=hooks))
+        client.base_url = local_server.url
+
+        client.get_parking_list()
+        client.get_parking_list()
+        client.delete_parking(7)
+        text = collector.render()
+
+        ok = 'service="parking",endpoint="/parking",method="GET",status_class="2xx"'
+        failed = 'service="parking",endpoint="/parking/{id}",method="DELETE",status_class="5xx"'
+        assert _sample(text, f"api_client_requests_total{{{ok}}}") == 2
+        assert _sample(text, f"api_client_requests_total{{{failed}}}") == 1
+        assert _sample(text, f'api_client_request_duration_seconds_bucket{{{ok},le="+Inf"}}') == 2
+        assert _sample(text, f'api_client_request_duration_seconds_bucket{{{ok},le="30.0"}}') == 2
+        assert _sample(text, f"api_client_request_duration_seconds_count{{{ok}}}") == 2
+        assert _sample(text, f"api_client_request_duration_seconds_sum{{{ok}}}") > 0
+        assert _sample(text, f"api_client_response_bytes_total{{{ok}}}") > 0
+        assert "# TYPE api_client_request_duration_seconds histogram" in text
+
+    def test_memory_cache_hits(self, local_server, env_token):
+        """Ответ из кэша в памяти учитывается в cache_hits_total и RequestEvent.from_cache"""
+        local_server.route("GET", "/parking", lambda request: (200, {}, {"success": True, "data": []}))
+        collector = MetricsCollector()
+        events = []
+        hooks = Hooks()
+        hooks.add(collector)
+        hooks.add(events.append)
+        client = ParkingAPIClient(transport=HTTPTransport(hooks=hooks))
+        client.base_url = local_server.url
+        client.http.enable_cache()
+
+        for _ in range(3):
+            client.get_parking_list()
+
+        assert len(local_server.requests) == 1
+        assert [event.from_cache for event in events] == [False, True, True]
+        ok = 'service="parking",endpoint="/parking",method="GET",status_class="2xx"'
+        assert _sample(collector.render(), f"api_client_cache_hits_total{{{ok}}}") == 2
+
+    def test_buckets_are_cumulative(self):
+        collector = MetricsCollector()
+        for duration in (0.001, 0.04, 0.3, 60):
+            collector(RequestEvent("MetroAPIClient", "m", "POST", "http://h/api/v1/vestibule/list",
+                                   status=200, timings={"total": duration}))
+        collector(RequestEvent("MetroAPIClient", "m", "POST", "http://h/api/v1/vestibule/list",
+                               error="ConnectionError: x", attempts=3, timings={"total": 0.01}))
+        text = collector.render()
+        ok = 'service="metro",endpoint="/api/v1/vestibule/list",method="POST",status_class="2xx"'
+        assert _sample(text, f'api_client_request_duration_seconds_bucket{{{ok},le="0.005"}}') == 1
+        assert _sample(text, f'api_client_request_duration_seconds_bucket{{{ok},le="0.05"}}') == 2
+        assert _sample(text, f'api_client_request_duration_seconds_bucket{{{ok},le="0.5"}}') == 3
+        assert _sample(text, f'api_client_request_duration_seconds_bucket{{{ok},le="30.0"}}') == 3
+        assert _sample(text, f'api_client_request_duration_seconds_bucket{{{ok},le="+Inf"}}') == 4
+        assert _sample(text, 'api_client_retries_total{service="metro",endpoint="/api/v1/vestibule/list",'
+                             'method="POST",status_class="error"}') == 2
+
+    def test_service_names(self):
+        assert service_name("DigitalTwinAPIClient") == "digital-twin"
+        assert service_name("AsyncParkingAPIClient") == "parking"
+        assert service_name("WaterTransportAPIClient") == "transport-water"
+        assert service_name(DigitalTwinAPIClient.__name__) == "digital-twin"
+        assert service_name(AsyncParkingAPIClient.__name__) == "parking"
+
+    def test_http_endpoint_and_textfile(self, tmp_path):
+        collector = MetricsCollector()
+        collector(RequestEvent("DTPAPIClient", "get_dtp_list", "POST", "http://h/dtp/api/v2/dtp/list",
+                               status=200, timings={"total": 0.1}))
+        server = start_http_server(0, collector=collector)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url) as response:
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                body = response.read().decode("utf-8")
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'api_client_requests_total{service="dtp",endpoint="/dtp/api/v2/dtp/list"' in body
+
+        path = tmp_path / "api_clients.prom"
+        write_textfile(str(path), collector)
+        assert path.read_text(encoding="utf-8") == collector.render()
+        assert [p.name for p in tmp_path.iterdir()] == ["api_clients.prom"]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Тесты типизированных моделей ответов
+"""
+
+import asyncio
+import sys
+
+import pytest
+import requests
+
+from api_clients import IncidentsAPIClient, OrganizationsAPIClient
+from api_clients.codec import STDLIB_CODEC
+from api_clients.aio import AsyncHTTPTransport, AsyncIncidentsAPIClient
+from api_clients.models import Incident, Organization
+from api_clients.transport import HTTPTransport
+
+
+INCIDENTS = {
+    "success": True,
+    "data": [{"id": i, "name": f"Инцидент {i}", "status_id": 1, "priority": "high"} for i in range(100)],
+    "meta": {"total": 100},
+}
+
+
+def _client(cls, local_server):
+    client = cls(transport=HTTPTransport())
+    client.base_url = local_server.url
+    return client
+
+
+class TestModels:
+    """Слоты, ленивое создание моделей и однократный разбор тела"""
+
+    def test_list_typed(self, local_server, env_token):
+        """Список инцидентов как модели; неизвестные поля - в extra"""
+        local_server.route("POST", "/incident/list", lambda request: (200, {}, INCIDENTS))
+        incidents = _client(IncidentsAPIClient, local_server).get_incidents_list_typed(limit=100)
+
+        assert len(incidents) == 100
+        assert incidents.meta == {"total": 100}
+        first = incidents[0]
+        assert isinstance(first, Incident)
+        assert (first.id, first.name, first.status_id, first.category_id) == (0, "Инцидент 0", 1, None)
+        assert first.get("priority") == "high"
+        assert first.to_dict() == INCIDENTS["data"][0]
+        assert [incident.id for incident in incidents[-2:]] == [98, 99]
+
+    def test_body_decoded_once(self, local_server, env_token, monkeypatch):
+        """Повторные обращения не декодируют тело заново"""
+        local_server.route("POST", "/incident/list", lambda request: (200, {}, INCIDENTS))
+        client = IncidentsAPIClient(transport=HTTPTransport(codec=STDLIB_CODEC))
+        client.base_url = local_server.url
+        incidents = client.get_incidents_list_typed(limit=100)
+        calls = []
+        decode = requests.Response.json
+        monkeypatch.setattr(requests.Response, "json", lambda self, **kw: calls.append(1) or decode(self, **kw))
+
+        for _ in range(3):
+            assert sum(incident.id for incident in incidents) == 4950
+        assert incidents[5] is incidents[5]
+        assert len(calls) == 1
+
+    def test_slotted(self):
+        """У модели нет __dict__, она меньше словаря записи"""
+        record = INCIDENTS["data"][0]
+        incident = Incident.from_dict(record)
+
+        assert not hasattr(incident, "__dict__")
+        with pytest.raises(AttributeError):
+            incident.unknown = 1
+        assert sys.getsizeof(incident) < sys.getsizeof(dict(record, description="", type_id=1))
+
+    def test_one_typed_and_errors(self, local_server, env_token):
+        """Одна запись из data; ошибка HTTP - HTTPError"""
+        local_server.route("GET", "/incident/7", lambda request: (200, {}, {"success": True, "data": {"id": 7}}))
+        client = _client(IncidentsAPIClient, local_server)
+
+        assert client.get_incident_by_id_typed(7) == Incident(id=7)
+        with pytest.raises(requests.HTTPError):
+            client.get_incident_by_id_typed(8)
+
+    def test_nested_organization_list(self, local_server, env_token):
+        """Список организаций лежит в data.data"""
+        body = {"success": True, "data": {"data": [{"id": 1, "title": "ООО", "inn": "7800000000"}], "total": 1}}
+        local_server.route("GET", "/api/organization", lambda request: (200, {}, body))
+        organizations = _client(OrganizationsAPIClient, local_server).organization_list_typed()
+
+        assert organizations[0] == Organization(id=1, title="ООО", inn="7800000000")
+        assert organizations.meta == {"total": 1}
+
+    def test_async_typed(self, local_server, env_token):
+        """Асинхронный клиент возвращает модели после await"""
+        local_server.route("POST", "/incident/list", lambda request: (200, {}, INCIDENTS))
+
+        async def main():
+            transport = AsyncHTTPTransport()
+            client = AsyncIncidentsAPIClient(transport=transport)
+            client.base_url = local_server.url
+            incidents = await client.get_incidents_list_typed(limit=100)
+            await transport.aclose()
+            return incidents
+
+        assert asyncio.run(main())[99].name == "Инцидент 99"
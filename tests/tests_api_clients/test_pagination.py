@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Тесты постраничных итераторов iter_*
+"""
+
+import itertools
+
+from api_clients import OrganizationsAPIClient, ParkingAPIClient
+from api_clients.pagination import fetch_all_pages
+
+
+def _parking_pages(total, with_meta=True):
+    """Обработчик /parking, отдающий total записей постранично"""
+    def handler(request):
+        page = int(request["query"]["page"])
+        limit = int(request["query"]["limit"])
+        ids = list(range((page - 1) * limit + 1, min(page * limit, total) + 1))
+        body = {"success": True, "data": [{"id": i} for i in ids]}
+        if with_meta:
+            body["meta"] = {"current_page": page, "last_page": (total + limit - 1) // limit, "total": total}
+        return 200, {}, body
+    return handler
+
+
+def _organization_pages(total):
+    """Обработчик /api/organization: записи и метаданные во вложенном data.data"""
+    def handler(request):
+        page = int(request["query"]["page"])
+        limit = int(request["query"]["limit"])
+        ids = list(range((page - 1) * limit + 1, min(page * limit, total) + 1))
+        return 200, {}, {"success": True, "data": {
+            "data": [{"id": i, "title": f"Организация {i}"} for i in ids],
+            "current_page": page, "last_page": max((total + limit - 1) // limit, 1),
+            "per_page": limit, "total": total,
+        }}
+    return handler
+
+
+class TestIterList:
+    """Ленивый обход всех страниц"""
+
+    def test_iter_walks_all_pages(self, local_server, env_token):
+        """Все записи всех страниц по одной"""
+        local_server.route("GET", "/parking", _parking_pages(12))
+        client = ParkingAPIClient()
+        client.base_url = local_server.url
+
+        ids = [p["id"] for p in client.iter_parking_list(limit=5)]
+
+        assert ids == list(range(1, 13))
+        assert [r["query"]["page"] for r in local_server.requests] == ["1", "2", "3"]
+
+    def test_iter_without_meta_stops_on_short_page(self, local_server, env_token):
+        """Без meta конец списка определяется по неполной странице"""
+        local_server.route("GET", "/parking", _parking_pages(10, with_meta=False))
+        client = ParkingAPIClient()
+        client.base_url = local_server.url
+
+        ids = [p["id"] for p in client.iter_parking_list(limit=5)]
+
+        assert ids == list(range(1, 11))
+        assert len(local_server.requests) == 3, "Ожидался запрос пустой третьей страницы"
+
+    def test_early_stop_fetches_nothing_extra(self, local_server, env_token):
+        """Остановка обхода не запрашивает лишних страниц"""
+        local_server.route("GET", "/parking", _parking_pages(100))
+        client = ParkingAPIClient()
+        client.base_url = local_server.url
+
+        records = client.iter_parking_list(limit=5)
+        first = list(itertools.islice(records, 3))
+        records.close()
+
+        assert [p["id"] for p in first] == [1, 2, 3]
+        assert len(local_server.requests) == 1
+
+    def test_prefetch_reads_at_most_one_page_ahead(self, local_server, env_token):
+        """С prefetch загружается не больше одной страницы вперед"""
+        local_server.route("GET", "/parking", _parking_pages(12))
+        client = ParkingAPIClient()
+        client.base_url = local_server.url
+
+        assert [p["id"] for p in client.iter_parking_list(limit=5, prefetch=True)] == list(range(1, 13))
+
+        local_server.requests.clear()
+        records = client.iter_parking_list(limit=5, prefetch=True)
+        list(itertools.islice(records, 2))
+        records.close()
+        assert len(local_server.requests) <= 2
+
+    def test_nested_data_pages(self, local_server, env_token):
+        """Вложенный ответ Organizations: записи из data.data, конец по last_page"""
+        local_server.route("GET", "/api/organization", _organization_pages(12))
+        client = OrganizationsAPIClient()
+        client.base_url = local_server.url
+
+        ids = [o["id"] for o in client.iter_organization_list(limit=5)]
+
+        assert ids == list(range(1, 13))
+        assert [r["query"]["page"] for r in local_server.requests] == ["1", "2", "3"]
+
+        local_server.requests.clear()
+        result = fetch_all_pages(lambda page: client.organization_list(page=page, limit=5), 5, workers=3)
+        assert [o["id"] for o in result.records] == list(range(1, 13))
+        assert result.pages == 3 and len(local_server.requests) == 3
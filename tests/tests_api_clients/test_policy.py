@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Тесты политики таймаутов и повторов
+"""
+
+import time
+
+import pytest
+import requests
+
+from api_clients import ParkingAPIClient
+from api_clients.policy import RequestPolicy, parse_retry_after
+from api_clients.transport import HTTPTransport
+
+
+def _flaky(failures, status=503, headers=None):
+    """Обработчик, отвечающий status первые failures раз"""
+    state = {"calls": 0}
+
+    def handler(request):
+        state["calls"] += 1
+        if state["calls"] <= failures:
+            return status, headers or {}, {"success": False}
+        return 200, {}, {"success": True, "data": []}
+    return handler
+
+
+class TestRequestPolicy:
+    """Повторы, Retry-After и таймауты"""
+
+    def test_backoff_grows_and_is_capped(self):
+        """Задержка растет экспоненциально и ограничена backoff_max"""
+        policy = RequestPolicy(backoff_factor=1, backoff_max=5, jitter=False)
+        assert [policy.backoff(n) for n in range(5)] == [1, 2, 4, 5, 5]
+
+        jittered = RequestPolicy(backoff_factor=1, backoff_max=5)
+        assert all(0 <= jittered.backoff(3) <= 5 for _ in range(50))
+
+    def test_parse_retry_after(self):
+        """Retry-After в секундах и в виде HTTP-даты"""
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert parse_retry_after("garbage") is None
+
+    def test_idempotent_request_retried(self, local_server, env_token):
+        """GET повторяется после 503"""
+        local_server.route("GET", "/parking", _flaky(2))
+        client = ParkingAPIClient(transport=HTTPTransport(policy=RequestPolicy(backoff_factor=0.01)))
+        client.base_url = local_server.url
+
+        assert client.get_parking_list().status_code == 200
+        assert len(local_server.requests) == 3
+
+    def test_post_not_retried_by_default(self, local_server, env_token):
+        """POST не повторяется, пока не разрешен явно"""
+        local_server.route("POST", "/parking", _flaky(1))
+        client = ParkingAPIClient(transport=HTTPTransport(policy=RequestPolicy(backoff_factor=0.01)))
+        client.base_url = local_server.url
+        address = client.generate_test_address()
+
+        assert client.create_parking("p", address, "a", "c", "d", 59.9, 30.3).status_code == 503
+        assert len(local_server.requests) == 1
+
+    def test_retry_after_respected(self, local_server, env_token):
+        """Задержка берется из Retry-After"""
+        local_server.route("GET", "/parking", _flaky(1, status=429, headers={"Retry-After": "0.3"}))
+        client = ParkingAPIClient(transport=HTTPTransport(policy=RequestPolicy(backoff_factor=0.01)))
+        client.base_url = local_server.url
+
+        started = time.perf_counter()
+        assert client.get_parking_list().status_code == 200
+        assert time.perf_counter() - started >= 0.3
+
+    def test_endpoint_policy_timeout(self, local_server, env_token):
+        """Политика эндпоинта задает таймаут чтения"""
+        def slow(request):
+            time.sleep(0.5)
+            return 200, {}, {"success": True, "data": []}
+
+        local_server.route("GET", "/parking", slow)
+        client = ParkingAPIClient(transport=HTTPTransport())
+        client.base_url = local_server.url
+        client.http.set_policy(RequestPolicy(read_timeout=0.1, retries=0), endpoint="/parking")
+
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.get_parking_list()
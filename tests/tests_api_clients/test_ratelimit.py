@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Тесты ограничения частоты запросов
+"""
+
+import asyncio
+import threading
+import time
+
+from api_clients import ParkingAPIClient
+from api_clients.aio import AsyncHTTPTransport, AsyncParkingAPIClient
+from api_clients.ratelimit import RateLimiter, TokenBucket
+from api_clients.transport import HTTPTransport
+
+
+def _ok(request):
+    return 200, {}, {"success": True, "data": []}
+
+
+class TestRateLimiter:
+    """Token bucket, префиксы сервисов, потоки и asyncio"""
+
+    def test_bucket_burst_then_rate(self):
+        """Первые burst запросов проходят сразу, дальше - с интервалом 1/rate"""
+        bucket = TokenBucket(rate=10, burst=3)
+        waits = [bucket.reserve() for _ in range(5)]
+
+        assert waits[:3] == [0, 0, 0]
+        assert 0.09 < waits[3] <= 0.1
+        assert 0.19 < waits[4] <= 0.2
+        stats = bucket.stats()
+        assert stats["requests"] == 5 and stats["delayed"] == 2
+        assert abs(stats["total_wait"] - (waits[3] + waits[4])) < 1e-9
+
+    def test_prefix_matching(self):
+        """Запрос учитывается в корзинах всех совпавших префиксов"""
+        limiter = RateLimiter()
+        limiter.set_limit("/", rate=100)
+        limiter.set_limit("/services/dtp", rate=1, burst=1)
+
+        limiter.reserve("https://host/services/dtp/dtp")
+        limiter.reserve("https://host/services/parking/parking")
+        assert limiter.reserve("https://host/services/dtp/dtp") > 0.9
+
+        stats = limiter.stats()
+        assert stats["/"]["requests"] == 3
+        assert stats["/services/dtp"]["requests"] == 2
+
+    def test_prefix_segment_and_host(self):
+        """Префикс совпадает по границе сегмента; корзина с host - только для своего хоста"""
+        limiter = RateLimiter()
+        limiter.set_limit("/services/dtp", rate=1, burst=1)
+        limiter.set_limit("/services/dtp/", rate=1, burst=1, host="stage:8080")
+
+        limiter.reserve("https://prod/services/dtp")
+        limiter.reserve("https://prod/services/dtp-archive/list")
+        limiter.reserve("https://stage:8080/services/dtp/list")
+        limiter.reserve("https://stage:9090/services/dtp")
+
+        stats = limiter.stats()
+        assert stats["/services/dtp"]["requests"] == 3
+        assert stats["stage:8080/services/dtp/"]["requests"] == 1
+        limiter.remove_limit("/services/dtp/", host="stage:8080")
+        assert list(limiter.stats()) == ["/services/dtp"]
+
+    def test_threads_share_limit(self, local_server, env_token):
+        """Клиенты в разных потоках делят один лимит"""
+        local_server.route("GET", "/parking", _ok)
+        limiter = RateLimiter()
+        limiter.set_limit("/", rate=20, burst=1)
+        transport = HTTPTransport(rate_limiter=limiter)
+
+        def worker():
+            client = ParkingAPIClient(transport=transport)
+            client.base_url = local_server.url
+            for _ in range(3):
+                client.get_parking_list()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 12 запросов при 20/с и burst=1: не быстрее 11 интервалов по 50 мс
+        assert time.perf_counter() - started >= 0.5
+        assert len(local_server.requests) == 12
+        assert limiter.stats()["/"]["delayed"] == 11
+
+    def test_asyncio_tasks_share_limit(self, local_server, env_token):
+        """Асинхронные задачи ждут через asyncio.sleep и соблюдают лимит"""
+        local_server.route("GET", "/parking", _ok)
+        limiter = RateLimiter()
+        limiter.set_limit("/", rate=20, burst=2)
+
+        async def main():
+            transport = AsyncHTTPTransport(rate_limiter=limiter)
+            client = AsyncParkingAPIClient(transport=transport)
+            client.base_url = local_server.url
+            started = time.perf_counter()
+            await asyncio.gather(*(client.check_token() for _ in range(6)))
+            elapsed = time.perf_counter() - started
+            await transport.aclose()
+            return elapsed
+
+        assert asyncio.run(main()) >= 0.2
+        assert limiter.stats()["/"]["delayed"] == 4
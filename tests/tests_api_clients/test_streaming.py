@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Тесты потокового разбора списочных ответов
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from api_clients import DigitalTwinAPIClient, MetroAPIClient
+from api_clients.aio import AsyncHTTPTransport, AsyncMetroAPIClient
+from api_clients.streaming import JSONArrayStream, iter_json_items
+from api_clients.transport import HTTPTransport
+
+
+BODY = {
+    "success": True,
+    "meta": {"note": "скобки ] } и \"кавычки\" \\ в строке", "nested": [[1, {"a": []}]]},
+    "data": [{"id": i, "name": f"Вестибюль \"{i}\" ]}}", "geo": [30.1, 59.9, None]} for i in range(200)]
+    + [1, "строка", None, -2.5e3, [], {}],
+    "total": 206,
+}
+RAW = json.dumps(BODY, ensure_ascii=False).encode("utf-8")
+
+
+def _chunks(raw, size):
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+class TestStreaming:
+    """Разбор порциями, пропуск лишних полей и потоковые методы клиентов"""
+
+    @pytest.mark.parametrize("size", [1, 2, 5, 64, 4096, len(RAW)])
+    def test_any_chunk_boundaries(self, size):
+        """Результат не зависит от границ порций (включая середину UTF-8 символа)"""
+        items = [item for _, item in iter_json_items(_chunks(RAW, size))]
+        assert items == BODY["data"]
+
+    def test_items_emitted_incrementally(self):
+        """Элемент отдается как только получен целиком"""
+        parser = JSONArrayStream()
+        first_end = RAW.index(b', {"id": 1,')
+        assert parser.feed(RAW[:first_end - 1]) == []
+        assert parser.feed(RAW[first_end - 1:first_end]) == [("data", BODY["data"][0])]
+
+    def test_memory_stays_flat(self):
+        """Буфер не растет с размером ответа: ни для пропускаемых полей, ни для списка"""
+        blob = json.dumps({"skip": ["x" * 100] * 20000, "data": [{"id": i, "v": "y" * 100} for i in range(20000)]})
+        parser = JSONArrayStream()
+        peak = count = 0
+        for chunk in _chunks(blob.encode(), 16 * 1024):
+            count += len(parser.feed(chunk))
+            peak = max(peak, len(parser._buf))
+        count += len(parser.close())
+
+        assert count == 20000
+        assert len(blob) > 4_000_000
+        assert peak < 200 * 1024
+
+    def test_truncated_body(self):
+        """Оборванное тело - ValueError"""
+        with pytest.raises(ValueError):
+            list(iter_json_items([RAW[:-10]]))
+        with pytest.raises(ValueError):
+            list(iter_json_items([b'["not", "object"]']))
+
+    def test_stream_vestibules(self, local_server, env_token):
+        """MetroAPIClient.stream_vestibules_on_page отдает записи data"""
+        local_server.route("POST", "/vestibule", lambda request: (200, {}, RAW))
+        client = MetroAPIClient(transport=HTTPTransport())
+        client.base_url = local_server.url
+
+        assert list(client.stream_vestibules_on_page(limit=500)) == BODY["data"]
+        assert local_server.requests[0]["json"] == {"page": 1, "limit": 500}
+        assert client.http.pool_stats()[local_server.url[len("http://"):]]["in_flight"] == 0
+
+    def test_stream_graph(self, local_server, env_token):
+        """stream_graph отдает узлы и ребра с признаком вида"""
+        graph = {"nodes": [{"id": 1}, {"id": 2}], "edges": [{"source": 1, "target": 2}]}
+        local_server.route("POST", "/v2/get-graph", lambda request: (200, {}, graph))
+        client = DigitalTwinAPIClient(transport=HTTPTransport())
+        client.cifdv_graph_url = local_server.url
+
+        assert list(client.stream_graph({"type": "Polygon", "coordinates": []})) == [
+            ("nodes", {"id": 1}), ("nodes", {"id": 2}), ("edges", {"source": 1, "target": 2})
+        ]
+
+    def test_async_stream(self, local_server, env_token):
+        """Асинхронный клиент возвращает асинхронный итератор"""
+        local_server.route("POST", "/vestibule", lambda request: (200, {}, RAW))
+
+        async def main():
+            transport = AsyncHTTPTransport()
+            client = AsyncMetroAPIClient(transport=transport)
+            client.base_url = local_server.url
+            items = [item async for item in client.stream_vestibules_on_page()]
+            await transport.aclose()
+            return items
+
+        assert asyncio.run(main()) == BODY["data"]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Тесты общего HTTP транспорта и пула соединений
+"""
+
+import threading
+import time
+
+from api_clients import transport as transport_module
+from api_clients.transport import HTTPTransport, configure_transport, get_transport
+
+
+class TestTransportPool:
+    """Переиспользование соединений и статистика пула"""
+
+    def test_sequential_requests_reuse_connection(self, local_server):
+        """Последовательные запросы идут через одно keep-alive соединение"""
+        local_server.route("GET", "/ping", lambda request: (200, {}, {"success": True}))
+        transport = HTTPTransport(pool_size=2)
+
+        for _ in range(5):
+            result = transport.get(f"{local_server.url}/ping")
+            assert result.status_code == 200, f"Status code: {result.status_code}"
+
+        stats = list(transport.pool_stats().values())[0]
+        assert stats["requests"] == 5
+        assert stats["opened"] == 1, f"Открыто соединений: {stats['opened']}"
+        assert stats["reused"] == 4
+        assert stats["in_flight"] == 0
+        transport.close()
+
+    def test_concurrent_requests_bounded_by_pool(self, local_server):
+        """Параллельные запросы учитываются в in_flight"""
+        def slow(request):
+            time.sleep(0.1)
+            return 200, {}, {"success": True}
+
+        local_server.route("GET", "/slow", slow)
+        transport = HTTPTransport(pool_size=4)
+
+        threads = [threading.Thread(target=transport.get, args=(f"{local_server.url}/slow",)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = list(transport.pool_stats().values())[0]
+        assert stats["requests"] == 4
+        assert stats["max_in_flight"] > 1, "Запросы не выполнялись параллельно"
+        assert stats["opened"] <= 4
+        transport.close()
+
+    def test_default_transport_is_shared(self):
+        """Все клиенты по умолчанию получают один транспорт"""
+        assert get_transport() is get_transport()
+
+    def test_configure_transport_keeps_previous(self, local_server, monkeypatch):
+        """Прежний транспорт не закрывается: его клиенты продолжают работать через тот же пул"""
+        local_server.route("GET", "/ping", lambda request: (200, {}, {"success": True}))
+        monkeypatch.setattr(transport_module, "_default_transport", HTTPTransport())
+        previous = get_transport()
+        previous.get(f"{local_server.url}/ping")
+
+        current = configure_transport(pool_size=3)
+        assert current is not previous and get_transport() is current
+        assert previous.get(f"{local_server.url}/ping").status_code == 200
+        stats = list(previous.pool_stats().values())[0]
+        assert (stats["opened"], stats["reused"]) == (1, 1)
+        current.close()
+        previous.close()
@@ -23,11 +23,11 @@ class TestCollectionServicesList:
 class TestCollectionServicesAPIFitdev:
     """Тесты для Collection Service API Fitdev (service_id=1, template_id=1)"""
     
-    def test_api_fitdev_workflow(self, data_bus_client):
+    def test_api_fitdev_workflow(self, data_bus_client, unique_name):
         """Полный workflow: создание, редактирование, удаление API Fitdev"""
         
         # Создание
-        name_create = f"Апи добавление {random.randint(1000, 9999)}"
+        name_create = unique_name("Апи добавление")
         template_create = {
             "url": "http://91.227.17.139/d",
             "login": "QA",
@@ -51,7 +51,7 @@ class TestCollectionServicesAPIFitdev:
         assert isinstance(service_id, int), "ID должен быть числом"
         
         # Редактирование
-        name_update = f"Апи редактирование {random.randint(1000, 9999)}"
+        name_update = unique_name("Апи редактирование")
         template_update = {
             "url": "http://91.227.17.13",
             "login": "Login",
@@ -81,11 +81,11 @@ class TestCollectionServicesAPIFitdev:
 class TestCollectionServicesAIS:
     """Тесты для Collection Service AIS (service_id=2, template_id=2)"""
     
-    def test_ais_workflow(self, data_bus_client):
+    def test_ais_workflow(self, data_bus_client, unique_name):
         """Полный workflow: создание, редактирование, удаление AIS"""
         
         # Создание
-        name_create = f"Апи тест {random.randint(1000, 9999)}"
+        name_create = unique_name("Апи тест")
         template_create = {
             "host": f"host-{random.randint(100, 999)}",
             "port": random.randint(5000, 9999)
@@ -107,7 +107,7 @@ class TestCollectionServicesAIS:
         service_id = data_create["data"]["id"]
         
         # Редактирование
-        name_update = f"Апи редактирование {random.randint(1000, 9999)}"
+        name_update = unique_name("Апи редактирование")
         template_update = {
             "host": f"host-updated-{random.randint(100, 999)}",
             "port": random.randint(5000, 9999)
@@ -136,11 +136,11 @@ class TestCollectionServicesAIS:
 class TestCollectionServicesFTP:
     """Тесты для Collection Service FTP Пассажиропоток (service_id=3, template_id=3)"""
     
-    def test_ftp_workflow(self, data_bus_client):
+    def test_ftp_workflow(self, data_bus_client, unique_name):
         """Полный workflow: создание, редактирование, удаление FTP"""
         
         # Создание
-        name_create = f"Апи добавление {random.randint(1000, 9999)}"
+        name_create = unique_name("Апи добавление")
         template_create = {
             "host": f"192.168.1.{random.randint(1, 254)}",
             "port": random.randint(20, 22),
@@ -165,7 +165,7 @@ class TestCollectionServicesFTP:
         service_id = data_create["data"]["id"]
         
         # Редактирование
-        name_update = f"Апи редактирование {random.randint(1000, 9999)}"
+        name_update = unique_name("Апи редактирование")
         template_update = {
             "host": f"192.168.2.{random.randint(1, 254)}",
             "port": random.randint(20, 22),
@@ -197,11 +197,11 @@ class TestCollectionServicesFTP:
 class TestCollectionServicesSchedule:
     """Тесты для Collection Service Расписание (service_id=6, template_id=25)"""
     
-    def test_schedule_workflow(self, data_bus_client):
+    def test_schedule_workflow(self, data_bus_client, unique_name):
         """Полный workflow: создание, редактирование, удаление Расписание"""
         
         # Создание
-        name_create = f"Апи добавление {random.randint(1000, 9999)}"
+        name_create = unique_name("Апи добавление")
         template_create = {
             "delete_files": True,
             "host": f"mail.server{random.randint(1, 10)}.com",
@@ -227,7 +227,7 @@ class TestCollectionServicesSchedule:
         service_id = data_create["data"]["id"]
         
         # Редактирование
-        name_update = f"Апи редактирование {random.randint(1000, 9999)}"
+        name_update = unique_name("Апи редактирование")
         template_update = {
             "delete_files": True,
             "host": f"mail.server{random.randint(1, 10)}.com",
@@ -260,11 +260,11 @@ class TestCollectionServicesSchedule:
 class TestCollectionServicesKafka:
     """Тесты для Collection Service Kafka to RabbitMQ (service_id=14, template_id=26)"""
     
-    def test_kafka_workflow(self, data_bus_client):
+    def test_kafka_workflow(self, data_bus_client, unique_name):
         """Полный workflow: создание, редактирование, удаление Kafka to RabbitMQ"""
         
         # Создание
-        name_create = f"Апи добавление {random.randint(1000, 9999)}"
+        name_create = unique_name("Апи добавление")
         template_create = {
             "host": f"kafka-{random.randint(1, 10)}.server.com",
             "port": random.randint(9092, 9099),
@@ -297,7 +297,7 @@ class TestCollectionServicesKafka:
         service_id = data_create["data"]["id"]
         
         # Редактирование
-        name_update = f"Апи редактирование {random.randint(1000, 9999)}"
+        name_update = unique_name("Апи редактирование")
         template_update = {
             "host": f"kafka-{random.randint(1, 10)}.server.com",
             "port": random.randint(9092, 9099),
@@ -23,11 +23,11 @@ class TestRelayServicesList:
 class TestRelayEGTSClone:
     """Тесты для Relay Service EGTS Clone"""
     
-    def test_egts_clone_workflow(self, data_bus_client):
+    def test_egts_clone_workflow(self, data_bus_client, unique_name):
         """Полный workflow: создание, редактирование, удаление EGTS Clone"""
         
         # Создание
-        name_create = f"Апи добавление {random.randint(1000, 9999)}"
+        name_create = unique_name("Апи добавление")
         ip_create = f"{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}"
         port_create = random.randint(5000, 9999)
         collection_service_id_list = [423]  # Используем существующий ID из примера
@@ -52,7 +52,7 @@ class TestRelayEGTSClone:
         relay_id = data_create["data"]["id"]
         
         # Редактирование
-        name_update = f"Апи редактирование {random.randint(1000, 9999)}"
+        name_update = unique_name("Апи редактирование")
         ip_update = f"{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}"
         port_update = random.randint(5000, 9999)
         
@@ -79,11 +79,11 @@ class TestRelayEGTSClone:
 class TestRelayEGTSTelemetry:
     """Тесты для Relay Service EGTS Telemetry"""
     
-    def test_egts_telemetry_workflow(self, data_bus_client):
+    def test_egts_telemetry_workflow(self, data_bus_client, unique_name):
         """Полный workflow: создание, редактирование, удаление EGTS Telemetry"""
         
         # Создание
-        name_create = f"Апи добавление {random.randint(1000, 9999)}"
+        name_create = unique_name("Апи добавление")
         ip_create = f"{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}"
         port_create = random.randint(5000, 9999)
         type_id_list = [1, 2, 3, 4]
@@ -108,7 +108,7 @@ class TestRelayEGTSTelemetry:
         relay_id = data_create["data"]["id"]
         
         # Редактирование
-        name_update = f"Апи редактирование {random.randint(1000, 9999)}"
+        name_update = unique_name("Апи редактирование")
         ip_update = f"{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}.{random.randint(1, 255)}"
         port_update = random.randint(5000, 9999)
         
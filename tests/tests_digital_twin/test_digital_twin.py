@@ -5,7 +5,6 @@
 """
 
 import pytest
-import random
 
 
 class TestInfrastructure:
@@ -95,10 +94,9 @@ class TestInfrastructureTypes:
         
         print(f"Получено типов инфраструктуры: {len(types)}")
     
-    def test_infrastructure_type_create(self, digital_twin_client):
+    def test_infrastructure_type_create(self, digital_twin_client, unique_name):
         """Тест создания типа"""
-        random_int = random.randint(1000, 9999)
-        type_name = f"Апи добавление {random_int}"
+        type_name = unique_name("Апи добавление")
         
         result = digital_twin_client.create_infrastructure_type(type_name)
         
@@ -124,12 +122,11 @@ class TestInfrastructureTypes:
         
         print(f" CREATE: тип инфраструктуры ID={type_id}, name='{type_name}'")
     
-    def test_infrastructure_type_workflow(self, digital_twin_client):
+    def test_infrastructure_type_workflow(self, digital_twin_client, unique_name):
         """Workflow: CREATE -> UPDATE -> DELETE типа"""
         
         # ===== Шаг 1: CREATE =====
-        random_int = random.randint(1000, 9999)
-        original_name = f"Workflow тип {random_int}"
+        original_name = unique_name("Workflow тип")
         
         create_result = digital_twin_client.create_infrastructure_type(original_name)
         assert create_result.status_code == 200, "Шаг 1 (CREATE) failed"
@@ -141,7 +138,7 @@ class TestInfrastructureTypes:
         print(f" Шаг 1 (CREATE): тип ID={type_id}, name='{original_name}'")
         
         # ===== Шаг 2: UPDATE =====
-        updated_name = f"Апи редактирование {random_int}"
+        updated_name = unique_name("Апи редактирование")
         
         update_result = digital_twin_client.update_infrastructure_type(type_id, updated_name)
         assert update_result.status_code == 200, "Шаг 2 (UPDATE) failed"
@@ -161,12 +161,12 @@ class TestDTP:
         
         print(f"Получено ДТП: {len(dtp_list)}")
     
-    def test_dtp_create(self, dtp_client):
+    def test_dtp_create(self, dtp_client, unique_name):
         """Тест создания ДТП"""
         # Данные для создания
         lat = 59.940400014187354
         lon = 30.28311892505096
-        description = f"API тест ДТП {datetime.now().strftime('%H:%M:%S')}"
+        description = unique_name("API тест ДТП")
         dtp_type = 3
         
         address = {
@@ -4,7 +4,6 @@
 """
 
 import pytest
-from datetime import datetime
 
 
 class TestCategories:
@@ -36,9 +35,9 @@ class TestCategories:
                     return
             pytest.skip("Нет категорий для тестирования")
     
-    def test_categories_create(self, incidents_client):
+    def test_categories_create(self, incidents_client, unique_name):
         """Тест создания категории"""
-        name = f"Тест категория {datetime.now().strftime('%H:%M:%S')}"
+        name = unique_name("Тест категория")
         description = "Простая тестовая категория"
         
         result = incidents_client.create_category(name, description)
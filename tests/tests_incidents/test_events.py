@@ -4,7 +4,6 @@
 """
 
 import pytest
-from datetime import datetime
 
 
 class TestEvents:
@@ -36,9 +35,9 @@ class TestEvents:
                 return
             pytest.skip("Нет событий для тестирования")
     
-    def test_events_create(self, incidents_client):
+    def test_events_create(self, incidents_client, unique_name):
         """Тест создания события"""
-        name = f"Тест событие {datetime.now().strftime('%H:%M:%S')}"
+        name = unique_name("Тест событие")
         description = "Простое тестовое событие"
         
         result = incidents_client.create_event(name, description)
@@ -4,7 +4,6 @@
 """
 
 import pytest
-from datetime import datetime
 
 
 class TestFactors:
@@ -51,9 +50,9 @@ class TestFactors:
         assert "data" in data2, "Нет поля data во второй странице"
         print("Factors pagination работает")
     
-    def test_factors_create(self, incidents_client):
+    def test_factors_create(self, incidents_client, unique_name):
         """Тест создания фактора"""
-        name = f"Фактор_апи_тест_{datetime.now().strftime('%H%M%S')}"
+        name = unique_name("Фактор_апи_тест", sep="_")
         is_geo = True
         
         result = incidents_client.create_factor(name, is_geo)
@@ -4,7 +4,6 @@
 """
 
 import pytest
-from datetime import datetime
 
 
 class TestIncidents:
@@ -117,9 +116,9 @@ class TestIncidents:
         
         print(f"Страница 1: {len(incidents1)} элементов, Страница 2: {len(incidents2)} элементов")
     
-    def test_incidents_create(self, incidents_client):
+    def test_incidents_create(self, incidents_client, unique_name):
         """Тест создания инцидента"""
-        name = f"Тест {datetime.now().strftime('%H:%M:%S')}"
+        name = unique_name("Тест")
         description = "Простой тестовый инцидент"
         
         # Создание
@@ -148,7 +147,7 @@ class TestIncidents:
         
         print(f" CREATE: создан инцидент ID={incident_id}, Name='{name}'")
     
-    def test_incidents_update(self, incidents_client):
+    def test_incidents_update(self, incidents_client, unique_name):
         """Тест обновления инцидента"""
         # Сначала получаем существующий инцидент
         incidents = incidents_client.get_incidents_list(page=1, limit=1)
@@ -166,7 +165,7 @@ class TestIncidents:
             pytest.skip("ID инцидента не найден")
         
         original_description = incident.get("description", "")
-        new_description = f"Обновлено {datetime.now().strftime('%H:%M:%S')}"
+        new_description = unique_name("Обновлено")
         
         # Обновление
         result = incidents_client.update_incident(incident_id, description=new_description)
@@ -186,10 +185,10 @@ class TestIncidents:
         else:
             print(f" UPDATE: инцидент ID={incident_id} обновлен (проверка изменений не выполнена)")
     
-    def test_incidents_delete(self, incidents_client):
+    def test_incidents_delete(self, incidents_client, unique_name):
         """Тест удаления инцидента"""
         # Сначала создаем инцидент специально для удаления
-        name = f"Для удаления {datetime.now().strftime('%H:%M:%S')}"
+        name = unique_name("Для удаления")
         description = "Этот инцидент будет удален"
         
         create_result = incidents_client.create_incident(name, description)
@@ -4,7 +4,6 @@
 """
 
 import pytest
-from datetime import datetime
 
 
 class TestKeywords:
@@ -36,9 +35,9 @@ class TestKeywords:
                 return
             pytest.skip("Нет ключевых слов для тестирования")
     
-    def test_keywords_create(self, incidents_client):
+    def test_keywords_create(self, incidents_client, unique_name):
         """Тест создания ключевого слова"""
-        name = f"Тест ключевое слово {datetime.now().strftime('%H:%M:%S')}"
+        name = unique_name("Тест ключевое слово")
         description = "Простое тестовое ключевое слово"
         
         result = incidents_client.create_keyword(name, description)
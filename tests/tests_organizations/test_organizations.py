@@ -41,11 +41,11 @@ class TestOrganizationsList:
 class TestOrganizationsCRUD:
     """Тесты CRUD операций для организаций"""
     
-    def test_organization_create(self, organizations_client):
+    def test_organization_create(self, organizations_client, unique_name):
         """Тест создания организации"""
         import requests
         
-        random_int = random.randint(1000, 9999)
+        title = unique_name("Тестовая организация")
         
         address = {
             "city_name": "г Санкт-Петербург",
@@ -61,8 +61,8 @@ class TestOrganizationsCRUD:
         
         try:
             response = organizations_client.organization_create(
-                title=f"Тестовая организация {random_int}",
-                full_name=f"ООО 'Тестовая организация {random_int}'",
+                title=title,
+                full_name=f"ООО '{title}'",
                 inn=test_inn,
                 juristic_address=address,
                 mail_address=address,
@@ -91,11 +91,11 @@ class TestOrganizationsCRUD:
         except (requests.exceptions.Timeout, requests.exceptions.ReadTimeout):
             pytest.skip("API timeout при создании организации")
     
-    def test_organization_full_workflow(self, organizations_client):
+    def test_organization_full_workflow(self, organizations_client, unique_name):
         """Полный workflow: создание, обновление, добавление документов, роли, удаление"""
         import requests
         
-        random_int = random.randint(1000, 9999)
+        title = unique_name("Workflow Org")
         
         # Шаг 1: Создание
         address = {
@@ -112,8 +112,8 @@ class TestOrganizationsCRUD:
         
         try:
             create_response = organizations_client.organization_create(
-                title=f"Workflow Org {random_int}",
-                full_name=f"ООО 'Workflow Organization {random_int}'",
+                title=title,
+                full_name=f"ООО '{unique_name('Workflow Organization')}'",
                 inn=test_inn,
                 juristic_address=address,
                 mail_address=address,
@@ -4,7 +4,6 @@
 """
 
 import pytest
-import random
 
 
 class TestRolesList:
@@ -40,12 +39,10 @@ class TestRolesList:
 class TestRolesCRUD:
     """Тесты CRUD операций для ролей"""
     
-    def test_role_workflow(self, organizations_client):
+    def test_role_workflow(self, organizations_client, unique_name):
         """Полный workflow: создание, редактирование, удаление роли"""
-        random_int = random.randint(1000, 9999)
-        
         # Создание
-        create_name = f"Апи добавление {random_int}"
+        create_name = unique_name("Апи добавление")
         create_response = organizations_client.role_create(name=create_name)
         
         assert create_response.status_code == 200, f"Create status: {create_response.status_code}"
@@ -59,7 +56,7 @@ class TestRolesCRUD:
         print(f" Создана роль ID={role_id}, name='{create_name}'")
         
         # Редактирование
-        update_name = f"Апи редактирование {random.randint(1000, 9999)}"
+        update_name = unique_name("Апи редактирование")
         update_response = organizations_client.role_update(role_id=role_id, name=update_name)
         
         assert update_response.status_code == 200, f"Update status: {update_response.status_code}"
@@ -4,7 +4,6 @@
 """
 
 import pytest
-import random
 
 
 class TestParking:
@@ -88,14 +87,25 @@ class TestParking:
         
         print(f"Страница 1: {len(parkings1)}, Страница 2: {len(parkings2)}")
 
+    def test_parking_iter_list(self, parking_client):
+        """Тест постраничного обхода списка парковок"""
+        limit = 5
+        records = parking_client.iter_parking_list(limit=limit, prefetch=True)
+        parkings = [parking for _, parking in zip(range(limit * 2 + 1), records)]
+        records.close()
+
+        ids = [p["id"] for p in parkings]
+        assert len(ids) == len(set(ids)), "Найдены повторяющиеся ID при обходе страниц"
+
+        print(f"Обход страниц: получено {len(parkings)} парковок")
+
 
 class TestParkingCRUD:
     """CRUD тесты для парковок"""
     
-    def test_parking_create(self, parking_client):
+    def test_parking_create(self, parking_client, unique_name):
         """Тест создания парковки"""
-        random_int = random.randint(1000, 9999)
-        name = f"Апи добавление {random_int}"
+        name = unique_name("Апи добавление")
         address = parking_client.generate_test_address()
         address_text = "Санкт-Петербург, Санкт-Петербург, Василеостровский район, Биржевая площадь, 4"
         lat = 59.943716
@@ -145,11 +155,10 @@ class TestParkingCRUD:
         
         print(f" CREATE: парковка ID={parking_id}, name='{name}'")
     
-    def test_parking_update(self, parking_client):
+    def test_parking_update(self, parking_client, unique_name):
         """Тест обновления парковки"""
         # Создаем парковку
-        random_int = random.randint(1000, 9999)
-        original_name = f"Апи для обновления {random_int}"
+        original_name = unique_name("Апи для обновления")
         address = parking_client.generate_test_address()
         address_text = "Санкт-Петербург, Санкт-Петербург, Василеостровский район, Биржевая площадь, 4"
         
@@ -216,11 +225,10 @@ class TestParkingCRUD:
         
         print(f" UPDATE: парковка ID={parking_id} обновлена, name='{updated_name}'")
     
-    def test_parking_delete(self, parking_client):
+    def test_parking_delete(self, parking_client, unique_name):
         """Тест удаления парковки"""
         # Создаем парковку
-        random_int = random.randint(1000, 9999)
-        name = f"Апи для удаления {random_int}"
+        name = unique_name("Апи для удаления")
         address = parking_client.generate_test_address()
         address_text = "Санкт-Петербург, Санкт-Петербург, Василеостровский район, Биржевая площадь, 4"
         
@@ -255,12 +263,11 @@ class TestParkingCRUD:
 class TestParkingWorkflow:
     """Workflow тесты для парковок"""
     
-    def test_parking_full_workflow(self, parking_client):
+    def test_parking_full_workflow(self, parking_client, unique_name):
         """Полный workflow: CREATE -> UPDATE -> VERIFY -> DELETE"""
         
         # ===== Шаг 1: CREATE =====
-        random_int = random.randint(1000, 9999)
-        name = f"Workflow парковка {random_int}"
+        name = unique_name("Workflow парковка")
         address = parking_client.generate_test_address()
         address_text = "Санкт-Петербург, Санкт-Петербург, Василеостровский район, Биржевая площадь, 4"
         
@@ -285,7 +292,7 @@ class TestParkingWorkflow:
         print(f" Шаг 1 (CREATE): парковка ID={parking_id}, name='{name}'")
         
         # ===== Шаг 2: UPDATE =====
-        updated_name = f"Обновленная парковка {random_int}"
+        updated_name = unique_name("Обновленная парковка")
         update_data = {
             "name": updated_name,
             "address": address,
@@ -4,7 +4,6 @@
 """
 
 import pytest
-import random
 
 
 class TestBrands:
@@ -46,14 +45,13 @@ class TestBrands:
 class TestBrandsCRUD:
     """CRUD тесты для марок"""
     
-    def test_brand_workflow(self, passenger_transport_client):
+    def test_brand_workflow(self, passenger_transport_client, unique_name):
         """Workflow: CREATE -> UPDATE -> DELETE марки"""
         
         # ===== Шаг 1: CREATE =====
-        random_int = random.randint(1000, 9999)
-        name_ru = f"Апи добавление {random_int}"
-        name_en = f"Api {random_int}"
-        slug = f"api-{random_int}"
+        name_ru = unique_name("Апи добавление")
+        name_en = unique_name("Api")
+        slug = unique_name("api", sep="-")
         
         create_result = passenger_transport_client.create_brand(
             name_ru=name_ru,
@@ -70,9 +68,9 @@ class TestBrandsCRUD:
         print(f" Шаг 1 (CREATE): марка ID={brand_id}, name_ru='{name_ru}'")
         
         # ===== Шаг 2: UPDATE =====
-        updated_name_ru = f"Апи редактирование {random_int}"
-        updated_name_en = f"Pai {random_int}"
-        updated_slug = f"pai-{random_int}"
+        updated_name_ru = unique_name("Апи редактирование")
+        updated_name_en = unique_name("Pai")
+        updated_slug = unique_name("pai", sep="-")
         
         update_result = passenger_transport_client.update_brand(
             brand_id=brand_id,
@@ -4,7 +4,6 @@
 """
 
 import pytest
-import random
 
 
 class TestModels:
@@ -46,14 +45,13 @@ class TestModels:
 class TestModelsCRUD:
     """CRUD тесты для моделей"""
     
-    def test_model_workflow(self, passenger_transport_client):
+    def test_model_workflow(self, passenger_transport_client, unique_name):
         """Workflow: CREATE -> UPDATE -> DELETE модели"""
         
         # ===== Шаг 1: CREATE =====
-        random_int = random.randint(1000, 9999)
-        name_ru = f"Апи добавление {random_int}"
-        name_en = f"Api {random_int}"
-        slug = f"api-model-{random_int}"
+        name_ru = unique_name("Апи добавление")
+        name_en = unique_name("Api")
+        slug = unique_name("api-model", sep="-")
         
         create_result = passenger_transport_client.create_model(
             brand_id=2,  # Используем существующую марку
@@ -70,9 +68,9 @@ class TestModelsCRUD:
         print(f" Шаг 1 (CREATE): модель ID={model_id}, name_ru='{name_ru}'")
         
         # ===== Шаг 2: UPDATE =====
-        updated_name_ru = f"Апи редактирование {random_int}"
-        updated_name_en = f"Pai {random_int}"
-        updated_slug = f"pai-model-{random_int}"
+        updated_name_ru = unique_name("Апи редактирование")
+        updated_name_en = unique_name("Pai")
+        updated_slug = unique_name("pai-model", sep="-")
         
         update_result = passenger_transport_client.update_model(
             model_id=model_id,
@@ -4,7 +4,6 @@
 """
 
 import pytest
-import random
 
 
 class TestStations:
@@ -46,10 +45,9 @@ class TestStations:
 class TestStationsCRUD:
     """CRUD тесты для остановок"""
     
-    def test_station_create(self, passenger_transport_client):
+    def test_station_create(self, passenger_transport_client, unique_name):
         """Тест создания остановки"""
-        random_int = random.randint(1000, 9999)
-        name = f"Апи добавление {random_int}"
+        name = unique_name("Апи добавление")
         
         # Данные для создания
         type_list = [{"id": 1, "name": "Автобус", "slug": "Bus"}]
@@ -96,12 +94,11 @@ class TestStationsCRUD:
         
         print(f" CREATE: остановка ID={station_id}, name='{name}'")
     
-    def test_station_workflow(self, passenger_transport_client):
+    def test_station_workflow(self, passenger_transport_client, unique_name):
         """Workflow: CREATE -> UPDATE -> DELETE остановки"""
         
         # ===== Шаг 1: CREATE =====
-        random_int = random.randint(1000, 9999)
-        original_name = f"Workflow остановка {random_int}"
+        original_name = unique_name("Workflow остановка")
         
         type_list = [{"id": 1, "name": "Автобус", "slug": "Bus"}]
         check_point = {
@@ -133,7 +130,7 @@ class TestStationsCRUD:
         print(f" Шаг 1 (CREATE): остановка ID={station_id}, name='{original_name}'")
         
         # ===== Шаг 2: UPDATE =====
-        updated_name = f"Апи редактирование {random_int}"
+        updated_name = unique_name("Апи редактирование")
         
         update_result = passenger_transport_client.update_station(
             station_id=station_id,
@@ -0,0 +1 @@
+# Тесты производительности: бюджеты времени ответа
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Замер времени ответа эндпоинтов и сравнение с бюджетами из budgets.yaml
+"""
+
+import os
+from typing import Any, Callable, Dict, List
+
+import yaml
+
+from api_clients.bulk import BulkResult, run_bulk
+
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "budgets.yaml")
+
+# Результаты замеров текущей сессии для итоговой таблицы
+RESULTS: List[Dict[str, Any]] = []
+
+
+def load_budgets(path: str = BUDGETS_FILE) -> Dict[str, Dict[str, Any]]:
+    """
+    Бюджеты эндпоинтов: значения defaults, переопределенные записью эндпоинта
+
+    Переменная окружения PERF_ITERATIONS задает количество замеров для всех эндпоинтов.
+    """
+    with open(path, encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    defaults = config.get("defaults") or {}
+    iterations = os.getenv("PERF_ITERATIONS")
+
+    budgets = {}
+    for endpoint, overrides in (config.get("endpoints") or {}).items():
+        budget = dict(defaults, **(overrides or {}))
+        budget.setdefault("params", {})
+        if iterations:
+            budget["iterations"] = int(iterations)
+        budgets[endpoint] = budget
+    return budgets
+
+
+def measure(call: Callable[..., Any], budget: Dict[str, Any]) -> BulkResult:
+    """Выполнить прогрев и замер вызова call(**params) с параметрами бюджета"""
+    params = budget["params"]
+    for _ in range(budget.get("warmup", 0)):
+        call(**params)
+    return run_bulk(lambda _: call(**params), range(budget["iterations"]),
+                    workers=budget.get("concurrency", 1))
+
+
+def summarize(endpoint: str, result: BulkResult) -> Dict[str, Any]:
+    """Показатели замера: перцентили (мс), пропускная способность и доля ошибок"""
+    return {
+        "endpoint": endpoint,
+        "requests": len(result.results),
+        "p50_ms": result.latency(50) * 1000,
+        "p95_ms": result.latency(95) * 1000,
+        "p99_ms": result.latency(99) * 1000,
+        "rps": result.items_per_second,
+        "error_rate": len(result.failed) / len(result.results) if result.results else 0.0,
+    }
+
+
+def check_budget(stats: Dict[str, Any], budget: Dict[str, Any]) -> List[str]:
+    """Список нарушений бюджета (пустой, если замер укладывается в бюджет)"""
+    violations = []
+    for name in ("p50_ms", "p95_ms", "p99_ms"):
+        limit = budget.get(name)
+        if limit is not None and stats[name] > limit:
+            violations.append(f"{name}={stats[name]:.0f} > {limit}")
+    min_rps = budget.get("min_rps")
+    if min_rps is not None and stats["rps"] < min_rps:
+        violations.append(f"rps={stats['rps']:.2f} < {min_rps}")
+    max_error_rate = budget.get("max_error_rate")
+    if max_error_rate is not None and stats["error_rate"] > max_error_rate:
+        violations.append(f"error_rate={stats['error_rate']:.2%} > {max_error_rate:.2%}")
+    return violations
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """Строка таблицы итогов"""
+    return (
+        f"{stats['endpoint']:55} n={stats['requests']:<4} p50={stats['p50_ms']:7.0f} "
+        f"p95={stats['p95_ms']:7.0f} p99={stats['p99_ms']:7.0f} мс  "
+        f"{stats['rps']:6.2f} req/s  ошибок {stats['error_rate']:.0%}"
+    )
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Итоговая таблица замеров производительности
+"""
+
+from .budget import RESULTS, format_stats
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Вывести показатели всех замеренных эндпоинтов (при -n - только замеры этого процесса)"""
+    if not RESULTS:
+        return
+    terminalreporter.section("Время ответа эндпоинтов")
+    for stats in sorted(RESULTS, key=lambda stats: stats["p95_ms"], reverse=True):
+        terminalreporter.write_line(format_stats(stats))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Тесты загрузки бюджетов и проверки замеров (без обращения к стенду)
+"""
+
+from api_clients.bulk import BulkResult, ItemResult
+
+from .budget import check_budget, load_budgets, summarize
+
+
+def _result(timings, failed=0):
+    results = [ItemResult(i, None, 200, elapsed=t) for i, t in enumerate(timings)]
+    for item in results[:failed]:
+        item.status_code = 500
+    return BulkResult(results, elapsed=sum(timings))
+
+
+def test_budgets_file_is_valid():
+    budgets = load_budgets()
+    assert budgets
+    for endpoint, budget in budgets.items():
+        assert "." in endpoint
+        assert budget["iterations"] > 0
+        assert isinstance(budget["params"], dict)
+        assert budget["p50_ms"] <= budget["p95_ms"] <= budget["p99_ms"]
+
+
+def test_endpoint_overrides_defaults(tmp_path, monkeypatch):
+    path = tmp_path / "budgets.yaml"
+    path.write_text(
+        "defaults: {iterations: 10, p95_ms: 100}\n"
+        "endpoints:\n"
+        "  metro.get_vestibules_on_page: {p95_ms: 300, params: {limit: 500}}\n"
+        "  parking.get_parking_list: {}\n",
+        encoding="utf-8",
+    )
+    budgets = load_budgets(str(path))
+    assert budgets["metro.get_vestibules_on_page"]["p95_ms"] == 300
+    assert budgets["metro.get_vestibules_on_page"]["params"] == {"limit": 500}
+    assert budgets["parking.get_parking_list"] == {"iterations": 10, "p95_ms": 100, "params": {}}
+
+    monkeypatch.setenv("PERF_ITERATIONS", "3")
+    assert load_budgets(str(path))["parking.get_parking_list"]["iterations"] == 3
+
+
+def test_check_budget_reports_regressions():
+    budget = {"p50_ms": 100, "p95_ms": 200, "p99_ms": 300, "min_rps": 1.0, "max_error_rate": 0.0}
+    fast = summarize("x", _result([0.05] * 20))
+    assert check_budget(fast, budget) == []
+
+    slow = summarize("x", _result([0.05] * 18 + [0.5, 0.5], failed=1))
+    violations = check_budget(slow, budget)
+    assert any(v.startswith("p95_ms") for v in violations)
+    assert any(v.startswith("p99_ms") for v in violations)
+    assert any(v.startswith("error_rate") for v in violations)
+    assert not any(v.startswith("p50_ms") for v in violations)
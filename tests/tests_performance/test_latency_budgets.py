@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Тесты производительности: время ответа эндпоинтов чтения в пределах бюджета
+
+Бюджеты задаются в budgets.yaml. По умолчанию тесты не выбираются; запуск:
+    pytest tests/tests_performance --performance      (или PERF_RUN=1)
+Замер выполняется только без -n: параллельные тесты искажают время ответа,
+поэтому на воркере pytest-xdist тесты пропускаются.
+"""
+
+import pytest
+
+from .budget import RESULTS, check_budget, format_stats, load_budgets, measure, summarize
+
+
+BUDGETS = load_budgets()
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("endpoint", list(BUDGETS))
+def test_endpoint_latency_budget(endpoint, request):
+    """Перцентили времени ответа, пропускная способность и доля ошибок эндпоинта"""
+    budget = BUDGETS[endpoint]
+    service, method = endpoint.split(".", 1)
+    client = request.getfixturevalue(f"{service}_client")
+
+    stats = summarize(endpoint, measure(getattr(client, method), budget))
+    RESULTS.append(stats)
+    print(f" {format_stats(stats)}")
+
+    violations = check_budget(stats, budget)
+    assert not violations, f"{endpoint}: превышен бюджет: {', '.join(violations)}"
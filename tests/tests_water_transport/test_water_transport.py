@@ -76,11 +76,10 @@ class TestWaterTransportVehicles:
         print(f"Страница 1: {len(items1)} элементов")
         print(f"Страница 2: {len(items2)} элементов")
 
-    def test_vehicle_create_update_delete(self, water_transport_client):
+    def test_vehicle_create_update_delete(self, water_transport_client, unique_name):
         """Тест полного цикла CRUD для транспортного средства"""
         # Генерация случайных данных для создания
-        random_int = random.randint(1000, 9999)
-        original_name = f"Апи добавление {random_int}"
+        original_name = unique_name("Апи добавление")
         original_short_name = "Test Ship"
         mmsi = str(random.randint(100000000, 999999999))  # 9 цифр
         imo = str(random.randint(1000000, 9999999))  # 7 цифр
@@ -119,9 +118,8 @@ class TestWaterTransportVehicles:
         print(f" CREATE: создано транспортное средство ID={vehicle_id}, name='{original_name}'")
         
         # ===== UPDATE =====
-        random_int_update = random.randint(1000, 9999)
-        updated_name = f"Апи редактирование {random_int_update}"
-        updated_short_name = f"Updated Ship {random.randint(1000, 9999)}"
+        updated_name = unique_name("Апи редактирование")
+        updated_short_name = unique_name("Updated Ship")
         mmsi_update = str(random.randint(100000000, 999999999))
         imo_update = str(random.randint(1000000, 9999999))
         
@@ -170,16 +168,15 @@ class TestWaterTransportVehicles:
             assert len(deleted_ids) == 0, f"Удаленный объект ID={vehicle_id} все еще присутствует в списке!"
             print(f" VERIFY: подтверждено удаление - объект ID={vehicle_id} отсутствует в списке")
 
-    def test_vehicle_create_with_invalid_mmsi(self, water_transport_client):
+    def test_vehicle_create_with_invalid_mmsi(self, water_transport_client, unique_name):
         """Тест создания с некорректным MMSI (негативный сценарий)"""
         import requests
         
-        random_int = random.randint(1000, 9999)
         invalid_mmsi = "123"  # Некорректный MMSI (должен быть 9 цифр)
         
         try:
             response = water_transport_client.vehicle_create(
-                name=f"Invalid MMSI Test {random_int}",
+                name=unique_name("Invalid MMSI Test"),
                 short_name="Test",
                 mmsi=invalid_mmsi,
                 imo=str(random.randint(1000000, 9999999)),
@@ -216,13 +213,12 @@ class TestWaterTransportVehicles:
             # Timeout может быть признаком того что сервер отклонил невалидные данные
             pytest.skip(f"API timeout при невалидном MMSI ({invalid_mmsi}) - возможна проблема валидации на сервере")
 
-    def test_vehicle_create_with_invalid_imo(self, water_transport_client):
+    def test_vehicle_create_with_invalid_imo(self, water_transport_client, unique_name):
         """Тест создания с некорректным IMO (негативный сценарий)"""
-        random_int = random.randint(1000, 9999)
         invalid_imo = "123"  # Некорректный IMO (должен быть 7 цифр)
         
         response = water_transport_client.vehicle_create(
-            name=f"Invalid IMO Test {random_int}",
+            name=unique_name("Invalid IMO Test"),
             short_name="Test",
             mmsi=str(random.randint(100000000, 999999999)),
             imo=invalid_imo,